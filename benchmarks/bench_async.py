@@ -0,0 +1,65 @@
+"""
+Compare la latence (p50/p99) d'AsyncBibliotheque avec un appel run_in_executor par requête.
+
+Chaque client effectue une recherche, au même moment que tous les autres clients.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_async [nombre_clients] [nombre_livres]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from src.AsyncBibliotheque import AsyncBibliotheque
+from src.Bibliotheque import Bibliotheque
+
+
+def percentiles(latences):
+    """Retourne les latences p50 et p99 en millisecondes."""
+    centiles = statistics.quantiles(latences, n=100)
+    return centiles[49] * 1e3, centiles[98] * 1e3
+
+
+async def client(appel, recherche: str, latences: list):
+    debut = time.perf_counter()
+    await appel(recherche)
+    latences.append(time.perf_counter() - debut)
+
+
+async def bench_executeur(bibliotheque: Bibliotheque, recherches: list):
+    """Un appel run_in_executor (pool par défaut) par requête."""
+    boucle = asyncio.get_running_loop()
+    latences = []
+
+    async def appel(recherche):
+        return await boucle.run_in_executor(None, bibliotheque.rechercher_livre, recherche)
+
+    await asyncio.gather(*(client(appel, recherche, latences) for recherche in recherches))
+    return latences
+
+
+async def bench_async(bibliotheque: Bibliotheque, recherches: list):
+    """Requêtes regroupées en lots par AsyncBibliotheque."""
+    latences = []
+    async with AsyncBibliotheque(bibliotheque) as facade:
+        await asyncio.gather(*(client(facade.rechercher_livre, recherche, latences) for recherche in recherches))
+    return latences
+
+
+if __name__ == "__main__":
+    nombre_clients = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    nombre_livres = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    bibliotheque = Bibliotheque()
+    bibliotheque.ajouter_livres_en_masse(
+        (str(i), f"Titre {i}", f"Auteur {i % 1000}", "Canadien") for i in range(nombre_livres)
+    )
+    recherches = [f"titre {i % nombre_livres}" for i in range(nombre_clients)]
+
+    for nom, bench in (("run_in_executor", bench_executeur), ("AsyncBibliotheque", bench_async)):
+        debut = time.perf_counter()
+        latences = asyncio.run(bench(bibliotheque, recherches))
+        duree = time.perf_counter() - debut
+        p50, p99 = percentiles(latences)
+        print(f"{nom:>18} : p50 {p50:8.2f} ms, p99 {p99:8.2f} ms, {nombre_clients / duree:8.0f} requêtes/s")
@@ -0,0 +1,72 @@
+"""
+Mesure rechercher_livre avec et sans cache sur un mélange de requêtes asymétrique (loi de Zipf).
+
+Un appel sur cent est un ajout de livre et un sur cent un emprunt, pour mesurer l'effet des invalidations.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_cache_recherche [nombre_livres] [nombre_operations]
+"""
+import random
+import sys
+import time
+
+from src.Auteur import Auteur
+from src.Bibliotheque import Bibliotheque
+from src.CacheRecherche import CacheRecherche
+from src.Emprunteur import Emprunteur
+
+
+def construire(nombre_livres: int, cache: CacheRecherche) -> Bibliotheque:
+    """Retourne une bibliothèque de nombre_livres livres et un emprunteur, qui utilise le cache donné."""
+    bibliotheque = Bibliotheque()
+    bibliotheque.cache = cache
+    bibliotheque.ajouter_livres_en_masse(
+        (str(i), f"Titre {i}", f"Auteur {i % 1000}", "Canadien") for i in range(nombre_livres)
+    )
+    bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id='1', nom='Luc'))
+    return bibliotheque
+
+
+def operations(nombre_livres: int, nombre: int, graine: int = 0) -> list:
+    """Génère le mélange d'opérations : recherches selon une loi de Zipf, ajouts et emprunts."""
+    aleatoire = random.Random(graine)
+    requetes = [f"titre {i * 7 % nombre_livres}" for i in range(2000)] + [f"auteur {i}" for i in range(100)]
+    aleatoire.shuffle(requetes)
+    poids = [1 / rang ** 1.1 for rang in range(1, len(requetes) + 1)]
+
+    resultat = []
+    for i in range(nombre):
+        tirage = aleatoire.random()
+        if tirage < 0.01:
+            resultat.append(('ajout', str(nombre_livres + i)))
+        elif tirage < 0.02:
+            resultat.append(('emprunt', str(i % nombre_livres)))
+        else:
+            resultat.append(('recherche', aleatoire.choices(requetes, poids)[0]))
+    return resultat
+
+
+def executer(bibliotheque: Bibliotheque, liste: list) -> float:
+    """Exécute les opérations et retourne la durée en secondes."""
+    auteur = Auteur('Nouvel auteur', 'Canadien')
+    debut = time.perf_counter()
+    for operation, argument in liste:
+        if operation == 'recherche':
+            bibliotheque.rechercher_livre(argument)
+        elif operation == 'ajout':
+            bibliotheque.ajouter_livre(argument, f"Titre {argument}", auteur)
+        elif bibliotheque.livres[argument].disponible:
+            bibliotheque.emprunter_livre(argument, '1')
+    return time.perf_counter() - debut
+
+
+if __name__ == "__main__":
+    nombre_livres = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    nombre_operations = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    liste = operations(nombre_livres, nombre_operations)
+
+    for nom, cache in (("sans cache (1 entrée)", CacheRecherche(taille_max=1)),
+                       ("cache de 1024 entrées", CacheRecherche(taille_max=1024))):
+        bibliotheque = construire(nombre_livres, cache)
+        duree = executer(bibliotheque, liste)
+        print(f"{nom:>22} : {nombre_operations / duree:10.0f} opérations/s, {cache.statistiques()}")
@@ -0,0 +1,58 @@
+"""
+Compare le démarrage et la recherche d'un catalogue en lecture seule (mmap) avec une Bibliotheque reconstruite.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_catalogue_lecture_seule [nombre_livres]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from src.Bibliotheque import Bibliotheque
+from src.CatalogueLectureSeule import CatalogueLectureSeule, ecrire_catalogue
+
+
+def lignes(nombre_livres: int):
+    """Génère les lignes d'importation de nombre_livres livres."""
+    return ((str(i), f"Titre {i}", f"Auteur {i % 10_000}", "Canadien") for i in range(nombre_livres))
+
+
+if __name__ == "__main__":
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    recherches = ["titre 12345", "auteur 42", "zzz"]
+
+    debut = time.perf_counter()
+    bibliotheque = Bibliotheque()
+    bibliotheque.ajouter_livres_en_masse(lignes(nombre))
+    duree_reconstruction = time.perf_counter() - debut
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, 'catalogue.bin')
+        ecrire_catalogue(bibliotheque, chemin)
+
+        debut = time.perf_counter()
+        catalogue = CatalogueLectureSeule(chemin)
+        duree_ouverture = time.perf_counter() - debut
+
+        print(f"{nombre} livres ({os.path.getsize(chemin) / nombre:.1f} octets / livre sur disque) :")
+        print(f"  démarrage Bibliotheque (reconstruction) : {duree_reconstruction * 1e3:10.2f} ms")
+        print(f"  démarrage catalogue mmap                : {duree_ouverture * 1e3:10.2f} ms")
+
+        cles = [str(i) for i in range(0, nombre, max(1, nombre // 1000))]
+        debut = time.perf_counter()
+        for book_id in cles:
+            catalogue[book_id]
+        print(f"  recherche par book_id (mmap)            : "
+              f"{(time.perf_counter() - debut) / len(cles) * 1e6:10.2f} µs")
+
+        for recherche in recherches:
+            for nom, source in (("index", bibliotheque), ("mmap", catalogue)):
+                debut = time.perf_counter()
+                try:
+                    source.rechercher_livre(recherche)
+                except ValueError:
+                    pass
+                print(f"  rechercher_livre('{recherche}') ({nom}) : {(time.perf_counter() - debut) * 1e3:10.2f} ms")
+
+        catalogue.fermer()
@@ -0,0 +1,61 @@
+"""
+Compare le calcul des livres disponibles par auteur entre le stockage en dictionnaire et le CatalogueColonnes.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_colonnes [nombre_livres]
+"""
+import random
+import sys
+import time
+
+from src.Auteur import Auteur
+from src.Bibliotheque import Bibliotheque
+from src.CatalogueColonnes import CatalogueColonnes
+from src.Emprunteur import Emprunteur
+
+
+def remplir(bibliotheque: Bibliotheque, nombre_livres: int, nombre_auteurs: int = 1000, graine: int = 0):
+    """Ajoute nombre_livres livres répartis entre nombre_auteurs auteurs, dont un tiers indisponibles."""
+    aleatoire = random.Random(graine)
+    auteurs = [Auteur(f"Auteur {i}", f"Nationalite {i % 20}") for i in range(nombre_auteurs)]
+    bibliotheque.ajouter_livres_en_masse(
+        (str(i), f"Titre {i}", auteur.nom, auteur.nationalite)
+        for i, auteur in ((i, aleatoire.choice(auteurs)) for i in range(nombre_livres))
+    )
+    # Les emprunts passent par la bibliothèque pour tenir à jour l'index des livres disponibles
+    bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id='0', nom="Emprunteur"))
+    for book_id in range(0, nombre_livres, 3):
+        bibliotheque.emprunter_livre(str(book_id), '0')
+
+
+def chronometrer(fonction, repetitions: int = 5) -> float:
+    """Retourne la meilleure durée (en secondes) d'un appel à fonction."""
+    meilleure = float('inf')
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        meilleure = min(meilleure, time.perf_counter() - debut)
+    return meilleure
+
+
+if __name__ == "__main__":
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    objets = Bibliotheque()
+    colonnes = Bibliotheque(catalogue=CatalogueColonnes())
+    remplir(objets, nombre)
+    remplir(colonnes, nombre)
+    assert objets.disponibles_par_auteur() == colonnes.disponibles_par_auteur()
+    assert len(objets.livres_disponibles()) == colonnes.livres.nombre_disponibles() == nombre - len(range(0, nombre, 3))
+
+    duree_objets = chronometrer(objets.disponibles_par_auteur)
+    duree_colonnes = chronometrer(colonnes.disponibles_par_auteur)
+    print(f"{nombre} livres, disponibles par auteur :")
+    print(f"  dictionnaire d'objets : {duree_objets * 1e3:8.2f} ms")
+    print(f"  catalogue en colonnes : {duree_colonnes * 1e3:8.2f} ms (x{duree_objets / duree_colonnes:.0f})")
+
+    duree_objets = chronometrer(lambda: sum(1 for livre in objets.livres.values() if livre.disponible))
+    duree_colonnes = chronometrer(colonnes.livres.nombre_disponibles)
+    print(f"{nombre} livres, nombre de livres disponibles :")
+    print(f"  dictionnaire d'objets : {duree_objets * 1e3:8.2f} ms")
+    print(f"  catalogue en colonnes : {duree_colonnes * 1e3:8.2f} ms (x{duree_objets / duree_colonnes:.0f})")
@@ -0,0 +1,144 @@
+"""
+Test de charge des emprunts et retours concurrents : débit selon le nombre de threads et vérification des
+invariants de la bibliothèque.
+
+Chaque thread emprunte ou retourne des livres tirés au hasard parmi un petit nombre de livres à un, deux ou
+trois exemplaires, pour provoquer des conflits ; un emprunteur garde chaque livre jusqu'à ce qu'il le tire
+de nouveau, si bien que des prêts sont en cours à tout moment. Pendant le test, un thread de contrôle prend
+régulièrement tous les verrous de la bibliothèque et vérifie ses invariants (voir verifier_invariants),
+puis une dernière vérification est faite à la fin. Le test échoue (AssertionError) à la première anomalie.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_concurrence [operations_par_thread]
+"""
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from src.Auteur import Auteur
+from src.Bibliotheque import Bibliotheque
+from src.Emprunteur import Emprunteur
+
+
+def verifier_invariants(bibliotheque: Bibliotheque) -> list:
+    """
+    Vérifie la cohérence des livres, des emprunteurs et du registre des prêts.
+
+    Invariants vérifiés :
+        - pour chaque livre, disponibles == exemplaires - nombre de prêts en cours du livre ;
+        - au plus un détenteur par exemplaire : pas plus de prêts en cours que d'exemplaires ;
+        - RegistrePrets.detenteurs et RegistrePrets.en_cours décrivent les mêmes prêts ;
+        - chaque prêt en cours figure dans les emprunts de son emprunteur, et inversement.
+
+    À appeler sans mutation concurrente (sous bibliotheque.verrous.tous()).
+
+    Returns:
+        list: La description de chaque anomalie trouvée (vide si tout est cohérent).
+    """
+    anomalies = []
+    prets = bibliotheque.prets
+    par_livre = Counter(book_id for book_id, _ in prets.en_cours)
+    par_emprunteur = Counter(id_emprunteur for _, id_emprunteur in prets.en_cours)
+
+    for book_id, livre in bibliotheque.livres.items():
+        nombre = par_livre[book_id]
+        if livre.disponibles != livre.exemplaires - nombre:
+            anomalies.append(f"livre {book_id} : {livre.disponibles} disponibles, {livre.exemplaires} exemplaires "
+                             f"et {nombre} prêts en cours")
+        if nombre > livre.exemplaires:
+            anomalies.append(f"livre {book_id} : {nombre} détenteurs pour {livre.exemplaires} exemplaires")
+        detenteurs = prets.detenteurs_livre(book_id)
+        if len(detenteurs) != nombre or any((book_id, id_emprunteur) not in prets.en_cours
+                                            for id_emprunteur in detenteurs):
+            anomalies.append(f"livre {book_id} : détenteurs {sorted(detenteurs)} incohérents avec les prêts en cours")
+
+    for id_emprunteur, emprunteur in bibliotheque.emprunteurs.items():
+        if len(emprunteur.emprunts) != par_emprunteur[id_emprunteur] or any(
+                (book_id, id_emprunteur) not in prets.en_cours for book_id in emprunteur.emprunts):
+            anomalies.append(f"emprunteur {id_emprunteur} : emprunts {sorted(emprunteur.emprunts)} incohérents "
+                             f"avec les prêts en cours")
+    return anomalies
+
+
+def bench_concurrence(nombre_threads: int, operations_par_thread: int, nombre_livres: int = 100) -> dict:
+    """
+    Lance nombre_threads threads d'emprunts/retours sur une même bibliothèque.
+
+    Returns:
+        dict: Le débit (opérations par seconde), le nombre d'emprunts réussis et le nombre de vérifications
+            des invariants.
+
+    Raises:
+        AssertionError: Si un invariant de la bibliothèque est violé, pendant ou après le test.
+    """
+    bibliotheque = Bibliotheque()
+    auteur = Auteur('Julien', 'Canadien')
+    for i in range(nombre_livres):
+        bibliotheque.ajouter_livre(book_id=str(i), titre=f"Titre {i}", auteur=auteur, exemplaires=1 + i % 3)
+    for i in range(nombre_threads):
+        bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id=str(i), nom=f"Emprunteur {i}"))
+
+    emprunts = [0] * nombre_threads
+    anomalies = []
+    verifications = [0]
+    fin = threading.Event()
+    barriere = threading.Barrier(nombre_threads + 2)
+
+    def travailler(numero: int):
+        id_emprunteur = str(numero)
+        emprunteur = bibliotheque.emprunteurs[id_emprunteur]
+        aleatoire = random.Random(numero)
+        barriere.wait()
+        for _ in range(operations_par_thread):
+            book_id = str(aleatoire.randrange(nombre_livres))
+            try:
+                if book_id in emprunteur.emprunts:
+                    bibliotheque.retourner_livre(book_id, id_emprunteur)
+                else:
+                    bibliotheque.emprunter_livre(book_id, id_emprunteur)
+                    emprunts[numero] += 1
+            except ValueError:
+                pass
+
+    def controler():
+        barriere.wait()
+        while not fin.wait(0.005):
+            with bibliotheque.verrous.tous():
+                anomalies.extend(verifier_invariants(bibliotheque))
+            verifications[0] += 1
+
+    threads = [threading.Thread(target=travailler, args=(i,)) for i in range(nombre_threads)]
+    controleur = threading.Thread(target=controler)
+    with open(os.devnull, 'w') as nul, contextlib.redirect_stdout(nul):
+        for thread in threads + [controleur]:
+            thread.start()
+        barriere.wait()
+        debut = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        duree = time.perf_counter() - debut
+        fin.set()
+        controleur.join()
+
+    anomalies.extend(verifier_invariants(bibliotheque))
+    verifications[0] += 1
+    if anomalies:
+        raise AssertionError(f"{len(anomalies)} anomalie(s), dont : " + " ; ".join(anomalies[:5]))
+
+    return {
+        'debit': nombre_threads * operations_par_thread / duree,
+        'emprunts': sum(emprunts),
+        'verifications': verifications[0],
+    }
+
+
+if __name__ == "__main__":
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    for nombre_threads in (1, 2, 4, 8, 16):
+        mesures = bench_concurrence(nombre_threads, operations)
+        print(f"{nombre_threads:>2} threads : {mesures['debit']:10.0f} op/s, "
+              f"{mesures['emprunts']} emprunts, invariants vérifiés {mesures['verifications']} fois")
@@ -0,0 +1,63 @@
+"""
+Mesure le temps d'import de src.Bibliotheque (dans un processus neuf), le coût de construction d'un Livre
+(validé, sans vérification, et avec l'ancien import dans __init__) et le débit de l'import en masse.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_demarrage [nombre_livres]
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.generateur import Generateur
+from src.Auteur import Auteur
+from src.Bibliotheque import Bibliotheque
+from src.Livre import Livre
+
+
+MESURE_IMPORT = "import time; debut = time.perf_counter(); import src.Bibliotheque; print(time.perf_counter() - debut)"
+
+
+def temps_import(nombre: int = 15) -> float:
+    """Retourne la durée médiane (en millisecondes) de l'import de src.Bibliotheque dans un processus neuf."""
+    durees = [float(subprocess.run([sys.executable, '-c', MESURE_IMPORT], capture_output=True, text=True,
+                                   check=True).stdout) for _ in range(nombre)]
+    return statistics.median(durees) * 1000
+
+
+def livre_import_dans_init(book_id: str, titre: str, auteur: Auteur) -> Livre:
+    """Construction comme avant : import d'Auteur à chaque appel, puis Livre validé."""
+    from src.Auteur import Auteur
+    return Livre(book_id=book_id, titre=titre, auteur=auteur)
+
+
+def chronometrer(fonction, arguments: list) -> float:
+    """Retourne la durée moyenne (en nanosecondes) d'un appel à fonction sur chaque tuple d'arguments."""
+    debut = time.perf_counter()
+    for book_id, titre, auteur in arguments:
+        fonction(book_id, titre, auteur)
+    return (time.perf_counter() - debut) / len(arguments) * 1e9
+
+
+if __name__ == "__main__":
+    nombre_livres = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    print(f"{'import de src.Bibliotheque':>36} : {temps_import():8.2f} ms")
+
+    auteur = Auteur('Julien', 'Canadien')
+    arguments = [(str(i), f"Titre {i}", auteur) for i in range(nombre_livres)]
+    essais = (
+        ("Livre, import dans __init__ (avant)", livre_import_dans_init),
+        ("Livre validé", lambda book_id, titre, auteur: Livre(book_id=book_id, titre=titre, auteur=auteur)),
+        ("Livre.construire_sans_verification", Livre.construire_sans_verification),
+    )
+    for nom, fonction in essais:
+        print(f"{nom:>36} : {chronometrer(fonction, arguments):8.0f} ns / livre")
+
+    lignes = list(Generateur(nombre_livres).lignes_livres())
+    bibliotheque = Bibliotheque()
+    debut = time.perf_counter()
+    bibliotheque.ajouter_livres_en_masse(lignes)
+    duree = time.perf_counter() - debut
+    print(f"{'ajouter_livres_en_masse':>36} : {nombre_livres / duree:8.0f} livres/s")
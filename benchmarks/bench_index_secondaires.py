@@ -0,0 +1,57 @@
+"""
+Compare les requêtes qui utilisent les index secondaires (livres_disponibles, auteurs_par_nationalite,
+emprunteurs_avec_plus_de) au parcours complet de livres, auteurs ou emprunteurs qu'elles remplacent.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_index_secondaires [nombre_livres] [nombre_emprunteurs] [nombre_requetes]
+"""
+import sys
+import time
+
+from benchmarks.generateur import Generateur
+from src.Bibliotheque import Bibliotheque
+
+
+def chronometrer(fonction, nombre: int) -> float:
+    """Retourne la durée moyenne (en millisecondes) d'un appel à fonction."""
+    debut = time.perf_counter()
+    for _ in range(nombre):
+        fonction()
+    return (time.perf_counter() - debut) / nombre * 1000
+
+
+if __name__ == "__main__":
+    nombre_livres = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    nombre_emprunteurs = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    nombre_requetes = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    generateur = Generateur(nombre_livres)
+    bibliotheque = Bibliotheque()
+    bibliotheque.ajouter_livres_en_masse(generateur.lignes_livres())
+    for emprunteur in generateur.emprunteurs(nombre_emprunteurs):
+        bibliotheque.ajouter_emprunteur(emprunteur)
+
+    # Un livre sur deux est emprunté ; un prêt sur sept va à l'un des 50 premiers emprunteurs
+    for i in range(0, nombre_livres, 2):
+        emprunteur_id = i % 50 if i % 7 == 0 else i // 2 % nombre_emprunteurs
+        bibliotheque.emprunter_livre(str(i), str(emprunteur_id))
+
+    requetes = [
+        ("livres disponibles",
+         lambda: [livre for livre in bibliotheque.livres.values() if livre.disponible],
+         bibliotheque.livres_disponibles),
+        ("auteurs de nationalité Belge",
+         lambda: [auteur for auteur in bibliotheque.auteurs.values() if auteur.nationalite == 'Belge'],
+         lambda: bibliotheque.auteurs_par_nationalite('Belge')),
+        ("emprunteurs avec plus de 10 livres",
+         lambda: [e for e in bibliotheque.emprunteurs.values() if len(e.emprunts) > 10],
+         lambda: bibliotheque.emprunteurs_avec_plus_de(10)),
+    ]
+    print(f"{nombre_livres} livres, {len(bibliotheque.auteurs)} auteurs, {nombre_emprunteurs} emprunteurs, "
+          f"{len(bibliotheque.prets)} prêts")
+    for nom, parcours, index in requetes:
+        assert len(parcours()) == len(index())
+        duree_parcours = chronometrer(parcours, nombre_requetes)
+        duree_index = chronometrer(index, nombre_requetes)
+        print(f"{nom:>36} ({len(index()):6} résultats) : parcours {duree_parcours:8.3f} ms, "
+              f"index {duree_index:8.3f} ms (x{duree_parcours / duree_index:.0f})")
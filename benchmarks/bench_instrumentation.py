@@ -0,0 +1,57 @@
+"""
+Mesure le surcoût de l'instrumentation (désactivée et activée) et du gestionnaire d'erreur sur des appels courts.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_instrumentation [nombre_appels]
+"""
+import contextlib
+import io
+import logging
+import sys
+import time
+
+from src.Bibliotheque import Bibliotheque
+from src.Emprunteur import Emprunteur
+from src.Instrumentation import journaliser_erreur
+
+
+def chronometrer(fonction, nombre: int) -> float:
+    """Retourne la durée moyenne (en microsecondes) d'un appel à fonction."""
+    debut = time.perf_counter()
+    for _ in range(nombre):
+        fonction()
+    return (time.perf_counter() - debut) / nombre * 1e6
+
+
+def erreur(bibliotheque: Bibliotheque):
+    """Appel qui échoue : emprunt par un emprunteur inconnu."""
+    try:
+        bibliotheque.emprunter_livre('1', 'inconnu')
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    bibliotheque = Bibliotheque()
+    bibliotheque.ajouter_livres_en_masse((str(i), f"Titre {i}", "Auteur", "Canadien") for i in range(1000))
+    bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id='1', nom='Luc'))
+
+    # Référence : la méthode non décorée
+    recherche_brute = Bibliotheque.rechercher_livre.__wrapped__
+    print(f"{'sans décorateur':>34} : {chronometrer(lambda: recherche_brute(bibliotheque, 'titre 12'), nombre):6.2f} µs")
+    print(f"{'instrumentation désactivée':>34} : "
+          f"{chronometrer(lambda: bibliotheque.rechercher_livre('titre 12'), nombre):6.2f} µs")
+    bibliotheque.instrumentation.activer()
+    print(f"{'instrumentation activée':>34} : "
+          f"{chronometrer(lambda: bibliotheque.rechercher_livre('titre 12'), nombre):6.2f} µs")
+
+    nombre_erreurs = nombre // 10
+    with contextlib.redirect_stdout(io.StringIO()):
+        duree = chronometrer(lambda: erreur(bibliotheque), nombre_erreurs)
+    print(f"{'erreur affichée (print)':>34} : {duree:6.2f} µs")
+
+    logging.getLogger('bibliotheque').setLevel(logging.ERROR)
+    bibliotheque.instrumentation.gestionnaire_erreur = journaliser_erreur
+    print(f"{'erreur journalisée (niveau filtré)':>34} : {chronometrer(lambda: erreur(bibliotheque), nombre_erreurs):6.2f} µs")
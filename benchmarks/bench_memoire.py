@@ -0,0 +1,64 @@
+"""
+Mesure avec tracemalloc la mémoire occupée par livre, avec et sans __slots__.
+
+La version « avant » est simulée par une sous-classe de Livre sans __slots__, qui retrouve un __dict__
+par instance. Les chaînes (identifiants et titres) sont créées avant la mesure pour ne compter que les objets.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_memoire [nombre_livres]
+"""
+import sys
+import tracemalloc
+
+from src.Auteur import Auteur
+from src.Bibliotheque import Bibliotheque
+from src.Livre import Livre
+
+
+class LivreAvecDict(Livre):
+    """Livre avec un __dict__ par instance, comme avant l'ajout de __slots__."""
+
+
+def octets_par_livre(classe, nombre_livres: int) -> float:
+    """
+    Retourne le nombre moyen d'octets alloués par objet livre de la classe donnée.
+
+    Args:
+        classe (type): La classe de livre à instancier.
+        nombre_livres (int): Le nombre de livres à créer.
+    """
+    auteur = Auteur('Julien', 'Canadien')
+    ids = [str(i) for i in range(nombre_livres)]
+    titres = [f"Titre {i}" for i in range(nombre_livres)]
+
+    tracemalloc.start()
+    livres = [classe(book_id, titre, auteur) for book_id, titre in zip(ids, titres)]
+    taille, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del livres
+    return taille / nombre_livres
+
+
+def octets_par_livre_bibliotheque(nombre_livres: int) -> float:
+    """Retourne le nombre moyen d'octets alloués par livre ajouté à une Bibliotheque (index compris)."""
+    auteur = Auteur('Julien', 'Canadien')
+    lignes = [(str(i), f"Titre {i}", auteur) for i in range(nombre_livres)]
+
+    tracemalloc.start()
+    bibliotheque = Bibliotheque()
+    for book_id, titre, auteur in lignes:
+        bibliotheque.ajouter_livre(book_id=book_id, titre=titre, auteur=auteur)
+    taille, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return taille / nombre_livres
+
+
+if __name__ == "__main__":
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    avant = octets_par_livre(LivreAvecDict, nombre)
+    apres = octets_par_livre(Livre, nombre)
+    print(f"Livre avec __dict__  : {avant:8.1f} octets / livre")
+    print(f"Livre avec __slots__ : {apres:8.1f} octets / livre ({(1 - apres / avant) * 100:.0f}% de moins)")
+    print(f"Bibliotheque complète : {octets_par_livre_bibliotheque(nombre):8.1f} octets / livre")
@@ -0,0 +1,43 @@
+"""
+Mesure le coût d'un ajout de livre à mesure que les œuvres d'un même auteur augmentent.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_oeuvres_auteur [nombre_oeuvres]
+"""
+import sys
+import time
+
+from src.Auteur import Auteur
+from src.Bibliotheque import Bibliotheque
+
+
+def bench_oeuvres_auteur(nombre_oeuvres: int = 100_000, taille_tranche: int = 10_000):
+    """
+    Ajoute nombre_oeuvres livres distincts pour un seul auteur et mesure le temps moyen par ajout, par tranche.
+
+    Args:
+        nombre_oeuvres (int): Le nombre total d'œuvres à ajouter.
+        taille_tranche (int): Le nombre d'ajouts par mesure.
+
+    Returns:
+        list: Liste de tuples (nombre d'œuvres, microsecondes par ajout).
+    """
+    bibliotheque = Bibliotheque()
+    auteur = Auteur('Auteur prolifique', 'Canadien')
+    mesures = []
+
+    for debut in range(0, nombre_oeuvres, taille_tranche):
+        fin = min(debut + taille_tranche, nombre_oeuvres)
+        chrono = time.perf_counter()
+        for i in range(debut, fin):
+            bibliotheque.ajouter_livre(book_id=str(i), titre=f"Oeuvre {i}", auteur=auteur)
+        duree = time.perf_counter() - chrono
+        mesures.append((fin, duree / (fin - debut) * 1e6))
+
+    return mesures
+
+
+if __name__ == "__main__":
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for nombre_oeuvres, micro_secondes in bench_oeuvres_auteur(nombre):
+        print(f"{nombre_oeuvres:>8} oeuvres : {micro_secondes:8.2f} µs / ajout")
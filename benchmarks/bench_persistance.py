@@ -0,0 +1,100 @@
+"""
+Mesure le temps de démarrage d'une bibliothèque persistante : chargement de l'instantané et relecture du journal.
+
+L'objectif de quelques secondes (OBJECTIF_DEMARRAGE) pour 5 millions de livres n'est PAS atteint : la
+restauration prend environ 6,6 µs par livre (1,24 s pour 200 000 livres, 6,6 s pour 1 million), soit
+une trentaine de secondes pour 5 millions. La seule lecture de l'instantané (pickle de l'index de recherche et
+des colonnes) en prend déjà environ 2,8 s par million de livres ; le reste est la reconstruction des objets
+Livre et des index secondaires, un livre à la fois. Tenir l'objectif demanderait de ne plus matérialiser le
+catalogue au démarrage (par exemple un catalogue et un index projetés en mémoire, à la manière de
+CatalogueLectureSeule), ce qui n'est pas fait ici. Le script affiche la durée extrapolée à 5 millions de livres
+et si l'objectif est tenu ; --5m mesure directement 5 millions de livres (environ 1 Go d'instantané et
+plusieurs Go de mémoire).
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_persistance [nombre_livres] [nombre_operations_journal]
+    python -m benchmarks.bench_persistance --5m [nombre_operations_journal]
+"""
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+from src.Bibliotheque import Bibliotheque
+from src.Emprunteur import Emprunteur
+from src.Persistance import Journal, restaurer, sauvegarder_instantane
+
+
+# Objectif de temps de démarrage (en secondes) pour CIBLE_LIVRES livres
+OBJECTIF_DEMARRAGE = 5.0
+CIBLE_LIVRES = 5_000_000
+
+def bench_persistance(nombre_livres: int, nombre_operations: int, dossier: str) -> dict:
+    """
+    Écrit un instantané de nombre_livres livres et un journal de nombre_operations emprunts, puis les recharge.
+
+    Returns:
+        dict: Les durées (en secondes) d'écriture de l'instantané, de lecture seule du fichier et de restauration
+            complète (reconstruction des objets, relecture de l'index de recherche et de l'arbre BK comprises), et
+            la taille de l'instantané.
+    """
+    chemin_instantane = os.path.join(dossier, 'bibliotheque.instantane')
+    chemin_journal = os.path.join(dossier, 'bibliotheque.journal')
+
+    bibliotheque = Bibliotheque()
+    bibliotheque.ajouter_livres_en_masse(
+        (str(i), f"Titre {i}", f"Auteur {i % 10_000}", "Canadien") for i in range(nombre_livres)
+    )
+    bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id='1', nom='Luc'))
+
+    debut = time.perf_counter()
+    sauvegarder_instantane(bibliotheque, chemin_instantane)
+    duree_sauvegarde = time.perf_counter() - debut
+
+    bibliotheque.journal = Journal(chemin_journal)
+    for i in range(nombre_operations):
+        bibliotheque.emprunter_livre(str(i), '1')
+    bibliotheque.journal.fermer()
+
+    debut = time.perf_counter()
+    with open(chemin_instantane, 'rb') as fichier:
+        fichier.readline()
+        pickle.load(fichier)
+    duree_lecture = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    restauree = restaurer(chemin_instantane, chemin_journal)
+    duree_restauration = time.perf_counter() - debut
+    restauree.journal.fermer()
+
+    return {
+        'sauvegarde': duree_sauvegarde,
+        'lecture': duree_lecture,
+        'restauration': duree_restauration,
+        'taille_instantane': os.path.getsize(chemin_instantane),
+    }
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    if arguments[:1] == ['--5m']:
+        arguments = [str(CIBLE_LIVRES)] + arguments[1:]
+    nombre_livres = int(arguments[0]) if len(arguments) > 0 else 200_000
+    nombre_operations = int(arguments[1]) if len(arguments) > 1 else 10_000
+
+    with tempfile.TemporaryDirectory() as dossier:
+        mesures = bench_persistance(nombre_livres, nombre_operations, dossier)
+
+    print(f"{nombre_livres} livres, {nombre_operations} opérations dans le journal :")
+    print(f"  instantané    : {mesures['taille_instantane'] / nombre_livres:6.1f} octets / livre")
+    print(f"  sauvegarde    : {mesures['sauvegarde']:6.2f} s")
+    print(f"  lecture seule : {mesures['lecture']:6.2f} s")
+    print(f"  restauration  : {mesures['restauration']:6.2f} s (objets, index relus et journal)")
+
+    # Extrapolation linéaire quand la mesure porte sur moins de CIBLE_LIVRES livres
+    demarrage = mesures['restauration'] * CIBLE_LIVRES / nombre_livres
+    verdict = "atteint" if demarrage <= OBJECTIF_DEMARRAGE else "NON atteint"
+    estimation = "mesuré" if nombre_livres == CIBLE_LIVRES else "extrapolé"
+    print(f"  démarrage pour {CIBLE_LIVRES} livres ({estimation}) : {demarrage:6.1f} s, "
+          f"objectif {OBJECTIF_DEMARRAGE:.0f} s {verdict}")
@@ -0,0 +1,92 @@
+"""
+Compare l'ancien print_info_console (un print par ligne) et Rapport (un parcours, écriture par blocs)
+pour l'export de l'inventaire dans un fichier, dans chaque format, avec la mémoire maximale allouée.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_rapport [nombre_livres]
+"""
+import contextlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.generateur import Generateur
+from src.Bibliotheque import Bibliotheque
+
+
+def print_info_console_ancien(bibliotheque: Bibliotheque):
+    """print_info_console avant Rapport : un print par ligne, auteurs parcourus deux fois."""
+    print("Auteurs dans la bibliothèque:")
+    for nom_auteur, auteur in bibliotheque.auteurs.items():
+        print(f"- {auteur.nom}")
+
+    print("\nLivres dans la bibliothèque:")
+    for book_id, livre in bibliotheque.livres.items():
+        print(f"- {livre.titre} (ID: {livre.book_id}) (DISPONIBLE: {livre.disponible}"
+              f" - {livre.disponibles}/{livre.exemplaires} exemplaires)")
+
+    print("\nŒuvres de chaque auteur:")
+    for nom_auteur, auteur in bibliotheque.auteurs.items():
+        print(f"Œuvres de {nom_auteur}:")
+        for oeuvre in auteur.oeuvres:
+            print(f"- {oeuvre.titre}")
+        print()
+
+    print("Emprunteur:")
+    for emprunter_id, emprunteur in bibliotheque.emprunteurs.items():
+        print(f"- {emprunteur.nom} (ID: {emprunteur.emprunteur_id})")
+        for livre in emprunteur.livres_empruntes:
+            print(f"  * {livre.titre}")
+    print('-------------------fin-------------------')
+
+
+def mesurer(fonction, chemin: str, tampon: int) -> tuple:
+    """
+    Retourne la durée (en secondes) et le pic de mémoire allouée (en Ko) de fonction(fichier).
+
+    Le pic de mémoire est mesuré par une seconde exécution, tracemalloc ralentissant les allocations.
+
+    Args:
+        tampon (int): Le paramètre buffering d'open (1 : vidage à chaque ligne, comme sys.stdout sur un terminal).
+    """
+    with open(chemin, 'w', buffering=tampon, encoding='utf-8') as fichier:
+        debut = time.perf_counter()
+        fonction(fichier)
+        duree = time.perf_counter() - debut
+
+    with open(chemin, 'w', encoding='utf-8') as fichier:
+        tracemalloc.start()
+        fonction(fichier)
+        _, pic = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return duree, pic / 1024
+
+
+if __name__ == "__main__":
+    nombre_livres = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    generateur = Generateur(nombre_livres)
+    bibliotheque = Bibliotheque()
+    bibliotheque.ajouter_livres_en_masse(generateur.lignes_livres())
+    for emprunteur in generateur.emprunteurs(1000):
+        bibliotheque.ajouter_emprunteur(emprunteur)
+    for i in range(0, nombre_livres, 10):
+        bibliotheque.emprunter_livre(str(i), str(i % 1000))
+
+    def ancien(fichier):
+        with contextlib.redirect_stdout(fichier):
+            print_info_console_ancien(bibliotheque)
+
+    with tempfile.TemporaryDirectory() as repertoire:
+        chemin = os.path.join(repertoire, 'rapport')
+        essais = [("print par ligne (ancien)", ancien)]
+        essais += [(f"Rapport {format}", lambda fichier, format=format: bibliotheque.ecrire_rapport(fichier, format))
+                   for format in ('texte', 'csv', 'jsonl')]
+        for description, tampon in (("fichier vidé à chaque ligne (terminal)", 1), ("fichier par blocs", -1)):
+            print(description)
+            for nom, fonction in essais:
+                duree, pic = mesurer(fonction, chemin, tampon)
+                print(f"{nom:>26} : {duree:7.3f} s, {os.path.getsize(chemin) / 1e6:6.1f} Mo écrits, "
+                      f"pic de mémoire {pic:8.0f} Ko")
@@ -0,0 +1,66 @@
+"""
+Compare la recherche approximative par l'arbre BK avec un calcul de distance contre tous les mots du catalogue.
+
+Les titres sont formés de mots tirés d'un vocabulaire de pseudo-mots ; les requêtes sont des mots du
+vocabulaire avec une faute de frappe.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_recherche_approx [nombre_livres] [taille_vocabulaire] [nombre_requetes]
+"""
+import random
+import string
+import sys
+import time
+
+from src.ArbreBK import ArbreBK, distance_levenshtein, mots
+
+
+def faute(mot: str, aleatoire: random.Random) -> str:
+    """Retourne le mot avec une faute de frappe (substitution, suppression ou insertion d'une lettre)."""
+    position = aleatoire.randrange(len(mot))
+    lettre = aleatoire.choice(string.ascii_lowercase)
+    return aleatoire.choice([
+        mot[:position] + lettre + mot[position + 1:],
+        mot[:position] + mot[position + 1:],
+        mot[:position] + lettre + mot[position:],
+    ])
+
+
+if __name__ == "__main__":
+    nombre_livres = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    taille_vocabulaire = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    nombre_requetes = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    aleatoire = random.Random(0)
+
+    vocabulaire = list({
+        ''.join(aleatoire.choice(string.ascii_lowercase) for _ in range(aleatoire.randint(4, 10)))
+        for _ in range(taille_vocabulaire)
+    })
+    auteurs = [' '.join(aleatoire.sample(vocabulaire, 2)) for _ in range(1000)]
+
+    # L'arbre est construit directement, comme dans Bibliotheque._inserer_livre, sans les index de trigrammes
+    arbre = ArbreBK()
+    debut = time.perf_counter()
+    for i in range(nombre_livres):
+        for mot in set(aleatoire.sample(vocabulaire, 3)) | set(mots(aleatoire.choice(auteurs))):
+            arbre.ajouter(mot, str(i))
+    print(f"Indexation de {nombre_livres} livres ({len(arbre)} mots distincts) : {time.perf_counter() - debut:.1f} s")
+
+    requetes = [faute(aleatoire.choice(vocabulaire), aleatoire) for _ in range(nombre_requetes)]
+
+    for distance_max in (1, 2):
+        debut = time.perf_counter()
+        par_arbre = [arbre.rechercher(requete, distance_max) for requete in requetes]
+        duree_arbre = time.perf_counter() - debut
+
+        debut = time.perf_counter()
+        par_parcours = [
+            sorted((distance, mot) for mot in arbre.valeurs for distance in (distance_levenshtein(requete, mot),)
+                   if distance <= distance_max)
+            for requete in requetes
+        ]
+        duree_parcours = time.perf_counter() - debut
+        assert par_arbre == par_parcours
+
+        print(f"distance <= {distance_max} : arbre BK {duree_arbre / nombre_requetes * 1e3:8.2f} ms par mot, "
+              f"parcours de tous les mots {duree_parcours / nombre_requetes * 1e3:8.2f} ms par mot")
@@ -0,0 +1,42 @@
+"""
+Compare une recherche large avec rechercher_livre (tous les résultats) et la première page de rechercher_livre_classe.
+
+Mesure la durée et le pic de mémoire alloué (tracemalloc) pour chaque recherche.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_recherche_classee [nombre_livres] [taille_page]
+"""
+import sys
+import time
+import tracemalloc
+
+from src.Bibliotheque import Bibliotheque
+
+
+def mesurer(fonction):
+    """Retourne la durée (en secondes) et le pic de mémoire (en octets) d'un appel à fonction."""
+    tracemalloc.start()
+    debut = time.perf_counter()
+    fonction()
+    duree = time.perf_counter() - debut
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duree, pic
+
+
+if __name__ == "__main__":
+    nombre_livres = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    taille_page = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    bibliotheque = Bibliotheque()
+    bibliotheque.ajouter_livres_en_masse(
+        (str(i), f"Titre {i}", f"Auteur {i % 1000}", "Canadien") for i in range(nombre_livres)
+    )
+
+    for recherche in ('a', 'titre', 'titre 12', 'auteur 7'):
+        duree_tout, pic_tout = mesurer(lambda: bibliotheque.rechercher_livre(recherche))
+        duree_page, pic_page = mesurer(
+            lambda: list(bibliotheque.rechercher_livre_classe(recherche, limite=taille_page, decalage=taille_page))
+        )
+        print(f"{recherche!r:>12} : tout {duree_tout * 1e3:8.2f} ms / {pic_tout / 1e6:7.2f} Mo, "
+              f"page 2 {duree_page * 1e3:8.2f} ms / {pic_page / 1e6:7.2f} Mo")
@@ -0,0 +1,53 @@
+"""
+Mesure le débit de recherche d'une Bibliotheque et d'une BibliothequeRepartie selon le nombre de partitions.
+
+Le gain attendu dépend du nombre de cœurs disponibles (os.cpu_count()) : chaque partition ne parcourt que
+sa part du catalogue, en parallèle des autres, mais chaque recherche paie l'envoi aux partitions et le
+retour des résultats. Les partitions interrogent directement leur index : le cache de recherche de la
+Bibliotheque de référence est ramené à une entrée, pour que les requêtes répétées ne lui profitent pas.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_repartition [nombre_livres] [nombre_requetes] [partitions, séparées par des virgules]
+"""
+import os
+import sys
+import time
+
+from src.Bibliotheque import Bibliotheque
+from src.BibliothequeRepartie import BibliothequeRepartie
+from src.CacheRecherche import CacheRecherche
+
+
+def lignes(nombre_livres: int):
+    return ((str(i), f"Titre {i}", f"Auteur {i % 1000}", "Canadien") for i in range(nombre_livres))
+
+
+def mesurer(bibliotheque, requetes: list) -> float:
+    """Retourne le nombre de recherches par seconde."""
+    debut = time.perf_counter()
+    for recherche in requetes:
+        bibliotheque.rechercher_livre(recherche)
+    return len(requetes) / (time.perf_counter() - debut)
+
+
+if __name__ == "__main__":
+    nombre_livres = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    nombre_requetes = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    partitions = [int(n) for n in sys.argv[3].split(',')] if len(sys.argv) > 3 else [1, 2, 4, 8]
+
+    # Requêtes larges : « auteur 1 » correspond à 111 auteurs sur 1000, soit 11 % du catalogue
+    requetes = [f"auteur {i % 100}" for i in range(nombre_requetes)]
+    print(f"{os.cpu_count()} cœur(s) disponible(s)")
+
+    bibliotheque = Bibliotheque()
+    bibliotheque.cache = CacheRecherche(taille_max=1)   # Requêtes cycliques : aucun succès de cache
+    bibliotheque.ajouter_livres_en_masse(lignes(nombre_livres))
+    print(f"{'Bibliotheque':>28} : {mesurer(bibliotheque, requetes):8.0f} recherches/s")
+    assert bibliotheque.cache.succes == 0
+    del bibliotheque
+
+    for nombre_partitions in partitions:
+        with BibliothequeRepartie(nombre_partitions) as repartie:
+            repartie.ajouter_livres_en_masse(lignes(nombre_livres))
+            debit = mesurer(repartie, requetes)
+        print(f"{f'BibliothequeRepartie({nombre_partitions})':>28} : {debit:8.0f} recherches/s")
@@ -0,0 +1,48 @@
+"""
+Compare la recherche des prêts en retard par le tas des échéances avec un parcours de tous les emprunteurs.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_retards [nombre_prets]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from src.Bibliotheque import Bibliotheque
+from src.Emprunteur import Emprunteur
+from src.RegistrePrets import RegistrePrets
+
+
+if __name__ == "__main__":
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    aleatoire = random.Random(0)
+    debut = datetime(2024, 1, 1)
+
+    bibliotheque = Bibliotheque()
+    bibliotheque.ajouter_livres_en_masse((str(i), f"Titre {i}", "Auteur", "Canadien") for i in range(nombre))
+    for i in range(1000):
+        bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id=str(i), nom=f"Emprunteur {i}"))
+    for i in range(nombre):
+        bibliotheque.emprunter_livre(str(i), str(i % 1000), date_emprunt=debut + timedelta(minutes=aleatoire.randrange(525_600)))
+
+    for jours in (1, 30, 365):
+        maintenant = debut + RegistrePrets.DUREE_PRET + timedelta(days=jours)
+
+        chrono = time.perf_counter()
+        en_retard = bibliotheque.prets_en_retard(maintenant)
+        duree_tas = time.perf_counter() - chrono
+
+        chrono = time.perf_counter()
+        parcours = [
+            pret
+            for emprunteur in bibliotheque.emprunteurs.values() for book_id in emprunteur.emprunts
+            for pret in (bibliotheque.prets.en_cours[(book_id, emprunteur.emprunteur_id)],)
+            if pret.date_echeance < maintenant
+        ]
+        parcours.sort(key=lambda pret: pret.date_echeance)
+        duree_parcours = time.perf_counter() - chrono
+
+        assert len(parcours) == len(en_retard)
+        print(f"{len(en_retard):>8} prêts en retard sur {nombre} : tas {duree_tas * 1e3:8.2f} ms, "
+              f"parcours {duree_parcours * 1e3:8.2f} ms")
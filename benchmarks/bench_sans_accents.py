@@ -0,0 +1,55 @@
+"""
+Compare la recherche sans accents : pliage des titres à chaque requête, clés pliées précalculées et index.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.bench_sans_accents [nombre_livres] [nombre_requetes]
+"""
+import random
+import sys
+import time
+
+from src.Bibliotheque import Bibliotheque
+from src.IndexRecherche import plier
+
+
+MOTS = ["Œuvres", "étudiant", "Éléphant", "café", "Noël", "forêt", "Amos", "Daragon", "tome", "Ærø", "garçon", "île"]
+
+
+if __name__ == "__main__":
+    nombre_livres = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    nombre_requetes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    aleatoire = random.Random(0)
+
+    bibliotheque = Bibliotheque()
+    chrono = time.perf_counter()
+    bibliotheque.ajouter_livres_en_masse(
+        (str(i), f"{' '.join(aleatoire.sample(MOTS, 3))} {i}", f"Auteur {i % 1000}", "Française")
+        for i in range(nombre_livres)
+    )
+    print(f"Ajout de {nombre_livres} livres (index plié) : {time.perf_counter() - chrono:.2f} s")
+
+    requetes = [plier(aleatoire.choice(MOTS)) + ' ' + plier(aleatoire.choice(MOTS))[:3] for _ in range(nombre_requetes)]
+    livres = list(bibliotheque.livres.values())
+    cles_pliees = [(livre.book_id, plier(livre.titre), plier(livre.auteur.nom)) for livre in livres]
+
+    def pliage_par_requete(recherche):
+        recherche = plier(recherche)
+        return [livre.book_id for livre in livres
+                if recherche in plier(livre.titre) or recherche in plier(livre.auteur.nom)]
+
+    def cles_precalculees(recherche):
+        recherche = plier(recherche)
+        return [book_id for book_id, titre, nom in cles_pliees if recherche in titre or recherche in nom]
+
+    def index(recherche):
+        return bibliotheque.index.rechercher(recherche, sans_accents=True)
+
+    attendu = None
+    for nom, fonction in (("pliage par requête", pliage_par_requete), ("clés précalculées", cles_precalculees),
+                          ("index sans accents", index)):
+        chrono = time.perf_counter()
+        resultats = [fonction(recherche) for recherche in requetes]
+        duree = time.perf_counter() - chrono
+        attendu = attendu or resultats
+        assert resultats == attendu
+        print(f"{nom:>20} : {duree / nombre_requetes * 1e3:10.3f} ms par requête")
@@ -0,0 +1,165 @@
+"""
+Générateur déterministe de données synthétiques pour les benchmarks : auteurs, livres, emprunteurs et
+mélanges de requêtes selon une loi de Zipf.
+
+Les mêmes paramètres (et la même graine) produisent toujours les mêmes données, sur toutes les machines :
+les mesures restent comparables d'un commit à l'autre. Le titre et l'auteur du livre i sont calculés
+directement à partir de i, sans parcourir les livres précédents, ce qui permet de générer des catalogues
+de plusieurs millions de livres en continu et de construire des requêtes qui portent sur des livres existants.
+
+Exécution (depuis la racine du projet), pour afficher un échantillon :
+    python -m benchmarks.generateur [nombre_livres]
+"""
+import random
+import sys
+from itertools import accumulate
+
+from src.Emprunteur import Emprunteur
+
+
+NATIONALITES = ('Canadien', 'Français', 'Belge', 'Suisse', 'Sénégalais', 'Haïtien', 'Marocain', 'Libanais')
+
+PRENOMS = ('Anne', 'Gabrielle', 'Émile', 'Michel', 'Marie', 'Jacques', 'Hélène', 'Louis', 'Chloé', 'René',
+           'Françoise', 'Yves', 'Léa', 'André', 'Nathalie', 'Jean', 'Sophie', 'Gaston', 'Josée', 'Félix')
+
+CONSONNES = 'bcdfglmnprstv'
+VOYELLES = ('a', 'e', 'i', 'o', 'u', 'é', 'è', 'ou', 'an', 'on', 'in')
+
+# Nombre de mots distincts des titres et des noms d'auteurs
+TAILLE_VOCABULAIRE = 5000
+
+
+def vocabulaire(taille: int = TAILLE_VOCABULAIRE, graine: int = 0) -> list:
+    """
+    Retourne une liste de mots distincts, de deux à quatre syllabes, toujours la même pour une graine donnée.
+
+    Args:
+        taille (int): Le nombre de mots.
+        graine (int): La graine du générateur pseudo-aléatoire.
+
+    Returns:
+        list: Les mots, dans l'ordre de leur génération.
+    """
+    aleatoire = random.Random(graine)
+    mots = {}
+    while len(mots) < taille:
+        syllabes = aleatoire.randint(2, 4)
+        mot = ''.join(aleatoire.choice(CONSONNES) + aleatoire.choice(VOYELLES) for _ in range(syllabes))
+        mots[mot] = None
+    return list(mots)
+
+
+def _melanger(valeur: int) -> int:
+    """Fonction de hachage entière (sur 32 bits) qui disperse des entiers consécutifs."""
+    valeur = (valeur ^ (valeur >> 16)) * 0x45D9F3B & 0xFFFFFFFF
+    valeur = (valeur ^ (valeur >> 16)) * 0x45D9F3B & 0xFFFFFFFF
+    return valeur ^ (valeur >> 16)
+
+
+class Generateur:
+    """
+    Générateur de catalogue synthétique.
+
+    Attributes:
+        nombre_livres (int): Le nombre de livres du catalogue.
+        nombre_auteurs (int): Le nombre d'auteurs (par défaut un pour vingt livres).
+        graine (int): La graine, qui détermine le vocabulaire, les titres et les requêtes.
+        mots (list): Le vocabulaire des titres et des noms d'auteurs.
+    """
+
+    def __init__(self, nombre_livres: int, nombre_auteurs: int = None, graine: int = 0):
+        self.nombre_livres = nombre_livres
+        self.nombre_auteurs = nombre_auteurs or max(1, nombre_livres // 20)
+        self.graine = graine
+        self.mots = vocabulaire(graine=graine)
+
+
+    def titre(self, i: int) -> str:
+        """Retourne le titre du livre i (de deux à cinq mots du vocabulaire)."""
+        mots = self.mots
+        valeur = _melanger(i ^ self.graine)
+        nombre_mots = 2 + valeur % 4
+        termes = []
+        for _ in range(nombre_mots):
+            valeur = _melanger(valeur + 1)
+            termes.append(mots[valeur % len(mots)])
+        termes[0] = termes[0].capitalize()
+        return ' '.join(termes)
+
+
+    def auteur(self, j: int) -> tuple:
+        """Retourne le nom et la nationalité de l'auteur j (noms distincts)."""
+        mots = self.mots
+        nom = PRENOMS[j % len(PRENOMS)] + ' ' + mots[(j // len(PRENOMS)) % len(mots)].capitalize()
+        rang = j // (len(PRENOMS) * len(mots))
+        if rang:
+            nom += f" {rang + 1}"
+        return nom, NATIONALITES[_melanger(j) % len(NATIONALITES)]
+
+
+    def auteur_du_livre(self, i: int) -> int:
+        """Retourne l'indice de l'auteur du livre i."""
+        return _melanger(i * 31 + self.graine) % self.nombre_auteurs
+
+
+    def lignes_livres(self, debut: int = 0, fin: int = None):
+        """
+        Génère les lignes (book_id, titre, nom de l'auteur, nationalité) des livres debut à fin (exclu),
+        au format accepté par Bibliotheque.ajouter_livres_en_masse.
+
+        Yields:
+            tuple: Une ligne par livre.
+        """
+        fin = self.nombre_livres if fin is None else fin
+        for i in range(debut, fin):
+            nom, nationalite = self.auteur(self.auteur_du_livre(i))
+            yield str(i), self.titre(i), nom, nationalite
+
+
+    def emprunteurs(self, nombre: int) -> list:
+        """Retourne nombre emprunteurs, d'identifiants '0' à str(nombre - 1)."""
+        return [Emprunteur(emprunteur_id=str(i), nom=f"{PRENOMS[i % len(PRENOMS)]} {i}") for i in range(nombre)]
+
+
+    def requetes(self, nombre: int, taille_bassin: int = 2000, exposant: float = 1.1) -> list:
+        """
+        Retourne un mélange de requêtes tirées selon une loi de Zipf : quelques requêtes très fréquentes
+        et une longue traîne de requêtes rares, comme dans un catalogue réel.
+
+        Le bassin de requêtes contient des titres complets (40 %), des fragments de deux mots d'un titre (30 %),
+        des noms d'auteurs (20 %) et des mots isolés du vocabulaire (10 %) ; chaque requête trouve au moins
+        un livre, sauf les mots isolés qui peuvent ne figurer dans aucun titre des petits catalogues.
+
+        Args:
+            nombre (int): Le nombre de requêtes.
+            taille_bassin (int): Le nombre de requêtes distinctes.
+            exposant (float): L'exposant de la loi de Zipf (le poids de la requête de rang r est 1 / r**exposant).
+
+        Returns:
+            list: Les requêtes, dans l'ordre où les exécuter.
+        """
+        aleatoire = random.Random(self.graine + 1)
+        bassin = []
+        for _ in range(taille_bassin):
+            tirage = aleatoire.random()
+            i = aleatoire.randrange(self.nombre_livres)
+            if tirage < 0.4:
+                bassin.append(self.titre(i))
+            elif tirage < 0.7:
+                mots = self.titre(i).split()
+                k = aleatoire.randrange(len(mots) - 1)
+                bassin.append(' '.join(mots[k:k + 2]))
+            elif tirage < 0.9:
+                bassin.append(self.auteur(self.auteur_du_livre(i))[0])
+            else:
+                bassin.append(aleatoire.choice(self.mots))
+
+        poids_cumules = list(accumulate(1 / rang ** exposant for rang in range(1, taille_bassin + 1)))
+        return aleatoire.choices(bassin, cum_weights=poids_cumules, k=nombre)
+
+
+if __name__ == "__main__":
+    generateur = Generateur(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
+    for ligne in generateur.lignes_livres(fin=min(generateur.nombre_livres, 10)):
+        print(ligne)
+    print(generateur.requetes(10))
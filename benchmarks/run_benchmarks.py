@@ -0,0 +1,254 @@
+"""
+Suite de benchmarks de Bibliotheque, à côté de run_tests.py : ajouter_livre, rechercher_livre,
+emprunter_livre, retourner_livre et print_info_console sur des catalogues synthétiques déterministes
+(benchmarks/generateur.py) de 10k, 100k, 1M ou 10M livres.
+
+Les résultats sont écrits en JSON (un fichier par commit, par exemple) et peuvent être comparés à un
+fichier précédent : une opération dont le débit baisse de plus du seuil est signalée comme régression et
+le script se termine avec le code 1.
+
+Mémoire : une Bibliotheque complète (index de trigrammes, arbre BK) occupe environ 1,3 Ko par livre
+généré ; l'échelle 1m demande donc environ 1,5 Go et l'échelle 10m une quinzaine.
+
+Exécution (depuis la racine du projet) :
+    python -m benchmarks.run_benchmarks [--echelles 10k,100k] [--sortie resultats.json]
+                                        [--comparer precedent.json] [--seuil 0.1] [--repetitions 3]
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.generateur import Generateur
+from src.Auteur import Auteur
+from src.Bibliotheque import Bibliotheque
+
+
+ECHELLES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+NOMBRE_REQUETES = 5000
+NOMBRE_PRETS = 10_000
+NOMBRE_EMPRUNTEURS = 1000
+
+# Nombre d'erreurs affichées en détail après chaque échelle
+ERREURS_AFFICHEES = 10
+
+
+def mesure(nombre: int, durees: list) -> dict:
+    """Retourne la mesure d'une opération exécutée nombre fois par répétition (meilleure durée retenue)."""
+    duree = min(durees)
+    return {
+        'operations': nombre,
+        'duree_s': round(duree, 6),
+        'operations_par_s': round(nombre / duree, 1),
+        'us_par_operation': round(duree / nombre * 1e6, 3),
+    }
+
+
+def construire(generateur: Generateur) -> tuple:
+    """
+    Construit la bibliothèque par des appels successifs à ajouter_livre et mesure leur durée.
+
+    Les auteurs sont créés avant la mesure, comme le ferait un appelant qui les réutilise.
+    """
+    auteurs = {}
+    lignes = []
+    for book_id, titre, nom, nationalite in generateur.lignes_livres():
+        auteur = auteurs.get(nom)
+        if auteur is None:
+            auteur = auteurs[nom] = Auteur(nom, nationalite)
+        lignes.append((book_id, titre, auteur))
+
+    bibliotheque = Bibliotheque()
+    debut = time.perf_counter()
+    for book_id, titre, auteur in lignes:
+        bibliotheque.ajouter_livre(book_id, titre, auteur)
+    duree = time.perf_counter() - debut
+    return bibliotheque, mesure(len(lignes), [duree])
+
+
+def mesurer_recherches(bibliotheque: Bibliotheque, requetes: list, repetitions: int) -> dict:
+    """Mesure rechercher_livre sur le mélange de requêtes, cache vidé avant chaque répétition."""
+    durees = []
+    for _ in range(repetitions):
+        bibliotheque.cache.vider()
+        debut = time.perf_counter()
+        for recherche in requetes:
+            try:
+                bibliotheque.rechercher_livre(recherche)
+            except ValueError:
+                pass
+        durees.append(time.perf_counter() - debut)
+    resultat = mesure(len(requetes), durees)
+    resultat['cache'] = bibliotheque.cache.statistiques()
+    return resultat
+
+
+def mesurer_prets(bibliotheque: Bibliotheque, generateur: Generateur, repetitions: int) -> tuple:
+    """Mesure emprunter_livre puis retourner_livre sur des livres et des emprunteurs répartis dans le catalogue."""
+    for emprunteur in generateur.emprunteurs(NOMBRE_EMPRUNTEURS):
+        bibliotheque.ajouter_emprunteur(emprunteur)
+
+    nombre = min(NOMBRE_PRETS, generateur.nombre_livres)
+    pas = generateur.nombre_livres // nombre
+    prets = [(str(k * pas), str(k % NOMBRE_EMPRUNTEURS)) for k in range(nombre)]
+
+    durees_emprunts, durees_retours = [], []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        for book_id, id_emprunteur in prets:
+            bibliotheque.emprunter_livre(book_id, id_emprunteur)
+        durees_emprunts.append(time.perf_counter() - debut)
+
+        debut = time.perf_counter()
+        for book_id, id_emprunteur in prets:
+            bibliotheque.retourner_livre(book_id, id_emprunteur)
+        durees_retours.append(time.perf_counter() - debut)
+    return mesure(nombre, durees_emprunts), mesure(nombre, durees_retours)
+
+
+def mesurer_affichage(bibliotheque: Bibliotheque, repetitions: int) -> dict:
+    """Mesure print_info_console, sortie redirigée vers os.devnull (une opération par livre affiché)."""
+    durees = []
+    with open(os.devnull, 'w', encoding='utf-8') as nulle, contextlib.redirect_stdout(nulle):
+        for _ in range(repetitions):
+            debut = time.perf_counter()
+            bibliotheque.print_info_console()
+            durees.append(time.perf_counter() - debut)
+    return mesure(len(bibliotheque.livres), durees)
+
+
+def collecter_erreurs(bibliotheque: Bibliotheque) -> list:
+    """
+    Remplace le gestionnaire d'erreur de la bibliothèque (qui les affiche) par une collecte en mémoire, pour
+    que l'écriture sur la console ne soit pas comptée dans les durées mesurées.
+
+    Returns:
+        list: La liste qui reçoit les erreurs (opération, message, erreur).
+    """
+    erreurs = []
+    bibliotheque.instrumentation.gestionnaire_erreur = lambda operation, message, erreur: erreurs.append(
+        (operation, message, erreur)
+    )
+    return erreurs
+
+
+def executer_echelle(nombre_livres: int, repetitions: int, graine: int) -> tuple:
+    """
+    Exécute tous les benchmarks sur un catalogue de nombre_livres livres.
+
+    Returns:
+        tuple: Les mesures et les erreurs collectées pendant les mesures (opération, message, erreur).
+    """
+    generateur = Generateur(nombre_livres, graine=graine)
+    bibliotheque, ajout = construire(generateur)
+    erreurs = collecter_erreurs(bibliotheque)
+    resultats = {'ajouter_livre': ajout}
+    resultats['rechercher_livre'] = mesurer_recherches(
+        bibliotheque, generateur.requetes(NOMBRE_REQUETES), repetitions
+    )
+    resultats['emprunter_livre'], resultats['retourner_livre'] = mesurer_prets(bibliotheque, generateur, repetitions)
+    resultats['print_info_console'] = mesurer_affichage(bibliotheque, repetitions)
+    resultats['memoire_max_mo'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    resultats['erreurs'] = len(erreurs)
+    return resultats, erreurs
+
+
+def commit_courant():
+    """Retourne le commit git courant, ou None hors d'un dépôt git."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparer(precedent: dict, actuel: dict, seuil: float) -> list:
+    """
+    Affiche l'évolution du débit de chaque opération mesurée dans les deux résultats.
+
+    Returns:
+        list: Les régressions (échelle, opération, rapport des débits), le débit ayant baissé de plus du seuil.
+    """
+    regressions = []
+    print(f"\nComparaison avec {precedent.get('commit')} ({precedent.get('date')}) :")
+    for echelle, operations in echelles_triees(actuel):
+        anciennes = precedent['echelles'].get(echelle)
+        if anciennes is None:
+            continue
+        for operation, valeurs in operations.items():
+            if not isinstance(valeurs, dict) or operation not in anciennes:
+                continue
+            rapport = valeurs['operations_par_s'] / anciennes[operation]['operations_par_s']
+            signal = ''
+            if rapport < 1 - seuil:
+                signal = '  RÉGRESSION'
+                regressions.append((echelle, operation, rapport))
+            print(f"  {echelle:>5} {operation:<20} {anciennes[operation]['operations_par_s']:>12.1f} -> "
+                  f"{valeurs['operations_par_s']:>12.1f} op/s ({(rapport - 1) * 100:+6.1f} %){signal}")
+    return regressions
+
+
+def echelles_triees(resultats: dict):
+    """Retourne les échelles des résultats dans l'ordre croissant du nombre de livres."""
+    return sorted(resultats['echelles'].items(), key=lambda element: ECHELLES.get(element[0], 0))
+
+
+if __name__ == "__main__":
+    parseur = argparse.ArgumentParser(description="Benchmarks de Bibliotheque.")
+    parseur.add_argument('--echelles', default='10k',
+                         help="Échelles séparées par des virgules, parmi " + ', '.join(ECHELLES))
+    parseur.add_argument('--sortie', help="Fichier JSON où écrire les résultats")
+    parseur.add_argument('--comparer', help="Fichier JSON de résultats précédents à comparer")
+    parseur.add_argument('--seuil', type=float, default=0.1,
+                         help="Baisse relative de débit signalée comme régression (0.1 = 10 %%)")
+    parseur.add_argument('--repetitions', type=int, default=3, help="Répétitions (meilleure durée retenue)")
+    parseur.add_argument('--graine', type=int, default=0, help="Graine du générateur de données")
+    arguments = parseur.parse_args()
+
+    echelles = arguments.echelles.split(',')
+    inconnues = [echelle for echelle in echelles if echelle not in ECHELLES]
+    if inconnues:
+        parseur.error(f"Échelle(s) inconnue(s) : {', '.join(inconnues)}")
+
+    resultats = {
+        'commit': commit_courant(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plateforme': platform.platform(),
+        'graine': arguments.graine,
+        'echelles': {},
+    }
+    for echelle in sorted(echelles, key=ECHELLES.get):
+        print(f"Échelle {echelle} ({ECHELLES[echelle]} livres)...", flush=True)
+        mesures, erreurs = executer_echelle(ECHELLES[echelle], arguments.repetitions, arguments.graine)
+        resultats['echelles'][echelle] = mesures
+        for operation, valeurs in mesures.items():
+            if isinstance(valeurs, dict):
+                print(f"  {operation:<20} {valeurs['operations_par_s']:>12.1f} op/s "
+                      f"({valeurs['us_par_operation']:.2f} µs)")
+        print(f"  {'mémoire maximale':<20} {mesures['memoire_max_mo']:>12.1f} Mo")
+
+        # Erreurs collectées pendant les mesures, affichées hors chronométrage
+        print(f"  {'erreurs':<20} {len(erreurs):>12}")
+        for operation, message, erreur in erreurs[:ERREURS_AFFICHEES]:
+            print(f"    {operation} : {message} : {erreur}")
+        if len(erreurs) > ERREURS_AFFICHEES:
+            print(f"    ... et {len(erreurs) - ERREURS_AFFICHEES} autre(s)")
+
+    if arguments.sortie:
+        with open(arguments.sortie, 'w', encoding='utf-8') as fichier:
+            json.dump(resultats, fichier, indent=2, ensure_ascii=False)
+
+    if arguments.comparer:
+        with open(arguments.comparer, encoding='utf-8') as fichier:
+            regressions = comparer(json.load(fichier), resultats, arguments.seuil)
+        if regressions:
+            print(f"\n{len(regressions)} régression(s) au-delà de {arguments.seuil:.0%}.")
+            sys.exit(1)
@@ -0,0 +1,123 @@
+import re
+
+
+MOT = re.compile(r'\w+')
+
+
+def mots(texte: str):
+    """Retourne les mots d'un texte déjà normalisé (suites de lettres et de chiffres)."""
+    return MOT.findall(texte)
+
+
+def distance_levenshtein(a: str, b: str) -> int:
+    """
+    Retourne la distance de Levenshtein entre deux chaînes (insertions, suppressions et substitutions).
+
+    Args:
+        a (str): La première chaîne.
+        b (str): La deuxième chaîne.
+
+    Returns:
+        int: Le nombre minimal de modifications pour passer de a à b.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    # Programmation dynamique ligne par ligne ; comparaisons explicites plutôt que min() (deux fois plus rapide)
+    precedente = list(range(len(b) + 1))
+    for i, car_a in enumerate(a, 1):
+        courante = [i]
+        gauche = i
+        for j, car_b in enumerate(b):
+            cout = precedente[j] if car_a == car_b else precedente[j] + 1
+            if precedente[j + 1] + 1 < cout:
+                cout = precedente[j + 1] + 1
+            if gauche + 1 < cout:
+                cout = gauche + 1
+            courante.append(cout)
+            gauche = cout
+        precedente = courante
+    return precedente[-1]
+
+
+class ArbreBK:
+    """
+    Arbre BK (Burkhard-Keller) pour la recherche approximative de mots selon la distance de Levenshtein.
+
+    Chaque nœud range ses enfants selon leur distance au mot du nœud. Par l'inégalité triangulaire, une
+    recherche à distance au plus n d'un mot à distance d d'un nœud ne visite que les enfants rangés entre
+    d - n et d + n : seule une petite partie des mots est comparée à la recherche.
+
+    Les mots composés uniquement de chiffres (numéros de tome, années) ne sont pas placés dans l'arbre et ne
+    correspondent qu'exactement : « tome 2 » ne doit pas trouver « tome 3 ».
+
+    Attributes:
+        valeurs (dict): Dictionnaire mot -> ensemble des valeurs (par exemple des book_id) associées au mot.
+    """
+
+    def __init__(self):
+        self.valeurs = {}
+        self._racine = None
+
+
+    def ajouter(self, mot: str, valeur) -> None:
+        """
+        Associe une valeur à un mot, en ajoutant le mot à l'arbre s'il est nouveau.
+
+        Args:
+            mot (str): Le mot (déjà normalisé).
+            valeur: La valeur associée au mot.
+        """
+        valeurs = self.valeurs.get(mot)
+        if valeurs is not None:
+            valeurs.add(valeur)
+            return
+        self.valeurs[mot] = {valeur}
+        if mot.isdigit():
+            return
+
+        # Un nœud est un tuple (mot, enfants) où enfants est un dictionnaire distance -> nœud
+        if self._racine is None:
+            self._racine = (mot, {})
+            return
+        noeud = self._racine
+        while True:
+            distance = distance_levenshtein(mot, noeud[0])
+            enfant = noeud[1].get(distance)
+            if enfant is None:
+                noeud[1][distance] = (mot, {})
+                return
+            noeud = enfant
+
+
+    def rechercher(self, mot: str, distance_max: int):
+        """
+        Retourne les mots de l'arbre à distance au plus distance_max du mot recherché.
+
+        Args:
+            mot (str): Le mot recherché (déjà normalisé).
+            distance_max (int): La distance de Levenshtein maximale.
+
+        Returns:
+            list: Les tuples (distance, mot), du plus proche au plus éloigné.
+        """
+        if mot.isdigit() or distance_max <= 0:
+            return [(0, mot)] if mot in self.valeurs else []
+
+        resultat = []
+        a_visiter = [self._racine] if self._racine is not None else []
+        while a_visiter:
+            mot_noeud, enfants = a_visiter.pop()
+            distance = distance_levenshtein(mot, mot_noeud)
+            if distance <= distance_max:
+                resultat.append((distance, mot_noeud))
+            a_visiter.extend(
+                enfant for ecart, enfant in enfants.items() if distance - distance_max <= ecart <= distance + distance_max
+            )
+        resultat.sort()
+        return resultat
+
+
+    def __len__(self):
+        return len(self.valeurs)
@@ -0,0 +1,149 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from src.Auteur import Auteur
+from src.Bibliotheque import Bibliotheque
+from src.Emprunteur import Emprunteur
+
+
+class AsyncBibliotheque:
+    """
+    Façade asynchrone d'une Bibliotheque pour les applications asyncio.
+
+    Les appels concurrents sont placés dans une file puis regroupés en lots : chaque lot est appliqué, dans
+    l'ordre d'arrivée, par un seul appel à un thread dédié. La boucle d'événements n'est donc jamais bloquée
+    et le coût d'un passage par l'exécuteur est partagé entre toutes les requêtes du lot.
+
+    Attributes:
+        bibliotheque (Bibliotheque): La bibliothèque sous-jacente.
+        taille_lot (int): Le nombre maximal de requêtes appliquées par lot.
+    """
+
+    def __init__(self, bibliotheque: Bibliotheque = None, taille_lot: int = 512):
+        self.bibliotheque = Bibliotheque() if bibliotheque is None else bibliotheque
+        self.taille_lot = taille_lot
+        self._executeur = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bibliotheque')
+        self._file = None
+        self._tache = None
+        self._fermee = False
+
+
+    async def ajouter_livre(self, book_id: str, titre: str, auteur: Auteur, exemplaires: int = 1):
+        """Version asynchrone de Bibliotheque.ajouter_livre."""
+        return await self._soumettre(self.bibliotheque.ajouter_livre, book_id, titre, auteur, exemplaires)
+
+
+    async def ajouter_exemplaires(self, book_id: str, nombre: int = 1):
+        """Version asynchrone de Bibliotheque.ajouter_exemplaires."""
+        return await self._soumettre(self.bibliotheque.ajouter_exemplaires, book_id, nombre)
+
+
+    async def ajouter_emprunteur(self, emprunteur: Emprunteur):
+        """Version asynchrone de Bibliotheque.ajouter_emprunteur."""
+        return await self._soumettre(self.bibliotheque.ajouter_emprunteur, emprunteur)
+
+
+    async def rechercher_livre(self, recherche: str, sans_accents: bool = False):
+        """Version asynchrone de Bibliotheque.rechercher_livre."""
+        return await self._soumettre(self.bibliotheque.rechercher_livre, recherche, sans_accents)
+
+
+    async def emprunter_livre(self, book_id: str, id_emprunteur: str):
+        """Version asynchrone de Bibliotheque.emprunter_livre."""
+        return await self._soumettre(self.bibliotheque.emprunter_livre, book_id, id_emprunteur)
+
+
+    async def retourner_livre(self, book_id: str, id_emprunteur: str):
+        """Version asynchrone de Bibliotheque.retourner_livre."""
+        return await self._soumettre(self.bibliotheque.retourner_livre, book_id, id_emprunteur)
+
+
+    async def _soumettre(self, methode, *args):
+        """Place une requête dans la file et attend son résultat (ou son exception)."""
+        if self._fermee:
+            raise RuntimeError("AsyncBibliotheque fermée")
+        if self._tache is None:
+            self._file = asyncio.Queue()
+            self._tache = asyncio.get_running_loop().create_task(self._traiter())
+
+        future = asyncio.get_running_loop().create_future()
+        self._file.put_nowait((methode, args, future))
+        return await future
+
+
+    async def _traiter(self):
+        """Vide la file par lots, jusqu'à l'annulation de la tâche."""
+        boucle = asyncio.get_running_loop()
+        while True:
+            lot = [await self._file.get()]
+            while len(lot) < self.taille_lot and not self._file.empty():
+                lot.append(self._file.get_nowait())
+
+            execution = boucle.run_in_executor(self._executeur, self._appliquer_lot, lot)
+            try:
+                resultats = await asyncio.shield(execution)
+            except asyncio.CancelledError:
+                # Le lot est déjà confié au thread et y sera appliqué : ses appelants reçoivent leurs
+                # résultats avant l'arrêt de la tâche, au lieu d'attendre indéfiniment.
+                self._repondre(lot, await execution)
+                raise
+            self._repondre(lot, resultats)
+
+
+    @staticmethod
+    def _repondre(lot, resultats):
+        """Transmet à chaque requête du lot son résultat ou son exception."""
+        for (_, _, future), (reussi, valeur) in zip(lot, resultats):
+            if future.done():
+                continue
+            if reussi:
+                future.set_result(valeur)
+            else:
+                future.set_exception(valeur)
+
+
+    @staticmethod
+    def _appliquer_lot(lot):
+        """Applique les requêtes d'un lot dans l'ordre (exécuté dans le thread dédié)."""
+        resultats = []
+        for methode, args, _ in lot:
+            try:
+                resultats.append((True, methode(*args)))
+            except Exception as e:
+                resultats.append((False, e))
+        return resultats
+
+
+    async def fermer(self):
+        """
+        Arrête le traitement de la file et le thread dédié.
+
+        Le lot en cours d'application est terminé et ses appelants reçoivent leurs résultats ; les requêtes
+        encore dans la file sont annulées. Les appels suivants lèvent RuntimeError ; fermer une façade déjà
+        fermée n'a aucun effet.
+        """
+        if self._fermee:
+            return
+        self._fermee = True
+
+        if self._tache is not None:
+            self._tache.cancel()
+            try:
+                await self._tache
+            except asyncio.CancelledError:
+                pass
+            self._tache = None
+
+            # Les requêtes encore en attente ne seront pas traitées
+            while not self._file.empty():
+                _, _, future = self._file.get_nowait()
+                future.cancel()
+        self._executeur.shutdown(wait=True)
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, *exc):
+        await self.fermer()
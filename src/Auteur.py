@@ -7,8 +7,14 @@ class Auteur:
     Attributes:
         nom (str): Le nom de l'auteur.
         nationalite (str): La nationalité de l'auteur.
-        oeuvres (List[Livre]): La liste des œuvres de l'auteur.
+        oeuvres (List[Livre]): La liste des œuvres de l'auteur (ou OeuvresColonnes si ses livres sont stockés
+            dans un CatalogueColonnes : seuls les rangs sont conservés, les vues sont construites à la lecture).
+        titres (dict): Index des œuvres par titre (titre -> position dans oeuvres), pour la détection des
+            doublons en O(1).
     """
+
+    __slots__ = ('nom', 'nationalite', 'oeuvres', 'titres')
+
     def __init__(self, nom: str, nationalite: str) -> None:
         if not isinstance(nom, str):
             raise ValueError("Le nom doit être une chaîne non vide")
@@ -18,13 +24,29 @@ class Auteur:
         self.nom = nom
         self.nationalite = nationalite
         self.oeuvres = []
-
+        self.titres = {}
 
     def ajouter_oeuvre(self, livre: Livre) -> None:
         if not isinstance(livre, Livre):
             raise TypeError("l'oeuvre doit etre une instance de livre")
+        self.titres.setdefault(livre.titre, len(self.oeuvres))
         self.oeuvres.append(livre)
 
 
+    def possede_oeuvre(self, titre: str) -> bool:
+        """Indique si l'auteur possède déjà une œuvre portant ce titre."""
+        return titre in self.titres
+
+
+    def obtenir_oeuvre(self, titre: str):
+        """Retourne l'œuvre de l'auteur portant ce titre, ou None si elle n'existe pas."""
+        position = self.titres.get(titre)
+        return None if position is None else self.oeuvres[position]
+
+
     def __str__(self):
-        return f"Auteur(nom='{self.nom}', nationalite='{self.nationalite}', oeuvres={len(self.oeuvres)})"
\ No newline at end of file
+        return f"Auteur(nom='{self.nom}', nationalite='{self.nationalite}', oeuvres={len(self.oeuvres)})"
+
+
+# Enregistre la classe des auteurs pour la validation de Livre, sans import dans Livre.__init__
+Livre._type_auteur = Auteur
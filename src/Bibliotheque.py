@@ -1,25 +1,73 @@
+import sys
+from collections import Counter
+from datetime import datetime
+from itertools import islice
+
+from src.ArbreBK import ArbreBK, mots
 from src.Auteur import Auteur
+from src.CacheRecherche import CacheRecherche
+from src.CatalogueColonnes import CatalogueColonnes
 from src.Emprunteur import Emprunteur
+from src.ImportCatalogue import LIGNE_VIDE, RapportImport, extraire_ligne
+from src.IndexRecherche import IndexRecherche
+from src.IndexSecondaires import IndexSecondaires
+from src.Instrumentation import Instrumentation, instrumenter
 from src.Livre import Livre
+from src.RegistrePrets import RegistrePrets
+from src.Verrous import VerrousParLivre
 
 class Bibliotheque:
     """
     Classe représentant une bibliothèque qui gère des livres, des auteurs et des emprunteurs.
 
     Attributs:
-        livres (dict): Dictionnaire des livres avec leur ID comme clé.
+        livres (dict): Dictionnaire des livres avec leur ID comme clé (ou CatalogueColonnes).
         auteurs (dict): Dictionnaire des auteurs avec une clé tuple (nom, nationalité).
         emprunteurs (dict): Dictionnaire des emprunteurs avec leur ID comme clé.
+        index (IndexRecherche): Index inversé des titres et des noms d'auteurs pliés, utilisé par rechercher_livre
+            avec ou sans accents.
+        arbre_bk (ArbreBK): Les mots pliés des titres et des noms d'auteurs, pour rechercher_livre_approx.
+        cache (CacheRecherche): Cache des résultats de rechercher_livre, clé (sans_accents, recherche normalisée).
+        journal (Journal): Journal des modifications (None si la bibliothèque n'est pas persistante).
+        prets (RegistrePrets): Registre des prêts en cours, de leurs échéances et de l'historique des retours.
+        verrous (VerrousParLivre): Verrous par livre qui rendent emprunter_livre et retourner_livre sûrs entre threads.
+        index_secondaires (IndexSecondaires): Livres disponibles, auteurs par nationalité et emprunteurs par
+            nombre de livres détenus, tenus à jour à chaque ajout, emprunt et retour.
+        instrumentation (Instrumentation): Mesures des opérations (désactivées par défaut) et gestion des erreurs.
     """
 
-    def __init__(self):
-        """Initialise une nouvelle bibliothèque avec des dictionnaires vides pour les livres, les auteurs et les emprunteurs."""
-        self.livres = {}
+    def __init__(self, catalogue=None):
+        """
+        Initialise une nouvelle bibliothèque avec des dictionnaires vides pour les livres, les auteurs et les emprunteurs.
+
+        Args:
+            catalogue: Stockage des livres à utiliser à la place d'un dictionnaire (par exemple un CatalogueColonnes vide).
+        """
+        self.livres = {} if catalogue is None else catalogue
         self.auteurs = {}
         self.emprunteurs = {}
-
-
-    def ajouter_livre(self, book_id: str, titre: str, auteur: Auteur):
+        self.index = IndexRecherche()
+        self.arbre_bk = ArbreBK()
+        self.cache = CacheRecherche()
+        self.journal = None
+        self.prets = RegistrePrets()
+        self.verrous = VerrousParLivre()
+        self.index_secondaires = IndexSecondaires()
+
+        self.instrumentation = Instrumentation()
+        self.instrumentation.ajouter_jauge('livres', lambda: len(self.livres))
+        self.instrumentation.ajouter_jauge('emprunteurs', lambda: len(self.emprunteurs))
+        self.instrumentation.ajouter_jauge('prets_en_cours', lambda: len(self.prets))
+        self.instrumentation.ajouter_jauge('livres_disponibles', self.index_secondaires.nombre_disponibles)
+        self.instrumentation.ajouter_jauge('index_trigrammes', lambda: len(self.index.postings))
+        self.instrumentation.ajouter_jauge('arbre_bk_mots', lambda: len(self.arbre_bk))
+        self.instrumentation.ajouter_jauge('cache_entrees', lambda: len(self.cache))
+        self.instrumentation.ajouter_jauge('cache_succes', lambda: self.cache.succes)
+        self.instrumentation.ajouter_jauge('cache_echecs', lambda: self.cache.echecs)
+
+
+    @instrumenter("Erreur lors de l'ajout du livre")
+    def ajouter_livre(self, book_id: str, titre: str, auteur: Auteur, exemplaires: int = 1):
         """
         Ajoute un livre à la bibliothèque.
 
@@ -27,41 +75,172 @@ class Bibliotheque:
             book_id (str): L'identifiant unique du livre.
             titre (str): Le titre du livre.
             auteur (Auteur): L'auteur du livre.
+            exemplaires (int): Le nombre d'exemplaires physiques du livre.
 
         Raises:
             ValueError: Si le livre avec cet ID existe déjà.
         """
 
-        try:
-            # Vérifie si le livre existe déjà
-            if book_id in self.livres:
-                raise ValueError(f"Un livre avec l'ID {book_id} existe déjà.")
+        # Vérifie si le livre existe déjà
+        if book_id in self.livres:
+            raise ValueError(f"Un livre avec l'ID {book_id} existe déjà.")
 
-            auteur_key = (auteur.nom, auteur.nationalite)
+        auteur_key = (auteur.nom, auteur.nationalite)
 
-            # Si auteur_key n'existe pas ajout auteur dictionnaire
-            if auteur_key not in self.auteurs:
-                self.auteurs[auteur_key] = auteur
+        # Si auteur_key n'existe pas ajout auteur dictionnaire
+        if auteur_key not in self.auteurs:
+            self.auteurs[auteur_key] = auteur
 
-            # Si l'auteur existe on utilise l'instance existante
-            else:
-                auteur = self.auteurs[auteur_key]
+        # Si l'auteur existe on utilise l'instance existante
+        else:
+            auteur = self.auteurs[auteur_key]
+
+        # Creation nouveau livre
+        nouveau_livre = Livre(book_id=book_id, titre=titre, auteur=auteur, exemplaires=exemplaires)
+        self._inserer_livre(nouveau_livre)
 
-            # Creation nouveau livre
-            nouveau_livre = Livre(book_id=book_id, titre=titre, auteur=auteur)
+
+    def _inserer_livre(self, nouveau_livre: Livre):
+        """
+        Insère un livre déjà validé dans la bibliothèque, les œuvres de son auteur et l'index de recherche.
+
+        Args:
+            nouveau_livre (Livre): Le livre à insérer (son auteur doit être celui enregistré dans auteurs).
+        """
+        auteur = nouveau_livre.auteur
+        book_id = nouveau_livre.book_id
+
+        # Sous le verrou du livre, pour que point_de_controle ne puisse pas s'intercaler
+        with self.verrous.verrou(book_id):
+            # Ajout du livre à la bibliothèque, puis relecture de l'instance stockée (vue si catalogue en colonnes)
+            self.livres[book_id] = nouveau_livre
+            nouveau_livre = self.livres[book_id]
 
             # Vérifie si l'œuvre n'est pas déjà associée à l'auteur
-            if not any(livre.titre == nouveau_livre.titre for livre in auteur.oeuvres):
+            if not auteur.possede_oeuvre(nouveau_livre.titre):
                 auteur.ajouter_oeuvre(nouveau_livre)    # Ajout de l'oeuvre
 
-            # Ajout du livre à la bibliothèque
-            self.livres[nouveau_livre.book_id] = nouveau_livre
+            # Mise à jour des index, sauf pour un livre déjà indexé (index relu d'un instantané)
+            if book_id not in self.index.rangs:
+                self.index.ajouter(book_id, nouveau_livre.titre, auteur.nom)
+                titre_plie, nom_plie = self.index.cle(book_id, sans_accents=True)
+                for mot in set(mots(titre_plie)) | set(mots(nom_plie)):
+                    self.arbre_bk.ajouter(mot, book_id)
+            self.index_secondaires.ajouter_auteur(auteur)
+            self.index_secondaires.mettre_a_jour_disponibilite(nouveau_livre)
+
+            # Seules les recherches que le nouveau livre pourrait satisfaire sont retirées du cache (vide pendant
+            # un import en masse ou une restauration)
+            if self.cache:
+                self.cache.invalider(False, *self.index.cle(book_id))
+                self.cache.invalider(True, *self.index.cle(book_id, sans_accents=True))
+            self._journaliser('livre', book_id, nouveau_livre.titre, auteur.nom, auteur.nationalite,
+                              nouveau_livre.exemplaires)
+
+
+    @instrumenter("Erreur lors de l'ajout d'exemplaires")
+    def ajouter_exemplaires(self, book_id: str, nombre: int = 1):
+        """
+        Ajoute des exemplaires (disponibles) à un livre de la bibliothèque.
 
-        except Exception as e:
-            print(f"Erreur lors de l'ajout du livre : {e}")
-            raise
+        Args:
+            book_id (str): L'identifiant du livre.
+            nombre (int): Le nombre d'exemplaires à ajouter.
+
+        Raises:
+            ValueError: Si le livre n'existe pas ou si le nombre n'est pas un entier positif.
+        """
+        if book_id not in self.livres:
+            raise ValueError(f"book_id: {book_id} n'existe pas.")
+        if not isinstance(nombre, int) or nombre < 1:
+            raise ValueError("Le nombre d'exemplaires doit être un entier positif")
+
+        livre = self.livres[book_id]
+        with self.verrous.verrou(book_id):
+            livre.exemplaires += nombre
+            livre.disponibles += nombre
+            self.index_secondaires.mettre_a_jour_disponibilite(livre)
+            self._journaliser('exemplaires', book_id, nombre)
+
+
+    def _journaliser(self, *operation):
+        """Enregistre une modification dans le journal, si la bibliothèque en possède un."""
+        if self.journal is not None:
+            self.journal.enregistrer(operation)
 
 
+    @instrumenter("Erreur lors de l'ajout de livres en masse")
+    def ajouter_livres_en_masse(self, livres, taille_lot: int = 10_000, max_erreurs: int = 1000) -> RapportImport:
+        """
+        Ajoute un grand nombre de livres à la bibliothèque, par lots.
+
+        Les livres sont lus au fil de l'eau (par exemple depuis lire_csv ou lire_jsonl), de sorte qu'un seul
+        lot est en mémoire à la fois. Pour chaque lot, les lignes sont d'abord validées, puis chaque auteur
+        distinct est résolu une seule fois, et enfin les livres sont insérés. Les lignes invalides sont
+        consignées dans le rapport au lieu de lever une exception.
+
+        Args:
+            livres (iterable): Les lignes à importer, sous forme de dictionnaires (clés 'book_id', 'titre',
+                'auteur', 'nationalite' et 'exemplaires' facultative) ou de tuples (book_id, titre, nom,
+                nationalité[, exemplaires]).
+            taille_lot (int): Le nombre de lignes traitées par lot.
+            max_erreurs (int): Le nombre maximal d'erreurs détaillées conservées dans le rapport.
+
+        Returns:
+            RapportImport: Le rapport de l'importation.
+        """
+        rapport = RapportImport(max_erreurs=max_erreurs)
+
+        # Un import invaliderait le cache livre par livre : il est vidé une fois pour toutes
+        self.cache.vider()
+        lignes = enumerate(livres, start=1)
+
+        while True:
+            lot = list(islice(lignes, taille_lot))
+            if not lot:
+                break
+            rapport.lignes_lues += len(lot)
+
+            # Validation du lot
+            valides = []
+            ids_lot = set()
+            for numero, ligne in lot:
+                if ligne is LIGNE_VIDE:
+                    rapport.lignes_lues -= 1
+                    continue
+                try:
+                    book_id, titre, nom, nationalite, exemplaires = extraire_ligne(ligne)
+                except ValueError as e:
+                    rapport.ajouter_erreur(numero, str(e))
+                    continue
+
+                if book_id in self.livres or book_id in ids_lot:
+                    rapport.ajouter_erreur(numero, f"Un livre avec l'ID {book_id} existe déjà.")
+                    continue
+
+                ids_lot.add(book_id)
+                valides.append((book_id, titre, (nom, nationalite), exemplaires))
+
+            # Résolution des auteurs distincts du lot
+            auteurs_lot = {}
+            for _, _, auteur_key, _ in valides:
+                if auteur_key not in auteurs_lot:
+                    auteur = self.auteurs.get(auteur_key)
+                    if auteur is None:
+                        auteur = self.auteurs[auteur_key] = Auteur(*auteur_key)
+                    auteurs_lot[auteur_key] = auteur
+
+            # Insertion des livres validés
+            for book_id, titre, auteur_key, exemplaires in valides:
+                # Lignes validées par extraire_ligne, auteur résolu : pas de seconde vérification
+                self._inserer_livre(Livre.construire_sans_verification(book_id, titre, auteurs_lot[auteur_key],
+                                                                       exemplaires))
+            rapport.livres_ajoutes += len(valides)
+
+        return rapport
+
+
+    @instrumenter("Erreur lors de l'ajout de l'emprunteur")
     def ajouter_emprunteur(self, emprunteur: Emprunteur):
         """
         Ajoute un emprunteur à la bibliothèque.
@@ -74,30 +253,32 @@ class Bibliotheque:
             ValueError: Si l'ID de l'emprunteur existe déjà.
         """
 
-        try:
-            # Vérifie si l'emprunteur est une instance valide
-            if not isinstance(emprunteur, Emprunteur) :
-                raise TypeError(f"emprunteur: {emprunteur} doit etre une instance de Emprunteur")
+        # Vérifie si l'emprunteur est une instance valide
+        if not isinstance(emprunteur, Emprunteur) :
+            raise TypeError(f"emprunteur: {emprunteur} doit etre une instance de Emprunteur")
 
+        # Ajout sous le verrou de son identifiant (point_de_controle). Les emprunts se font sous le verrou du
+        # livre : l'emprunteur n'est publié dans emprunteurs qu'une fois journalisé et indexé, pour qu'aucun
+        # emprunt ne le précède dans le journal.
+        with self.verrous.verrou(emprunteur.emprunteur_id):
             # Vérifie si l'emprunteur existe déjà
             if emprunteur.emprunteur_id in self.emprunteurs:
                 raise ValueError(f"id_emprunteur: {emprunteur.emprunteur_id} existe deja.")
 
-            # Ajout de l'emprunteur au dictionnaire emprunteurs
+            self._journaliser('emprunteur', emprunteur.emprunteur_id, emprunteur.nom)
+            self.index_secondaires.ajouter_emprunteur(emprunteur.emprunteur_id)
             self.emprunteurs[emprunteur.emprunteur_id] = emprunteur
 
 
-        except Exception as e:
-            print(f"Erreur lors de l'ajout de l'emprunteur : {e}")
-            raise
-
-
-    def rechercher_livre(self, recherche: str):
+    @instrumenter("Erreur lors de la recherche du livre")
+    def rechercher_livre(self, recherche: str, sans_accents: bool = False):
         """
         Recherche des livres par titre ou par auteur. (ou inclusif)
 
         Args:
             recherche (str): Le critère de recherche (titre ou nom de l'auteur).
+            sans_accents (bool): Si vrai, la recherche ignore aussi les accents et les ligatures (« oeuvre »
+                trouve « Œuvre »).
 
         Returns:
             dict: Un dictionnaire des livres correspondants à la recherche.
@@ -105,113 +286,332 @@ class Bibliotheque:
         Raises:
             ValueError: Si aucun livre n'est trouvé.
         """
-        try:
-            result = {
-                id_: livre  for id_ , livre  in self.livres.items()
-                if recherche.lower() in livre.titre.lower() or recherche.lower() in livre.auteur.nom.lower()
-            }
+        return self._rechercher_livre(recherche, sans_accents)
+
+
+    def _rechercher_livre(self, recherche: str, sans_accents: bool):
+        """rechercher_livre sans instrumentation, pour les opérations instrumentées qui s'en servent."""
+        # Le cache conserve les book_id trouvés : la disponibilité des livres est relue à chaque appel
+        cle = (sans_accents, self.index.normaliser(recherche, sans_accents))
+        book_ids = self.cache.obtenir(cle)
+        if book_ids is None:
+            # L'index ne parcourt que les livres contenant les trigrammes de la recherche
+            book_ids = self.index.rechercher(recherche, sans_accents)
+            self.cache.enregistrer(cle, book_ids)
+
+        result = {id_: self.livres[id_] for id_ in book_ids}
+
+        if not result:
+            raise ValueError("Aucun livre n'est disponible")
+
+        return result
+
+
+    @instrumenter("Erreur lors de la recherche approximative du livre")
+    def rechercher_livre_approx(self, recherche: str, distance_max: int = None):
+        """
+        Recherche des livres par titre ou par auteur en tolérant les fautes de frappe.
+
+        Chaque mot de la recherche doit être proche (distance de Levenshtein, sans tenir compte des accents)
+        d'un mot du titre ou du nom de l'auteur. Par défaut, la distance tolérée dépend de la longueur du mot :
+        aucune faute jusqu'à 3 lettres, une jusqu'à 5 lettres, deux au-delà.
+
+        Args:
+            recherche (str): Le critère de recherche (titre ou nom de l'auteur, par exemple « Juline »).
+            distance_max (int): La distance maximale tolérée pour chaque mot (automatique par défaut).
+
+        Returns:
+            dict: Un dictionnaire des livres correspondants, du plus proche (somme des distances) au plus éloigné.
+
+        Raises:
+            ValueError: Si aucun livre n'est trouvé.
+        """
+        distances = None
+        for mot in mots(self.index.normaliser(recherche, sans_accents=True)):
+            tolerance = distance_max if distance_max is not None else 0 if len(mot) <= 3 else 1 if len(mot) <= 5 else 2
+
+            # Meilleure distance de chaque livre pour ce mot
+            trouves = {}
+            for distance, mot_proche in self.arbre_bk.rechercher(mot, tolerance):
+                for book_id in self.arbre_bk.valeurs[mot_proche]:
+                    if book_id not in trouves:
+                        trouves[book_id] = distance
+
+            if distances is None:
+                distances = trouves
+            else:
+                distances = {book_id: distance + trouves[book_id]
+                             for book_id, distance in distances.items() if book_id in trouves}
+            if not distances:
+                break
+
+        if not distances:
+            raise ValueError("Aucun livre n'est disponible")
 
-            if not result:
-                raise ValueError("Aucun livre n'est disponible")
+        rangs = self.index.rangs
+        ordre = sorted(distances, key=lambda book_id: (distances[book_id], rangs[book_id]))
+        return {book_id: self.livres[book_id] for book_id in ordre}
 
-            return result
 
-        except Exception as e:
-            print(f"Erreur lors de la recherche du livre : {e}")
-            raise
+    @instrumenter("Erreur lors de la recherche classée du livre", paresseux=True)
+    def rechercher_livre_classe(self, recherche: str, limite: int = None, decalage: int = 0,
+                                sans_accents: bool = False):
+        """
+        Recherche des livres par titre ou par auteur et les produit par ordre de pertinence.
 
+        Les livres dont le titre est exactement la recherche viennent en premier, puis ceux dont le titre
+        commence par la recherche, puis ceux dont le titre la contient, puis ceux dont l'auteur la contient.
+        Contrairement à rechercher_livre, les livres sont produits au fur et à mesure et la recherche
+        s'arrête dès que la page demandée est complète ; aucune erreur n'est levée s'il n'y a pas de résultat.
 
-    def emprunter_livre(self, book_id: str, id_emprunteur: str):
+        Args:
+            recherche (str): Le critère de recherche (titre ou nom de l'auteur).
+            limite (int): Le nombre maximal de livres produits (tous par défaut).
+            decalage (int): Le nombre de livres les plus pertinents à sauter (pour la pagination).
+            sans_accents (bool): Si vrai, la recherche ignore aussi les accents et les ligatures.
+
+        Returns:
+            generator: Les livres correspondants (Livre), du plus pertinent au moins pertinent.
+
+        Raises:
+            TypeError: Si la recherche n'est pas une chaîne ou si sans_accents n'est pas un booléen.
+            ValueError: Si limite ou decalage n'est pas un entier positif ou nul.
+        """
+        # Vérifications faites à l'appel, et non au premier next() du générateur
+        if not isinstance(recherche, str):
+            raise TypeError("La recherche doit être une chaîne")
+        if not isinstance(sans_accents, bool):
+            raise TypeError("Le mode sans_accents doit être un booléen")
+        for valeur in (decalage, 0 if limite is None else limite):
+            if not isinstance(valeur, int) or isinstance(valeur, bool) or valeur < 0:
+                raise ValueError("La limite et le décalage doivent être des entiers positifs")
+
+        nombre = None if limite is None else decalage + limite
+        return self._livres_classes(self.index.classer(recherche, nombre, sans_accents), decalage, nombre)
+
+
+    def _livres_classes(self, classement, decalage: int, nombre: int):
+        """Produit les livres de la page [decalage, nombre) d'un classement (pertinence, book_id)."""
+        for _, book_id in islice(classement, decalage, nombre):
+            yield self.livres[book_id]
+
+
+    @instrumenter("Erreur lors de la recherche des titres")
+    def rechercher_titres(self, recherche: str, sans_accents: bool = False):
+        """
+        Recherche des titres par titre ou par auteur, sans doublons.
+
+        Les livres de même titre et de même auteur (par exemple des exemplaires enregistrés sous des book_id
+        différents) sont regroupés et leurs exemplaires additionnés.
+
+        Args:
+            recherche (str): Le critère de recherche (titre ou nom de l'auteur).
+            sans_accents (bool): Si vrai, la recherche ignore aussi les accents et les ligatures.
+
+        Returns:
+            dict: Dictionnaire (titre, nom de l'auteur, nationalité) -> (nombre d'exemplaires, nombre disponibles).
+
+        Raises:
+            ValueError: Si aucun livre n'est trouvé.
+        """
+        titres = {}
+        for livre in self._rechercher_livre(recherche, sans_accents).values():
+            cle = (livre.titre, livre.auteur.nom, livre.auteur.nationalite)
+            exemplaires, disponibles = titres.get(cle, (0, 0))
+            titres[cle] = (exemplaires + livre.exemplaires, disponibles + livre.disponibles)
+        return titres
+
+
+    @instrumenter("Erreur lors de l'emprunt du livre")
+    def emprunter_livre(self, book_id: str, id_emprunteur: str, date_emprunt: datetime = None,
+                        date_echeance: datetime = None):
         """
         Permet à un emprunteur d'emprunter un livre.
 
         Args:
             book_id (str): L'identifiant du livre à emprunter.
             id_emprunteur (str): L'identifiant de l'emprunteur.
+            date_emprunt (datetime): La date de l'emprunt (maintenant par défaut).
+            date_echeance (datetime): La date de retour prévue (par défaut selon RegistrePrets.DUREE_PRET).
 
         Raises:
-            ValueError: Si le livre ou l'emprunteur n'existe pas ou si le livre n'est pas disponible.
+            ValueError: Si le livre ou l'emprunteur n'existe pas, si aucun exemplaire n'est disponible ou si
+                l'emprunteur détient déjà un exemplaire du livre.
         """
-        try:
-            # Vérifie si l'emprunteur existe
-            if id_emprunteur not in self.emprunteurs:
-                raise ValueError(f"id_emprunteur: {id_emprunteur} n'existe pas.")
+        # Vérifie si l'emprunteur existe
+        if id_emprunteur not in self.emprunteurs:
+            raise ValueError(f"id_emprunteur: {id_emprunteur} n'existe pas.")
 
-            # Vérifie si le livre existe
-            if book_id not in self.livres:
-                raise ValueError(f"book_id: {book_id} n'existe pas.")
+        # Vérifie si le livre existe
+        if book_id not in self.livres:
+            raise ValueError(f"book_id: {book_id} n'existe pas.")
 
-            livre = self.livres[book_id]
+        livre = self.livres[book_id]
+        emprunteur = self.emprunteurs[id_emprunteur]
 
+        # La vérification et l'emprunt se font sous le verrou du livre
+        with self.verrous.verrou(book_id):
             # Vérifie la disponibilité du livre
             if not livre.disponible:
                 raise ValueError(f"Le livre {livre.titre} n'est pas disponible")
 
-            emprunteur = self.emprunteurs[id_emprunteur]
-
-            emprunteur.livres_empruntes.append(livre)   # Ajoute le livre à la liste des livres empruntés
-            livre.disponible = False    # Marque le livre comme non disponible
-
-        except Exception as e:
-            print(f"Erreur lors de l'emprunt du livre : {e}")
-            raise
+            pret = self.prets.enregistrer_emprunt(book_id, id_emprunteur, date_emprunt, date_echeance)
+            emprunteur.ajouter_emprunt(livre)   # Ajoute le livre aux livres empruntés
+            livre.prendre_exemplaire()  # Un exemplaire de moins est disponible
+            if not livre.disponibles:
+                self.index_secondaires.mettre_a_jour_disponibilite(livre)
+            self.index_secondaires.emprunt(id_emprunteur)
+            self._journaliser('emprunt', book_id, id_emprunteur, pret.date_emprunt, pret.date_echeance)
 
 
-    def retourner_livre(self, book_id: str, id_emprunteur: str):
+    @instrumenter("Erreur lors du retour du livre")
+    def retourner_livre(self, book_id: str, id_emprunteur: str, date_retour: datetime = None):
         """
         Permet à un emprunteur de retourner un livre.
 
         Args:
             book_id (str): L'identifiant du livre à retourner.
             id_emprunteur (str): L'identifiant de l'emprunteur.
+            date_retour (datetime): La date du retour (maintenant par défaut).
 
         Raises:
-            ValueError: Si le livre ou l'emprunteur n'existe pas ou si le livre n'a pas été emprunté.
+            ValueError: Si le livre ou l'emprunteur n'existe pas ou si le livre n'a pas été emprunté par cet emprunteur.
         """
-        try:
-            # Vérifie si l'emprunteur existe
-            if id_emprunteur not in self.emprunteurs:
-                raise ValueError(f"id_emprunteur: {id_emprunteur} n'existe pas.")
+        # Vérifie si l'emprunteur existe
+        if id_emprunteur not in self.emprunteurs:
+            raise ValueError(f"id_emprunteur: {id_emprunteur} n'existe pas.")
 
-            # Vérifie si le livre existe
-            if book_id not in self.livres:
-                raise ValueError(f"book_id: {book_id} n'existe pas.")
+        # Vérifie si le livre existe
+        if book_id not in self.livres:
+            raise ValueError(f"book_id: {book_id} n'existe pas.")
 
-            livre = self.livres[book_id]
+        livre = self.livres[book_id]
+        emprunteur = self.emprunteurs[id_emprunteur]
 
+        with self.verrous.verrou(book_id):
             # Vérifie si le livre a été emprunté
-            if livre.disponible:
+            if livre.disponibles >= livre.exemplaires:
                 raise ValueError(f"Le livre {livre.titre} n'a pas ete emprunter")
 
-            emprunteur = self.emprunteurs[id_emprunteur]
-            emprunteur.livres_empruntes.remove(livre)   # Retire le livre de la liste des livres empruntés
-            livre.disponible = True # Marque le livre comme disponible
+            # Vérifie que le livre est emprunté par cet emprunteur
+            if self.prets.pret(book_id, id_emprunteur) is None:
+                raise ValueError(f"Le livre {livre.titre} n'a pas ete emprunter par {id_emprunteur}")
+
+            pret = self.prets.enregistrer_retour(book_id, id_emprunteur, date_retour)
+            emprunteur.retirer_emprunt(book_id)   # Retire le livre des livres empruntés
+            livre.rendre_exemplaire()   # L'exemplaire redevient disponible
+            if livre.disponibles == 1:
+                self.index_secondaires.mettre_a_jour_disponibilite(livre)
+            self.index_secondaires.retour(id_emprunteur)
+            self._journaliser('retour', book_id, id_emprunteur, pret.date_retour)
+
+
+    def detenteurs_livre(self, book_id: str):
+        """
+        Retourne les emprunteurs qui détiennent un exemplaire d'un livre.
+
+        Args:
+            book_id (str): L'identifiant du livre.
+
+        Returns:
+            list: Les emprunteurs du livre (vide si aucun exemplaire n'est emprunté).
+        """
+        return [self.emprunteurs[id_emprunteur] for id_emprunteur in self.prets.detenteurs_livre(book_id)]
+
+
+    def prets_en_retard(self, maintenant: datetime = None):
+        """
+        Retourne les prêts en cours dont l'échéance est dépassée.
+
+        Args:
+            maintenant (datetime): La date de référence (maintenant par défaut).
+
+        Returns:
+            list: Les prêts (Pret) en retard, par échéance croissante.
+        """
+        return self.prets.en_retard(maintenant)
+
+
+    def livres_disponibles(self):
+        """
+        Retourne les livres ayant au moins un exemplaire disponible, sans parcourir le catalogue.
+
+        Returns:
+            list: Les livres disponibles, dans l'ordre de leur dernière remise en disponibilité.
+        """
+        return [self.livres[book_id] for book_id in self.index_secondaires.ids_disponibles()]
+
+
+    def auteurs_par_nationalite(self, nationalite: str):
+        """
+        Retourne les auteurs d'une nationalité, sans parcourir les auteurs.
+
+        Args:
+            nationalite (str): La nationalité recherchée (comparée telle quelle).
+
+        Returns:
+            list: Les auteurs de cette nationalité, dans l'ordre de leur ajout (vide si aucun).
+        """
+        return self.index_secondaires.auteurs_de_nationalite(nationalite)
+
+
+    def emprunteurs_avec_plus_de(self, nombre: int):
+        """
+        Retourne les emprunteurs qui détiennent strictement plus de nombre livres, sans parcourir les emprunteurs.
+
+        Args:
+            nombre (int): Le nombre de livres détenus à dépasser.
+
+        Returns:
+            list: Les emprunteurs, par nombre de livres détenus décroissant.
+
+        Raises:
+            ValueError: Si nombre n'est pas un entier positif ou nul.
+        """
+        if not isinstance(nombre, int) or nombre < 0:
+            raise ValueError("Le nombre de livres doit être un entier positif ou nul")
+        ids = self.index_secondaires.emprunteurs_avec_plus_de(nombre)
+        return [self.emprunteurs[emprunteur_id] for emprunteur_id in ids]
+
+
+    def disponibles_par_auteur(self) -> dict:
+        """
+        Compte les livres disponibles (ayant au moins un exemplaire disponible) de chaque auteur.
+
+        Avec un CatalogueColonnes, le calcul est fait directement sur les colonnes sans construire de livres.
+
+        Returns:
+            dict: Dictionnaire (nom, nationalité) -> nombre de livres disponibles.
+        """
+        if isinstance(self.livres, CatalogueColonnes):
+            return self.livres.disponibles_par_auteur()
+
+        compte = Counter(
+            (livre.auteur.nom, livre.auteur.nationalite) for livre in self.livres.values() if livre.disponible
+        )
+        return dict(compte)
+
+
+    def ecrire_rapport(self, sortie, format: str = 'texte', **options) -> int:
+        """
+        Écrit l'inventaire de la bibliothèque dans un fichier texte quelconque, en un seul parcours et par blocs.
+
+        Args:
+            sortie: L'objet fichier dans lequel écrire (fichier ouvert, sys.stdout, io.StringIO, etc.).
+            format (str): Le format du rapport : 'texte', 'csv' ou 'jsonl'.
+            **options: Les autres options de Rapport (sections, filtre_livre, filtre_emprunteur, taille_tampon).
+
+        Returns:
+            int: Le nombre d'enregistrements (auteurs, livres et emprunteurs) écrits.
+
+        Raises:
+            ValueError: Si le format ou une section est inconnu.
+        """
+        from src.Rapport import Rapport   # Importé à la demande : csv et json ne servent pas au démarrage
+
+        return Rapport(sortie, format, **options).ecrire(self)
 
-        except Exception as e:
-            print(f"Erreur lors du retour du livre : {e}")
-            raise
 
     def print_info_console(self):
-        # Afficher les livres et les auteurs
-        print("Auteurs dans la bibliothèque:")
-        for nom_auteur, auteur in self.auteurs.items():
-            print(f"- {auteur.nom}")
-
-        print("\nLivres dans la bibliothèque:")
-        for book_id, livre in self.livres.items():
-            print(f"- {livre.titre} (ID: {livre.book_id}) (DISPONIBLE: {livre.disponible}")
-
-        # Afficher les œuvres de chaque auteur
-        print("\nŒuvres de chaque auteur:")
-        for nom_auteur, auteur in self.auteurs.items():
-            print(f"Œuvres de {nom_auteur}:")
-            for oeuvre in auteur.oeuvres:
-                print(f"- {oeuvre.titre}")
-            print()  # Ligne vide pour séparer les auteurs
-
-        print("Emprunteur:")
-        for emprunter_id, emprunteur in self.emprunteurs.items():
-            print(f"- {emprunteur.nom} (ID: {emprunteur.emprunteur_id})")
-            for livre in emprunteur.livres_empruntes:
-                print(f"  * {livre.titre}")
-        print('-------------------fin-------------------')
\ No newline at end of file
+        # Afficher les auteurs et leurs œuvres, les livres et les emprunteurs
+        self.ecrire_rapport(sys.stdout)
@@ -0,0 +1,336 @@
+import heapq
+import multiprocessing
+import os
+import threading
+import zlib
+from datetime import datetime
+from itertools import islice
+
+from src.Auteur import Auteur
+from src.Bibliotheque import Bibliotheque
+from src.Emprunteur import Emprunteur
+from src.ImportCatalogue import LIGNE_VIDE, RapportImport, extraire_ligne
+from src.Livre import Livre
+
+
+def _executer_partition(connexion) -> None:
+    """
+    Boucle d'un processus de partition : applique les commandes reçues à sa propre Bibliotheque.
+
+    Chaque commande est un tuple (nom, arguments) ; la réponse est (True, résultat) ou (False, exception).
+    Les livres sont retournés sous forme de tuples (rang, book_id, titre, nom, nationalité, exemplaires,
+    disponibles), où rang est le rang d'insertion global attribué par BibliothequeRepartie.
+    """
+    bibliotheque = Bibliotheque()
+    rangs = {}
+
+    def decrire(book_id):
+        livre = bibliotheque.livres[book_id]
+        return (rangs[book_id], book_id, livre.titre, livre.auteur.nom, livre.auteur.nationalite,
+                livre.exemplaires, livre.disponibles)
+
+    def ajouter_livre(rang, book_id, titre, nom, nationalite, exemplaires):
+        bibliotheque.ajouter_livre(book_id, titre, Auteur(nom, nationalite), exemplaires)
+        rangs[book_id] = rang
+
+    def ajouter_livres(lignes):
+        # lignes : (numéro de ligne, rang, book_id, titre, nom, nationalité, exemplaires)
+        rapport = bibliotheque.ajouter_livres_en_masse((ligne[2:] for ligne in lignes), max_erreurs=len(lignes))
+        rapport.erreurs = [(lignes[numero - 1][0], message) for numero, message in rapport.erreurs]
+        for _, rang, book_id, *_ in lignes:
+            rangs.setdefault(book_id, rang)
+        return rapport
+
+    def rechercher(recherche, sans_accents):
+        # L'index est interrogé directement : une partition sans résultat n'est pas une erreur
+        return [decrire(book_id) for book_id in bibliotheque.index.rechercher(recherche, sans_accents)]
+
+    commandes = {
+        'ajouter_livre': ajouter_livre,
+        'ajouter_livres': ajouter_livres,
+        'ajouter_emprunteur': lambda emprunteur_id, nom: bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id, nom)),
+        'rechercher': rechercher,
+        'emprunter_livre': bibliotheque.emprunter_livre,
+        'retourner_livre': bibliotheque.retourner_livre,
+        'livre': lambda book_id: decrire(book_id) if book_id in bibliotheque.livres else None,
+        'nombre_livres': lambda: len(bibliotheque.livres),
+    }
+
+    while True:
+        try:
+            nom, arguments = connexion.recv()
+        except EOFError:
+            break
+        if nom == 'fermer':
+            break
+        try:
+            connexion.send((True, commandes[nom](*arguments)))
+        except Exception as e:
+            connexion.send((False, e))
+    connexion.close()
+
+
+class BibliothequeRepartie:
+    """
+    Bibliothèque partitionnée entre plusieurs processus.
+
+    Les livres sont répartis par hachage (crc32) de leur book_id entre nombre_partitions processus, chacun avec
+    sa propre Bibliotheque : les emprunts et les retours sont envoyés à la partition du livre, et une
+    recherche est envoyée à toutes les partitions puis les résultats sont fusionnés (dans l'ordre
+    d'insertion, comme Bibliotheque.rechercher_livre). Chaque partition calcule sa part dans son propre
+    processus, sans être limitée par le verrou global de l'interpréteur du processus principal.
+
+    Le registre des auteurs fait autorité dans le processus principal : chaque partition crée ses auteurs à
+    partir des mêmes clés (nom, nationalité), et les livres retournés sont des copies dont l'auteur est
+    celui du registre. Les emprunteurs sont ajoutés à toutes les partitions.
+
+    Les appels sont sérialisés par un verrou : une instance peut être partagée entre threads, mais une seule
+    requête est en cours à la fois.
+
+    Attributes:
+        nombre_partitions (int): Le nombre de processus.
+        auteurs (dict): Registre des auteurs, avec une clé tuple (nom, nationalité).
+        emprunteurs (dict): Dictionnaire des emprunteurs avec leur ID comme clé (sans leurs emprunts).
+    """
+
+    def __init__(self, nombre_partitions: int = None):
+        if nombre_partitions is None:
+            nombre_partitions = os.cpu_count() or 1
+        if not isinstance(nombre_partitions, int) or nombre_partitions < 1:
+            raise ValueError("Le nombre de partitions doit être un entier positif")
+
+        self.nombre_partitions = nombre_partitions
+        self.auteurs = {}
+        self.emprunteurs = {}
+        self._rang = 0
+        self._verrou = threading.Lock()
+        self._connexions = []
+        self._processus = []
+        for _ in range(nombre_partitions):
+            connexion, connexion_partition = multiprocessing.Pipe()
+            processus = multiprocessing.Process(target=_executer_partition, args=(connexion_partition,), daemon=True)
+            processus.start()
+            connexion_partition.close()
+            self._connexions.append(connexion)
+            self._processus.append(processus)
+
+
+    def partition(self, book_id: str) -> int:
+        """Retourne le numéro de la partition qui contient le livre book_id."""
+        return zlib.crc32(book_id.encode('utf-8')) % self.nombre_partitions
+
+
+    def _appeler(self, numero: int, nom: str, *arguments):
+        """Envoie une commande à une partition et retourne son résultat (ou lève son exception)."""
+        return self._diffuser(nom, {numero: arguments})[numero]
+
+
+    def _diffuser(self, nom: str, arguments_par_partition: dict) -> dict:
+        """
+        Envoie une commande à plusieurs partitions, puis attend toutes les réponses (calcul en parallèle).
+
+        Args:
+            nom (str): Le nom de la commande.
+            arguments_par_partition (dict): Dictionnaire numéro de partition -> arguments de la commande.
+
+        Returns:
+            dict: Dictionnaire numéro de partition -> résultat.
+
+        Raises:
+            Exception: La première exception levée par une partition.
+        """
+        with self._verrou:
+            for numero, arguments in arguments_par_partition.items():
+                self._connexions[numero].send((nom, arguments))
+            reponses = {numero: self._connexions[numero].recv() for numero in arguments_par_partition}
+
+        for reussi, valeur in reponses.values():
+            if not reussi:
+                raise valeur
+        return {numero: valeur for numero, (_, valeur) in reponses.items()}
+
+
+    def _auteur(self, nom: str, nationalite: str) -> Auteur:
+        """Retourne l'auteur du registre, en le créant (sous le verrou) s'il est nouveau."""
+        auteur = self.auteurs.get((nom, nationalite))
+        if auteur is None:
+            with self._verrou:
+                auteur = self.auteurs.get((nom, nationalite))
+                if auteur is None:
+                    auteur = self.auteurs[(nom, nationalite)] = Auteur(nom, nationalite)
+        return auteur
+
+
+    def _reserver_rangs(self, nombre: int) -> int:
+        """Réserve nombre rangs d'insertion consécutifs (sous le verrou) et retourne le premier."""
+        with self._verrou:
+            rang = self._rang
+            self._rang += nombre
+        return rang
+
+
+    def _livre(self, description) -> Livre:
+        """Construit la copie d'un livre à partir de sa description envoyée par une partition."""
+        _, book_id, titre, nom, nationalite, exemplaires, disponibles = description
+        return Livre.construire_sans_verification(book_id, titre, self._auteur(nom, nationalite), exemplaires,
+                                                  disponibles)
+
+
+    def ajouter_livre(self, book_id: str, titre: str, auteur: Auteur, exemplaires: int = 1):
+        """
+        Ajoute un livre à la partition de son book_id (voir Bibliotheque.ajouter_livre).
+
+        Raises:
+            ValueError: Si le livre est invalide ou si son book_id existe déjà.
+        """
+        if not isinstance(book_id, str) or not isinstance(auteur, Auteur):
+            raise ValueError("Le book_id doit être une chaîne et l'auteur une instance de Auteur")
+
+        self._appeler(self.partition(book_id), 'ajouter_livre',
+                      self._reserver_rangs(1), book_id, titre, auteur.nom, auteur.nationalite, exemplaires)
+        self._auteur(auteur.nom, auteur.nationalite)
+
+
+    def ajouter_livres_en_masse(self, livres, taille_lot: int = 10_000, max_erreurs: int = 1000) -> RapportImport:
+        """
+        Importe des livres par lots, chaque lot étant réparti entre les partitions et importé en parallèle.
+
+        Args:
+            livres (iterable): Les lignes à importer (voir Bibliotheque.ajouter_livres_en_masse).
+            taille_lot (int): Le nombre de lignes lues et réparties à la fois.
+            max_erreurs (int): Le nombre maximal d'erreurs détaillées conservées dans le rapport.
+
+        Returns:
+            RapportImport: Le rapport de l'importation.
+        """
+        rapport = RapportImport(max_erreurs=max_erreurs)
+        lignes = enumerate(livres, start=1)
+
+        while True:
+            lot = list(islice(lignes, taille_lot))
+            if not lot:
+                break
+            rapport.lignes_lues += len(lot)
+            # Un rang par ligne du lot : les lignes invalides laissent un rang inutilisé, sans effet sur l'ordre
+            premier_rang = self._reserver_rangs(len(lot))
+
+            # Validation dans le processus principal, les doublons sont détectés par les partitions
+            erreurs = []
+            valides = {}
+            par_partition = {}
+            for rang, (numero, ligne) in enumerate(lot, start=premier_rang):
+                if ligne is LIGNE_VIDE:
+                    rapport.lignes_lues -= 1
+                    continue
+                try:
+                    book_id, titre, nom, nationalite, exemplaires = extraire_ligne(ligne)
+                except ValueError as e:
+                    erreurs.append((numero, str(e)))
+                    continue
+                valides[numero] = (nom, nationalite)
+                par_partition.setdefault(self.partition(book_id), []).append(
+                    (numero, rang, book_id, titre, nom, nationalite, exemplaires)
+                )
+
+            for rapport_partition in self._diffuser('ajouter_livres', {
+                numero: (lignes_partition,) for numero, lignes_partition in par_partition.items()
+            }).values():
+                rapport.livres_ajoutes += rapport_partition.livres_ajoutes
+                erreurs.extend(rapport_partition.erreurs)
+
+            # Seuls les auteurs des livres effectivement ajoutés entrent dans le registre
+            for numero, _ in erreurs:
+                valides.pop(numero, None)
+            for auteur_key in valides.values():
+                self._auteur(*auteur_key)
+            for numero, message in sorted(erreurs):
+                rapport.ajouter_erreur(numero, message)
+
+        return rapport
+
+
+    def ajouter_emprunteur(self, emprunteur: Emprunteur):
+        """
+        Ajoute un emprunteur à toutes les partitions.
+
+        Raises:
+            ValueError: Si l'emprunteur existe déjà.
+        """
+        if emprunteur.emprunteur_id in self.emprunteurs:
+            raise ValueError(f"Emprunteur avec l'ID {emprunteur.emprunteur_id} existe déjà.")
+
+        self._diffuser('ajouter_emprunteur', {
+            numero: (emprunteur.emprunteur_id, emprunteur.nom) for numero in range(self.nombre_partitions)
+        })
+        self.emprunteurs[emprunteur.emprunteur_id] = Emprunteur(emprunteur.emprunteur_id, emprunteur.nom)
+
+
+    def rechercher_livre(self, recherche: str, sans_accents: bool = False):
+        """
+        Recherche des livres par titre ou par auteur dans toutes les partitions (voir Bibliotheque.rechercher_livre).
+
+        Returns:
+            dict: Un dictionnaire des livres correspondants (copies), dans l'ordre d'insertion.
+
+        Raises:
+            ValueError: Si aucun livre n'est trouvé.
+        """
+        resultats = self._diffuser('rechercher', {
+            numero: (recherche, sans_accents) for numero in range(self.nombre_partitions)
+        })
+
+        # Chaque partition répond dans l'ordre d'insertion : une fusion suffit
+        livres = {description[1]: self._livre(description) for description in heapq.merge(*resultats.values())}
+        if not livres:
+            raise ValueError("Aucun livre n'est disponible")
+        return livres
+
+
+    def obtenir_livre(self, book_id: str) -> Livre:
+        """
+        Retourne une copie d'un livre.
+
+        Raises:
+            KeyError: Si le livre n'existe pas.
+        """
+        description = self._appeler(self.partition(book_id), 'livre', book_id)
+        if description is None:
+            raise KeyError(book_id)
+        return self._livre(description)
+
+
+    def emprunter_livre(self, book_id: str, id_emprunteur: str, date_emprunt: datetime = None,
+                        date_echeance: datetime = None):
+        """Emprunte un livre dans sa partition (voir Bibliotheque.emprunter_livre)."""
+        self._appeler(self.partition(book_id), 'emprunter_livre', book_id, id_emprunteur, date_emprunt, date_echeance)
+
+
+    def retourner_livre(self, book_id: str, id_emprunteur: str, date_retour: datetime = None):
+        """Retourne un livre dans sa partition (voir Bibliotheque.retourner_livre)."""
+        self._appeler(self.partition(book_id), 'retourner_livre', book_id, id_emprunteur, date_retour)
+
+
+    def __len__(self):
+        return sum(self._diffuser('nombre_livres', {numero: () for numero in range(self.nombre_partitions)}).values())
+
+
+    def fermer(self):
+        """Arrête les processus des partitions."""
+        for connexion in self._connexions:
+            try:
+                connexion.send(('fermer', ()))
+            except (BrokenPipeError, OSError):
+                pass
+            connexion.close()
+        for processus in self._processus:
+            processus.join()
+        self._connexions = []
+        self._processus = []
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.fermer()
@@ -0,0 +1,149 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheRecherche:
+    """
+    Cache borné (LRU, avec durée de vie facultative) des résultats de recherche.
+
+    Une entrée associe une clé (mode de recherche, recherche normalisée) aux book_id trouvés, et non aux
+    livres : les changements de disponibilité (emprunts, retours) ne rendent donc pas les entrées fausses.
+    Quand un livre est ajouté, seules les entrées dont la recherche est contenue dans son titre ou le nom de
+    son auteur sont supprimées (invalider).
+
+    Attributes:
+        taille_max (int): Le nombre maximal d'entrées ; la moins récemment utilisée est évincée au-delà.
+        duree_vie (float): La durée de vie d'une entrée en secondes (None pour aucune expiration).
+        succes (int): Le nombre de recherches trouvées dans le cache.
+        echecs (int): Le nombre de recherches absentes du cache (ou expirées).
+        evictions (int): Le nombre d'entrées évincées faute de place.
+        expirations (int): Le nombre d'entrées supprimées car expirées.
+        invalidations (int): Le nombre d'entrées supprimées par un ajout de livre.
+    """
+
+    def __init__(self, taille_max: int = 1024, duree_vie: float = None, horloge=time.monotonic):
+        if not isinstance(taille_max, int) or taille_max < 1:
+            raise ValueError("La taille du cache doit être un entier positif")
+
+        self.taille_max = taille_max
+        self.duree_vie = duree_vie
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._horloge = horloge
+        self._entrees = OrderedDict()   # clé -> (date d'expiration, book_id)
+        # Par mode : les recherches en cache et le nombre de recherches de chaque longueur, pour qu'invalider
+        # ne consulte que les sous-chaînes des textes ajoutés au lieu de parcourir toutes les entrées.
+        self._recherches = {}           # mode -> {recherche normalisée: None}
+        self._longueurs = {}            # mode -> {longueur: nombre de recherches}
+        self._verrou = threading.Lock()
+
+
+    def obtenir(self, cle):
+        """
+        Retourne les book_id enregistrés pour une clé.
+
+        Args:
+            cle (tuple): La clé (mode, recherche normalisée).
+
+        Returns:
+            tuple: Les book_id, ou None si la clé est absente ou expirée.
+        """
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is not None and entree[0] is not None and entree[0] <= self._horloge():
+                self._supprimer(cle)
+                self.expirations += 1
+                entree = None
+            if entree is None:
+                self.echecs += 1
+                return None
+            self._entrees.move_to_end(cle)
+            self.succes += 1
+            return entree[1]
+
+
+    def enregistrer(self, cle, book_ids) -> None:
+        """
+        Enregistre les book_id trouvés pour une clé, en évinçant l'entrée la moins récemment utilisée si besoin.
+
+        Args:
+            cle (tuple): La clé (mode, recherche normalisée).
+            book_ids (iterable): Les book_id trouvés, dans l'ordre des résultats.
+        """
+        expiration = None if self.duree_vie is None else self._horloge() + self.duree_vie
+        with self._verrou:
+            if cle not in self._entrees:
+                mode, recherche = cle
+                self._recherches.setdefault(mode, {})[recherche] = None
+                longueurs = self._longueurs.setdefault(mode, {})
+                longueurs[len(recherche)] = longueurs.get(len(recherche), 0) + 1
+            self._entrees[cle] = (expiration, tuple(book_ids))
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.taille_max:
+                self._supprimer(next(iter(self._entrees)))
+                self.evictions += 1
+
+
+    def invalider(self, mode, *textes: str) -> None:
+        """
+        Supprime les entrées d'un mode dont la recherche est contenue dans l'un des textes.
+
+        Args:
+            mode: Le mode de recherche des entrées concernées.
+            *textes (str): Les textes normalisés du livre ajouté (titre, nom de l'auteur).
+        """
+        with self._verrou:
+            recherches = self._recherches.get(mode)
+            if not recherches:
+                return
+            # Seules les sous-chaînes des textes ayant la longueur d'une recherche en cache sont consultées
+            perimees = set()
+            for longueur in self._longueurs[mode]:
+                for texte in textes:
+                    for debut in range(len(texte) - longueur + 1):
+                        recherche = texte[debut:debut + longueur]
+                        if recherche in recherches:
+                            perimees.add(recherche)
+            for recherche in perimees:
+                self._supprimer((mode, recherche))
+            self.invalidations += len(perimees)
+
+
+    def vider(self) -> None:
+        """Supprime toutes les entrées (les compteurs sont conservés)."""
+        with self._verrou:
+            self.invalidations += len(self._entrees)
+            self._entrees.clear()
+            self._recherches.clear()
+            self._longueurs.clear()
+
+
+    def _supprimer(self, cle) -> None:
+        """Supprime une entrée et sa recherche des tables par mode (le verrou doit être détenu)."""
+        del self._entrees[cle]
+        mode, recherche = cle
+        del self._recherches[mode][recherche]
+        longueurs = self._longueurs[mode]
+        longueurs[len(recherche)] -= 1
+        if not longueurs[len(recherche)]:
+            del longueurs[len(recherche)]
+
+
+    def statistiques(self) -> dict:
+        """Retourne les compteurs du cache et son nombre d'entrées."""
+        return {
+            'entrees': len(self._entrees),
+            'succes': self.succes,
+            'echecs': self.echecs,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+        }
+
+
+    def __len__(self):
+        return len(self._entrees)
@@ -0,0 +1,194 @@
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from itertools import compress
+
+from src.Livre import Livre
+
+
+class LivreColonne(Livre):
+    """
+    Vue d'un livre stocké dans un CatalogueColonnes.
+
+    La vue est créée à la demande. Ses compteurs d'exemplaires sont lus et écrits directement dans les
+    colonnes du catalogue, de sorte que plusieurs vues du même livre restent cohérentes (et sont égales entre elles).
+    """
+    __slots__ = ('_catalogue', '_rang')
+
+    @property
+    def exemplaires(self):
+        return self._catalogue.exemplaires[self._rang]
+
+    @exemplaires.setter
+    def exemplaires(self, valeur):
+        self._catalogue.exemplaires[self._rang] = valeur
+
+    @property
+    def disponibles(self):
+        return self._catalogue.disponibles[self._rang]
+
+    @disponibles.setter
+    def disponibles(self, valeur):
+        self._catalogue.disponibles[self._rang] = valeur
+
+    def __eq__(self, autre):
+        if not isinstance(autre, LivreColonne):
+            return NotImplemented
+        return self._catalogue is autre._catalogue and self._rang == autre._rang
+
+    def __hash__(self):
+        return hash((id(self._catalogue), self._rang))
+
+
+class OeuvresColonnes(Sequence):
+    """
+    Œuvres d'un auteur dont les livres sont stockés dans un CatalogueColonnes.
+
+    Seuls les rangs des livres dans le catalogue sont conservés (array) ; les vues LivreColonne sont
+    construites à la lecture, comme pour CatalogueColonnes.__getitem__.
+    """
+    __slots__ = ('_catalogue', '_rangs')
+
+    def __init__(self, catalogue):
+        self._catalogue = catalogue
+        self._rangs = array('I')
+
+    def append(self, livre: LivreColonne) -> None:
+        """Ajoute une œuvre (une vue du même catalogue) ; seul son rang est conservé."""
+        self._rangs.append(livre._rang)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._catalogue.vue(rang) for rang in self._rangs[indice]]
+        return self._catalogue.vue(self._rangs[indice])
+
+    def __len__(self):
+        return len(self._rangs)
+
+
+class CatalogueColonnes(Mapping):
+    """
+    Stockage en colonnes des livres d'une bibliothèque, utilisable à la place du dictionnaire Bibliotheque.livres.
+
+    Chaque livre occupe une ligne de colonnes compactes : identifiant, titre (chaîne internée), indice de
+    l'auteur, nombre d'exemplaires et nombre d'exemplaires disponibles (array). Les objets Livre ne sont
+    construits qu'à la lecture, sous forme de LivreColonne ; les œuvres des auteurs du catalogue ne conservent
+    que les rangs de leurs livres (OeuvresColonnes). Les agrégats (par exemple le nombre de livres
+    disponibles par auteur) sont calculés directement sur les colonnes, sans construire d'objets.
+
+    Attributes:
+        ids (list): Les identifiants des livres, dans l'ordre d'insertion.
+        titres (list): Les titres des livres (internés).
+        auteurs_idx (array): L'indice de l'auteur de chaque livre dans auteurs.
+        exemplaires (array): Le nombre d'exemplaires de chaque livre.
+        disponibles (array): Le nombre d'exemplaires disponibles de chaque livre.
+        auteurs (list): Les auteurs distincts du catalogue.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.titres = []
+        self.auteurs_idx = array('I')
+        self.exemplaires = array('I')
+        self.disponibles = array('I')
+        self.auteurs = []
+        self._rangs = {}
+        self._rangs_auteurs = {}
+
+
+    def __setitem__(self, book_id: str, livre: Livre):
+        """
+        Ajoute ou remplace un livre dans les colonnes.
+
+        Args:
+            book_id (str): L'identifiant du livre.
+            livre (Livre): Le livre à stocker.
+        """
+        auteur = livre.auteur
+        auteur_key = (auteur.nom, auteur.nationalite)
+        rang_auteur = self._rangs_auteurs.get(auteur_key)
+        if rang_auteur is None:
+            rang_auteur = self._rangs_auteurs[auteur_key] = len(self.auteurs)
+            self.auteurs.append(auteur)
+            # Un auteur sans œuvre ne garde que des rangs ; un auteur déjà partagé avec un autre stockage
+            # conserve sa liste de livres
+            if not auteur.oeuvres:
+                auteur.oeuvres = OeuvresColonnes(self)
+
+        rang = self._rangs.get(book_id)
+        if rang is None:
+            self._rangs[book_id] = len(self.ids)
+            self.ids.append(book_id)
+            self.titres.append(sys.intern(livre.titre))
+            self.auteurs_idx.append(rang_auteur)
+            self.exemplaires.append(livre.exemplaires)
+            self.disponibles.append(livre.disponibles)
+        else:
+            self.titres[rang] = sys.intern(livre.titre)
+            self.auteurs_idx[rang] = rang_auteur
+            self.exemplaires[rang] = livre.exemplaires
+            self.disponibles[rang] = livre.disponibles
+
+
+    def __getitem__(self, book_id: str) -> LivreColonne:
+        return self.vue(self._rangs[book_id])
+
+
+    def vue(self, rang: int) -> LivreColonne:
+        """Retourne la vue du livre de rang donné."""
+        # Construction de la vue sans repasser par la validation de Livre
+        livre = LivreColonne.__new__(LivreColonne)
+        livre._catalogue = self
+        livre._rang = rang
+        livre.book_id = self.ids[rang]
+        livre.titre = self.titres[rang]
+        livre.auteur = self.auteurs[self.auteurs_idx[rang]]
+        return livre
+
+
+    def __contains__(self, book_id) -> bool:
+        return book_id in self._rangs
+
+
+    def __iter__(self):
+        return iter(self.ids)
+
+
+    def __len__(self):
+        return len(self.ids)
+
+
+    def nombre_disponibles(self) -> int:
+        """Retourne le nombre de livres disponibles (ayant au moins un exemplaire disponible)."""
+        return len(self.disponibles) - self.disponibles.count(0)
+
+
+    def exemplaires_disponibles(self) -> int:
+        """Retourne le nombre total d'exemplaires disponibles."""
+        return sum(self.disponibles)
+
+
+    def disponibles_par_auteur(self) -> dict:
+        """
+        Retourne le nombre de livres disponibles (ayant au moins un exemplaire disponible) par auteur.
+
+        Returns:
+            dict: Dictionnaire (nom, nationalité) -> nombre de livres disponibles.
+        """
+        compte = Counter(compress(self.auteurs_idx, self.disponibles))
+        auteurs = self.auteurs
+        return {(auteurs[rang].nom, auteurs[rang].nationalite): nombre for rang, nombre in compte.items()}
+
+
+    def livres_par_nationalite(self) -> dict:
+        """
+        Retourne le nombre de livres par nationalité d'auteur.
+
+        Returns:
+            dict: Dictionnaire nationalité -> nombre de livres.
+        """
+        resultat = Counter()
+        for rang, nombre in Counter(self.auteurs_idx).items():
+            resultat[self.auteurs[rang].nationalite] += nombre
+        return dict(resultat)
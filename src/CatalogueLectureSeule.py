@@ -0,0 +1,229 @@
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+
+from src.Auteur import Auteur
+from src.Livre import Livre
+
+# En-tête : signature, nombre de livres, puis la position de chaque section dans le fichier
+SIGNATURE = b'BIBCAT02'
+FORMAT_ENTETE = '<8sQQQQQQ'
+TAILLE_ENTETE = struct.calcsize(FORMAT_ENTETE)
+SEPARATEUR = b'\x00'
+
+
+def ecrire_catalogue(bibliotheque, chemin: str) -> None:
+    """
+    Écrit les livres d'une bibliothèque dans un fichier de catalogue en lecture seule.
+
+    Le fichier contient :
+    - les enregistrements des livres (book_id, titre, nom et nationalité de l'auteur, disponibilité) ;
+    - un tableau des positions des enregistrements et un tableau des enregistrements triés par book_id ;
+    - un texte de recherche (titre et nom de l'auteur en minuscules de chaque livre) et ses positions.
+
+    Args:
+        bibliotheque (Bibliotheque): La bibliothèque dont les livres sont écrits.
+        chemin (str): Le chemin du fichier de catalogue.
+
+    Raises:
+        ValueError: Si un champ contient le caractère nul (réservé comme séparateur).
+    """
+    positions_enregistrements = array('Q', [0])
+    positions_recherche = array('Q', [0])
+    ids = []
+
+    with tempfile.TemporaryFile() as enregistrements, tempfile.TemporaryFile() as texte_recherche:
+        for book_id, livre in bibliotheque.livres.items():
+            champs = (book_id, livre.titre, livre.auteur.nom, livre.auteur.nationalite,
+                      str(livre.exemplaires), str(livre.disponibles))
+            if any('\x00' in champ for champ in champs):
+                raise ValueError(f"Le livre {book_id} contient un caractère nul")
+
+            enregistrement = SEPARATEUR.join(champ.encode('utf-8') for champ in champs)
+            enregistrements.write(enregistrement)
+            positions_enregistrements.append(positions_enregistrements[-1] + len(enregistrement))
+
+            recherche = (livre.titre.lower() + '\x00' + livre.auteur.nom.lower() + '\x00').encode('utf-8')
+            texte_recherche.write(recherche)
+            positions_recherche.append(positions_recherche[-1] + len(recherche))
+
+            ids.append(book_id.encode('utf-8'))
+
+        ordre = array('Q', sorted(range(len(ids)), key=ids.__getitem__))
+
+        # Les tableaux sont placés avant les textes pour rester alignés sur 8 octets
+        debut_positions = TAILLE_ENTETE
+        debut_ordre = debut_positions + len(positions_enregistrements) * 8
+        debut_positions_recherche = debut_ordre + len(ordre) * 8
+        debut_enregistrements = debut_positions_recherche + len(positions_recherche) * 8
+        debut_recherche = debut_enregistrements + positions_enregistrements[-1]
+
+        chemin_temporaire = chemin + '.tmp'
+        with open(chemin_temporaire, 'wb') as fichier:
+            fichier.write(struct.pack(FORMAT_ENTETE, SIGNATURE, len(ids), debut_positions, debut_ordre,
+                                      debut_positions_recherche, debut_enregistrements, debut_recherche))
+            positions_enregistrements.tofile(fichier)
+            ordre.tofile(fichier)
+            positions_recherche.tofile(fichier)
+            for source in (enregistrements, texte_recherche):
+                source.seek(0)
+                shutil.copyfileobj(source, fichier)
+        os.replace(chemin_temporaire, chemin)
+
+
+class CatalogueLectureSeule(Mapping):
+    """
+    Catalogue de livres en lecture seule, projeté en mémoire (mmap) depuis un fichier écrit par ecrire_catalogue.
+
+    Rien n'est désérialisé à l'ouverture : les recherches parcourent directement le texte de recherche du
+    fichier et seuls les livres trouvés sont construits. Plusieurs processus qui ouvrent le même fichier
+    partagent les mêmes pages en mémoire.
+
+    Attributes:
+        chemin (str): Le chemin du fichier de catalogue.
+    """
+
+    def __init__(self, chemin: str):
+        self.chemin = chemin
+        with open(chemin, 'rb') as fichier:
+            self._mmap = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (signature, self._nombre, debut_positions, debut_ordre, debut_positions_recherche,
+         self._debut_enregistrements, self._debut_recherche) = struct.unpack_from(FORMAT_ENTETE, self._mmap)
+        if signature != SIGNATURE:
+            self._mmap.close()
+            raise ValueError(f"{chemin} n'est pas un catalogue de bibliothèque")
+
+        self._vue = vue = memoryview(self._mmap)
+        self._positions = vue[debut_positions:debut_ordre].cast('Q')
+        self._ordre = vue[debut_ordre:debut_positions_recherche].cast('Q')
+        self._positions_recherche = vue[debut_positions_recherche:self._debut_enregistrements].cast('Q')
+        self._auteurs = {}
+
+
+    def _champs(self, rang: int):
+        """Retourne les champs décodés de l'enregistrement de rang donné."""
+        debut = self._debut_enregistrements + self._positions[rang]
+        fin = self._debut_enregistrements + self._positions[rang + 1]
+        return [champ.decode('utf-8') for champ in self._mmap[debut:fin].split(SEPARATEUR)]
+
+
+    def _book_id(self, rang: int) -> bytes:
+        """Retourne le book_id encodé de l'enregistrement de rang donné."""
+        debut = self._debut_enregistrements + self._positions[rang]
+        return self._mmap[debut:self._mmap.find(SEPARATEUR, debut)]
+
+
+    def _livre(self, rang: int) -> Livre:
+        """Construit le livre de rang donné (les auteurs sont partagés entre les livres construits)."""
+        book_id, titre, nom, nationalite, exemplaires, disponibles = self._champs(rang)
+        auteur = self._auteurs.get((nom, nationalite))
+        if auteur is None:
+            auteur = self._auteurs[(nom, nationalite)] = Auteur(nom, nationalite)
+        return Livre.construire_sans_verification(book_id, titre, auteur, int(exemplaires), int(disponibles))
+
+
+    def _rang(self, book_id: str):
+        """Recherche dichotomique du rang d'un livre par book_id, ou None s'il n'existe pas."""
+        cle = book_id.encode('utf-8')
+        bas, haut = 0, self._nombre
+        while bas < haut:
+            milieu = (bas + haut) // 2
+            if self._book_id(self._ordre[milieu]) < cle:
+                bas = milieu + 1
+            else:
+                haut = milieu
+        if bas < self._nombre and self._book_id(self._ordre[bas]) == cle:
+            return self._ordre[bas]
+        return None
+
+
+    def __getitem__(self, book_id: str) -> Livre:
+        rang = self._rang(book_id) if isinstance(book_id, str) else None
+        if rang is None:
+            raise KeyError(book_id)
+        return self._livre(rang)
+
+
+    def __contains__(self, book_id) -> bool:
+        return isinstance(book_id, str) and self._rang(book_id) is not None
+
+
+    def __iter__(self):
+        for rang in range(self._nombre):
+            yield self._book_id(rang).decode('utf-8')
+
+
+    def __len__(self):
+        return self._nombre
+
+
+    def rechercher_livre(self, recherche: str):
+        """
+        Recherche des livres par titre ou par auteur, avec la même sémantique que Bibliotheque.rechercher_livre.
+
+        Args:
+            recherche (str): Le critère de recherche (titre ou nom de l'auteur).
+
+        Returns:
+            dict: Un dictionnaire des livres correspondants à la recherche.
+
+        Raises:
+            ValueError: Si aucun livre n'est trouvé.
+        """
+        motif = recherche.lower().encode('utf-8')
+        resultat = {}
+
+        if not motif:
+            rangs = range(self._nombre)
+        elif SEPARATEUR in motif:
+            rangs = ()
+        else:
+            rangs = self._rangs_correspondants(motif)
+
+        for rang in rangs:
+            livre = self._livre(rang)
+            resultat[livre.book_id] = livre
+
+        if not resultat:
+            raise ValueError("Aucun livre n'est disponible")
+
+        return resultat
+
+
+    def _rangs_correspondants(self, motif: bytes):
+        """Parcourt le texte de recherche et retourne les rangs des livres qui contiennent le motif."""
+        debut_texte = self._debut_recherche
+        fin_texte = debut_texte + self._positions_recherche[self._nombre]
+        position = debut_texte
+
+        while True:
+            position = self._mmap.find(motif, position, fin_texte)
+            if position < 0:
+                return
+            rang = bisect_right(self._positions_recherche, position - debut_texte) - 1
+            yield rang
+            # Reprend au livre suivant pour ne pas retourner deux fois le même livre
+            position = debut_texte + self._positions_recherche[rang + 1]
+
+
+    def fermer(self) -> None:
+        """Libère la projection en mémoire du fichier."""
+        self._positions.release()
+        self._ordre.release()
+        self._positions_recherche.release()
+        self._vue.release()
+        self._mmap.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.fermer()
@@ -6,9 +6,12 @@ class Emprunteur:
     Attributes:
         emprunteur_id (str): Le nom de l'auteur.
         nom (str): La nationalité de l'auteur.
-        livres_empruntes ([Livre]): La liste des œuvres de l'auteur.
+        livres_empruntes ([Livre]): Les livres empruntés (vue sur emprunts).
+        emprunts (dict): Les livres empruntés, par book_id, dans l'ordre des emprunts.
     """
 
+    __slots__ = ('emprunteur_id', 'nom', 'emprunts')
+
     def __init__(self, emprunteur_id: str, nom: str):
         if not isinstance(emprunteur_id, str) or not emprunteur_id:
             raise ValueError("Le emprunteur_id doit être une chaîne non vide")
@@ -17,7 +20,29 @@ class Emprunteur:
 
         self.emprunteur_id = emprunteur_id
         self.nom = nom
-        self.livres_empruntes = []
+        self.emprunts = {}
+
+
+    @property
+    def livres_empruntes(self):
+        """Les livres empruntés, dans l'ordre des emprunts."""
+        return self.emprunts.values()
+
+
+    def ajouter_emprunt(self, livre) -> None:
+        """Ajoute un livre aux livres empruntés."""
+        self.emprunts[livre.book_id] = livre
+
+
+    def retirer_emprunt(self, book_id: str) -> None:
+        """
+        Retire un livre des livres empruntés, en O(1).
+
+        Raises:
+            ValueError: Si l'emprunteur n'a pas emprunté ce livre.
+        """
+        if self.emprunts.pop(book_id, None) is None:
+            raise ValueError(f"Le livre {book_id} n'est pas emprunté par {self.emprunteur_id}")
 
 
 
@@ -0,0 +1,137 @@
+class RapportImport:
+    """
+    Rapport d'une importation en masse de livres.
+
+    Attributes:
+        lignes_lues (int): Le nombre de lignes traitées.
+        livres_ajoutes (int): Le nombre de livres ajoutés à la bibliothèque.
+        nombre_erreurs (int): Le nombre total de lignes rejetées.
+        erreurs (list): Les premières erreurs sous forme de tuples (numéro de ligne, message).
+        max_erreurs (int): Le nombre maximal d'erreurs conservées dans erreurs.
+    """
+
+    def __init__(self, max_erreurs: int = 1000):
+        self.lignes_lues = 0
+        self.livres_ajoutes = 0
+        self.nombre_erreurs = 0
+        self.erreurs = []
+        self.max_erreurs = max_erreurs
+
+
+    def ajouter_erreur(self, numero_ligne: int, message: str) -> None:
+        """Enregistre une ligne rejetée (seules les max_erreurs premières sont conservées)."""
+        self.nombre_erreurs += 1
+        if len(self.erreurs) < self.max_erreurs:
+            self.erreurs.append((numero_ligne, message))
+
+
+    def __str__(self):
+        return (f"RapportImport(lignes_lues={self.lignes_lues}, livres_ajoutes={self.livres_ajoutes}, "
+                f"erreurs={self.nombre_erreurs})")
+
+
+# Produit par lire_jsonl pour une ligne vide : ignoré par les importations en masse, il conserve la
+# correspondance entre les numéros de ligne du rapport et ceux du fichier
+LIGNE_VIDE = object()
+
+
+def extraire_ligne(ligne):
+    """
+    Extrait les champs d'une ligne d'importation.
+
+    Args:
+        ligne (dict | tuple): Un dictionnaire avec les clés 'book_id', 'titre', 'auteur', 'nationalite' et
+            'exemplaires' (facultative), ou un tuple (book_id, titre, nom de l'auteur, nationalité[, exemplaires]).
+
+    Returns:
+        tuple: (book_id, titre, nom de l'auteur, nationalité, nombre d'exemplaires).
+
+    Raises:
+        ValueError: Si la ligne est invalide.
+    """
+    if isinstance(ligne, Exception):
+        raise ValueError(str(ligne))
+
+    try:
+        if isinstance(ligne, dict):
+            champs = (ligne['book_id'], ligne['titre'], ligne['auteur'], ligne['nationalite'])
+            exemplaires = ligne.get('exemplaires')
+        else:
+            book_id, titre, nom, nationalite, *reste = ligne
+            if len(reste) > 1:
+                raise ValueError(f"{len(ligne)} champs au lieu de 4 ou 5")
+            champs = (book_id, titre, nom, nationalite)
+            exemplaires = reste[0] if reste else None
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Ligne mal formée : {e!r}")
+
+    for champ in champs:
+        if not isinstance(champ, str):
+            raise ValueError(f"Le champ {champ!r} doit être une chaîne")
+    return champs + (_nombre_exemplaires(exemplaires),)
+
+
+def _nombre_exemplaires(valeur) -> int:
+    """
+    Convertit le champ exemplaires d'une ligne (absent : un exemplaire).
+
+    Seuls les entiers et les chaînes d'entiers sont acceptés : un booléen ou un nombre à virgule (par exemple
+    2.9 dans un fichier JSONL) est une erreur, et non un nombre d'exemplaires tronqué.
+    """
+    if valeur is None or valeur == '':
+        return 1
+    if isinstance(valeur, bool) or not isinstance(valeur, (int, str)):
+        raise ValueError(f"Le nombre d'exemplaires {valeur!r} doit être un entier")
+    try:
+        exemplaires = int(valeur)
+    except ValueError:
+        raise ValueError(f"Le nombre d'exemplaires {valeur!r} doit être un entier")
+    if exemplaires < 1:
+        raise ValueError("Le nombre d'exemplaires doit être un entier positif")
+    return exemplaires
+
+
+def lire_csv(chemin: str, encodage: str = 'utf-8'):
+    """
+    Lit un fichier CSV ligne par ligne (colonnes book_id, titre, auteur, nationalite et exemplaires facultative).
+
+    Args:
+        chemin (str): Le chemin du fichier CSV.
+        encodage (str): L'encodage du fichier.
+
+    Yields:
+        dict: Une ligne du fichier.
+    """
+    import csv   # Importé à la lecture : Bibliotheque importe ce module pour extraire_ligne seulement
+
+    with open(chemin, newline='', encoding=encodage) as fichier:
+        yield from csv.DictReader(fichier)
+
+
+def lire_jsonl(chemin: str, encodage: str = 'utf-8'):
+    """
+    Lit un fichier JSON Lines ligne par ligne (un objet JSON par ligne).
+
+    Chaque ligne du fichier produit exactement un élément, de sorte que les numéros de ligne du rapport
+    d'importation sont ceux du fichier : une ligne vide produit LIGNE_VIDE (ignoré à l'importation) et une
+    ligne JSON invalide une exception ValueError (au lieu d'un dictionnaire), comptée comme erreur dans le
+    rapport sans interrompre l'importation.
+
+    Args:
+        chemin (str): Le chemin du fichier JSONL.
+        encodage (str): L'encodage du fichier.
+
+    Yields:
+        dict | ValueError | object: Une ligne du fichier.
+    """
+    import json   # Importé à la lecture, comme csv dans lire_csv
+
+    with open(chemin, encoding=encodage) as fichier:
+        for numero, ligne in enumerate(fichier, 1):
+            if not ligne.strip():
+                yield LIGNE_VIDE
+                continue
+            try:
+                yield json.loads(ligne)
+            except ValueError as e:
+                yield ValueError(f"JSON invalide à la ligne {numero} : {e}")
@@ -0,0 +1,303 @@
+import unicodedata
+from array import array
+from itertools import islice
+
+
+# Lettres sans décomposition Unicode, remplacées par leur équivalent sans accent
+LIGATURES = str.maketrans({'œ': 'oe', 'æ': 'ae', 'ø': 'o', 'ł': 'l', 'đ': 'd'})
+
+
+def plier(texte: str) -> str:
+    """
+    Plie un texte pour une comparaison insensible à la casse et aux accents.
+
+    Le texte est mis en casse pliée (casefold), décomposé (NFKD) et privé de ses signes diacritiques ;
+    les ligatures sont développées. Par exemple « Œuvres Complètes » devient « oeuvres completes ».
+
+    Args:
+        texte (str): Le texte à plier.
+
+    Returns:
+        str: Le texte plié.
+    """
+    if texte.isascii():
+        return texte.lower()
+    decompose = unicodedata.normalize('NFKD', texte.casefold())
+    return ''.join(c for c in decompose if not unicodedata.combining(c)).translate(LIGATURES)
+
+
+class IndexRecherche:
+    """
+    Index inversé de trigrammes sur les titres des livres et les noms des auteurs.
+
+    Chaque livre reçoit un rang (son ordre d'insertion) et son titre et le nom de son auteur, pliés (voir
+    plier : minuscules, sans accents ni ligatures), sont découpés en trigrammes. Chaque trigramme est associé à la liste compacte (array('I'))
+    des rangs des livres qui le contiennent ; les rangs étant attribués dans l'ordre croissant, ces listes
+    restent triées sans effort. Une recherche ne vérifie alors que les livres contenant le trigramme le plus
+    rare de la requête au lieu de tout le catalogue, tout en conservant exactement la sémantique
+    « sous-chaîne » de Bibliotheque.rechercher_livre.
+
+    Un seul index sert les deux modes de recherche. Les candidats sont toujours tirés des trigrammes pliés,
+    qui contiennent ceux de toute correspondance en minuscules ; la recherche sensible aux accents (mode par
+    défaut) vérifie ensuite chaque candidat sur les clés en minuscules, la recherche sans accents sur les clés
+    pliées. Ainsi « oeuvre » trouve « Œuvre » sans accents, mais pas dans le mode par défaut.
+
+    Les recherches plus courtes qu'un trigramme passent par une petite table fragment -> trigrammes qui le
+    contiennent ; les livres dont le titre ou le nom de l'auteur est trop court pour avoir un trigramme sont
+    gardés à part et toujours vérifiés.
+
+    Pour la recherche classée (classer), les titres exacts et les préfixes de titre (longueur 1 à
+    TAILLE_NGRAMME) sont aussi indexés, dans l'ordre d'insertion : les meilleurs résultats sont ainsi
+    produits sans parcourir tous les candidats.
+
+    Attributes:
+        postings (dict): Dictionnaire trigramme -> rangs (array('I'), croissants) des livres qui le contiennent.
+        fragments (dict): Dictionnaire fragment de 1 ou 2 caractères -> liste des trigrammes qui le contiennent.
+        courts (array): Les rangs des livres dont le titre ou le nom de l'auteur a moins de TAILLE_NGRAMME caractères.
+        ids (list): Les book_id, par rang.
+        cles (list): Les couples (titre plié, nom de l'auteur plié), par rang.
+        cles_minuscules (list): Les couples (titre, nom de l'auteur) en minuscules, par rang (le même couple
+            que dans cles quand le pli ne change rien, comme pour un texte ASCII).
+        rangs (dict): Dictionnaire book_id -> rang d'insertion (pour conserver l'ordre de la bibliothèque).
+        titres (dict): Dictionnaire titre plié -> book_id, ou liste des book_id si le titre est partagé.
+        prefixes (dict): Dictionnaire préfixe de titre plié -> rangs (array('I')) des livres, dans l'ordre d'insertion.
+    """
+
+    TAILLE_NGRAMME = 3
+
+    # Pertinence d'un résultat de classer, de la meilleure à la moins bonne
+    TITRE_EXACT = 0
+    PREFIXE_TITRE = 1
+    DANS_TITRE = 2
+    DANS_AUTEUR = 3
+
+    def __init__(self):
+        self.postings = {}
+        self.fragments = {}
+        self.courts = array('I')
+        self.ids = []
+        self.cles = []
+        self.cles_minuscules = []
+        self.rangs = {}
+        self.titres = {}
+        self.prefixes = {}
+
+
+    @staticmethod
+    def normaliser(texte: str, sans_accents: bool = False) -> str:
+        """Normalise un texte pour la recherche : minuscules, ou plié si sans_accents."""
+        return plier(texte) if sans_accents else texte.lower()
+
+
+    def _trigrammes(self, texte: str):
+        """Retourne l'ensemble des trigrammes d'un texte normalisé."""
+        taille = self.TAILLE_NGRAMME
+        return {texte[debut:debut + taille] for debut in range(len(texte) - taille + 1)}
+
+
+    def ajouter(self, book_id: str, titre: str, nom_auteur: str) -> None:
+        """
+        Indexe un livre.
+
+        Args:
+            book_id (str): L'identifiant du livre.
+            titre (str): Le titre du livre.
+            nom_auteur (str): Le nom de l'auteur du livre.
+        """
+        minuscules = (titre.lower(), nom_auteur.lower())
+        # Pour un texte ASCII, le pli est la mise en minuscules : la même chaîne sert aux deux clés
+        titre, nom_auteur = (texte if texte.isascii() else plier(texte) for texte in minuscules)
+
+        rang = len(self.ids)
+        self.ids.append(book_id)
+        cle = (titre, nom_auteur)
+        self.cles.append(cle)
+        self.cles_minuscules.append(cle if minuscules == cle else minuscules)
+        self.rangs[book_id] = rang
+
+        for trigramme in self._trigrammes(titre) | self._trigrammes(nom_auteur):
+            livres = self.postings.get(trigramme)
+            if livres is None:
+                self.postings[trigramme] = livres = array('I')
+                # Nouveau trigramme : il devient candidat pour les recherches de 1 et 2 caractères qu'il contient
+                for fragment in {trigramme[0], trigramme[1], trigramme[2], trigramme[:2], trigramme[1:]}:
+                    self.fragments.setdefault(fragment, []).append(trigramme)
+            livres.append(rang)
+        if len(titre) < self.TAILLE_NGRAMME or len(nom_auteur) < self.TAILLE_NGRAMME:
+            self.courts.append(rang)
+
+        # Un titre n'est presque jamais partagé : la liste n'est créée qu'au deuxième livre
+        deja = self.titres.get(titre)
+        if deja is None:
+            self.titres[titre] = book_id
+        elif isinstance(deja, list):
+            deja.append(book_id)
+        else:
+            self.titres[titre] = [deja, book_id]
+
+        for taille in range(1, min(len(titre), self.TAILLE_NGRAMME) + 1):
+            livres = self.prefixes.get(titre[:taille])
+            if livres is None:
+                self.prefixes[titre[:taille]] = livres = array('I')
+            livres.append(rang)
+
+
+    def cle(self, book_id: str, sans_accents: bool = False) -> tuple:
+        """Retourne le couple (titre, nom de l'auteur) d'un livre indexé, en minuscules ou plié si sans_accents."""
+        return (self.cles if sans_accents else self.cles_minuscules)[self.rangs[book_id]]
+
+
+    def candidats(self, recherche: str):
+        """
+        Retourne les rangs des livres pouvant correspondre à la recherche (sur-ensemble des résultats exacts).
+
+        Args:
+            recherche (str): La recherche déjà pliée.
+
+        Returns:
+            tuple: (rangs, exacts) : les rangs candidats dans l'ordre croissant (array, list ou range), et vrai
+                s'ils correspondent tous à la recherche pliée sans qu'il soit besoin de les vérifier sur cles.
+        """
+        # Une recherche vide correspond à tous les livres (comme `'' in titre`)
+        tous = range(len(self.ids))
+        if not recherche:
+            return tous, True
+
+        if len(recherche) < self.TAILLE_NGRAMME:
+            listes = [self.postings[trigramme] for trigramme in self.fragments.get(recherche, ())]
+            # Fragment très répandu : parcourir tous les livres coûte moins que fusionner les listes
+            if sum(map(len, listes)) >= len(tous):
+                return tous, False
+            # Un trigramme contenant le fragment garantit la correspondance ; seuls les textes courts sont vérifiés
+            cles = self.cles
+            rangs = {rang for rang in self.courts if recherche in cles[rang][0] or recherche in cles[rang][1]}
+            for livres in listes:
+                rangs.update(livres)
+            return sorted(rangs), True
+
+        # Les livres du trigramme le plus rare sont vérifiés directement : un test de sous-chaîne coûte moins
+        # que l'intersection avec les autres listes (les trigrammes ne garantissent pas la contiguïté)
+        livres = min((self.postings.get(trigramme, ()) for trigramme in self._trigrammes(recherche)), key=len)
+        return livres, len(recherche) == self.TAILLE_NGRAMME
+
+
+    def rechercher(self, recherche: str, sans_accents: bool = False):
+        """
+        Retourne les book_id dont le titre ou le nom de l'auteur contient la recherche.
+
+        Args:
+            recherche (str): Le critère de recherche (non normalisé).
+            sans_accents (bool): Si vrai, la comparaison ignore aussi les accents et les ligatures.
+
+        Returns:
+            list: Les identifiants correspondants, dans l'ordre d'insertion.
+        """
+        pliee = plier(recherche)
+        rangs, exacts = self.candidats(pliee)
+        ids = self.ids
+        if sans_accents:
+            recherche, cles = pliee, self.cles
+            if exacts:
+                return [ids[rang] for rang in rangs]
+        else:
+            recherche, cles = recherche.lower(), self.cles_minuscules
+        if len(rangs) == len(ids):
+            # Parcours complet : ids et cles sont lus ensemble, sans passer par les rangs
+            return [book_id for book_id, (titre, nom_auteur) in zip(ids, cles)
+                    if recherche in titre or recherche in nom_auteur]
+        return [ids[rang] for rang in rangs if recherche in cles[rang][0] or recherche in cles[rang][1]]
+
+
+    def pertinence(self, book_id: str, recherche: str, sans_accents: bool = False):
+        """
+        Retourne la pertinence d'un livre pour une recherche normalisée (pliée si sans_accents).
+
+        Returns:
+            int: TITRE_EXACT, PREFIXE_TITRE, DANS_TITRE ou DANS_AUTEUR, ou None si le livre ne correspond pas.
+        """
+        titre, nom_auteur = self.cle(book_id, sans_accents)
+        if titre == recherche:
+            return self.TITRE_EXACT
+        if titre.startswith(recherche):
+            return self.PREFIXE_TITRE
+        if recherche in titre:
+            return self.DANS_TITRE
+        if recherche in nom_auteur:
+            return self.DANS_AUTEUR
+        return None
+
+
+    def classer(self, recherche: str, nombre: int = None, sans_accents: bool = False):
+        """
+        Produit les livres correspondant à la recherche, du plus pertinent au moins pertinent.
+
+        L'ordre est : titre exact, puis titre commençant par la recherche, puis titre contenant la
+        recherche, puis nom de l'auteur contenant la recherche ; à pertinence égale, l'ordre d'insertion.
+        Les résultats sont produits au fur et à mesure et le parcours s'arrête dès que les nombre premiers
+        résultats sont connus : la mémoire utilisée dépend de nombre et non de la taille du catalogue.
+
+        Args:
+            recherche (str): Le critère de recherche (non normalisé).
+            nombre (int): Le nombre de résultats voulus (tous par défaut).
+            sans_accents (bool): Si vrai, la comparaison ignore aussi les accents et les ligatures.
+
+        Yields:
+            tuple: (pertinence, book_id).
+        """
+        if nombre is not None and nombre <= 0:
+            return
+        pliee = plier(recherche)
+        recherche = pliee if sans_accents else recherche.lower()
+        ids, cles = self.ids, self.cles if sans_accents else self.cles_minuscules
+
+        # Titres exacts et préfixes : listes déjà dans l'ordre d'insertion, indexées sur le titre plié
+        exacts = self.titres.get(pliee, ())
+        if isinstance(exacts, str):
+            exacts = (exacts,)
+        produits = 0
+        for book_id in exacts:
+            if sans_accents or cles[self.rangs[book_id]][0] == recherche:
+                yield self.TITRE_EXACT, book_id
+                produits += 1
+                if produits == nombre:
+                    return
+
+        # Une recherche vide est un préfixe de tous les titres
+        prefixes = self.prefixes.get(pliee[:self.TAILLE_NGRAMME], ()) if pliee else range(len(ids))
+        for rang in prefixes:
+            titre = cles[rang][0]
+            if titre.startswith(recherche) and titre != recherche:
+                yield self.PREFIXE_TITRE, ids[rang]
+                produits += 1
+                if produits == nombre:
+                    return
+        if not recherche:
+            return
+
+        # Sous-chaînes, candidats dans l'ordre d'insertion : les correspondances dans le nom de l'auteur
+        # attendent la fin des titres (au plus reste sont gardées)
+        reste = None if nombre is None else nombre - produits
+        rangs = self.candidats(pliee)[0]
+        if len(rangs) == len(ids):
+            candidats = zip(ids, cles)
+        else:
+            candidats = ((ids[rang], cles[rang]) for rang in rangs)
+        auteurs = []
+        for book_id, (titre, nom_auteur) in candidats:
+            if recherche in titre:
+                if titre.startswith(recherche):
+                    continue
+                yield self.DANS_TITRE, book_id
+                if reste is not None:
+                    reste -= 1
+                    if reste == 0:
+                        return
+            elif recherche in nom_auteur and (reste is None or len(auteurs) < reste):
+                auteurs.append(book_id)
+
+        for book_id in islice(auteurs, reste):
+            yield self.DANS_AUTEUR, book_id
+
+
+    def __len__(self):
+        return len(self.ids)
@@ -0,0 +1,105 @@
+import threading
+
+
+class IndexSecondaires:
+    """
+    Index secondaires d'une bibliothèque, tenus à jour à chaque ajout, emprunt et retour pour répondre sans
+    parcourir livres, auteurs ou emprunteurs.
+
+    Attributes:
+        disponibles (dict): Les book_id des livres ayant au moins un exemplaire disponible (dictionnaire
+            utilisé comme ensemble ordonné, dans l'ordre de leur dernière remise en disponibilité).
+        auteurs_par_nationalite (dict): Dictionnaire nationalité -> {(nom, nationalité): Auteur}, dans l'ordre
+            d'arrivée des auteurs.
+        nombre_emprunts (dict): Le nombre de livres détenus par chaque emprunteur, par ID.
+        par_nombre_emprunts (list): Ensembles des ID d'emprunteurs détenant k livres, à l'indice k.
+    """
+
+    def __init__(self):
+        self.disponibles = {}
+        self.auteurs_par_nationalite = {}
+        self.nombre_emprunts = {}
+        self.par_nombre_emprunts = [set()]
+        # Les mises à jour portant sur des livres différents se font sous des verrous de livres différents :
+        # les index, partagés entre livres, sont protégés par ce verrou, et les lecteurs en prennent une copie.
+        self._verrou = threading.Lock()
+
+
+    def ajouter_auteur(self, auteur) -> None:
+        """Enregistre un auteur dans l'index des nationalités (sans effet s'il y est déjà)."""
+        with self._verrou:
+            auteurs = self.auteurs_par_nationalite.get(auteur.nationalite)
+            if auteurs is None:
+                auteurs = self.auteurs_par_nationalite[auteur.nationalite] = {}
+            auteurs.setdefault((auteur.nom, auteur.nationalite), auteur)
+
+
+    def auteurs_de_nationalite(self, nationalite: str) -> list:
+        """Retourne une copie des auteurs d'une nationalité, dans l'ordre d'arrivée."""
+        with self._verrou:
+            return list(self.auteurs_par_nationalite.get(nationalite, {}).values())
+
+
+    def mettre_a_jour_disponibilite(self, livre) -> None:
+        """Ajoute le livre aux livres disponibles ou l'en retire, selon son nombre d'exemplaires disponibles."""
+        with self._verrou:
+            if livre.disponibles > 0:
+                self.disponibles[livre.book_id] = None
+            else:
+                self.disponibles.pop(livre.book_id, None)
+
+
+    def ids_disponibles(self) -> list:
+        """Retourne une copie des book_id des livres disponibles, dans l'ordre de leur remise en disponibilité."""
+        with self._verrou:
+            return list(self.disponibles)
+
+
+    def nombre_disponibles(self) -> int:
+        """Retourne le nombre de livres ayant au moins un exemplaire disponible."""
+        with self._verrou:
+            return len(self.disponibles)
+
+
+    def ajouter_emprunteur(self, emprunteur_id: str) -> None:
+        """Enregistre un nouvel emprunteur, sans livre emprunté."""
+        with self._verrou:
+            self.nombre_emprunts[emprunteur_id] = 0
+            self.par_nombre_emprunts[0].add(emprunteur_id)
+
+
+    def emprunt(self, emprunteur_id: str) -> None:
+        """Enregistre un livre de plus détenu par l'emprunteur."""
+        with self._verrou:
+            nombre = self.nombre_emprunts[emprunteur_id]
+            self.par_nombre_emprunts[nombre].discard(emprunteur_id)
+            nombre += 1
+            if nombre == len(self.par_nombre_emprunts):
+                self.par_nombre_emprunts.append(set())
+            self.par_nombre_emprunts[nombre].add(emprunteur_id)
+            self.nombre_emprunts[emprunteur_id] = nombre
+
+
+    def retour(self, emprunteur_id: str) -> None:
+        """Enregistre un livre de moins détenu par l'emprunteur."""
+        with self._verrou:
+            nombre = self.nombre_emprunts[emprunteur_id]
+            self.par_nombre_emprunts[nombre].discard(emprunteur_id)
+            nombre -= 1
+            self.par_nombre_emprunts[nombre].add(emprunteur_id)
+            self.nombre_emprunts[emprunteur_id] = nombre
+
+
+    def emprunteurs_avec_plus_de(self, nombre: int) -> list:
+        """
+        Retourne les ID des emprunteurs détenant strictement plus de nombre livres.
+
+        Args:
+            nombre (int): Le seuil (positif ou nul).
+
+        Returns:
+            list: Les ID des emprunteurs, par nombre de livres détenus décroissant.
+        """
+        with self._verrou:
+            classes = self.par_nombre_emprunts[nombre + 1:]
+            return [emprunteur_id for ids in reversed(classes) for emprunteur_id in ids]
@@ -0,0 +1,265 @@
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+
+# Bornes supérieures (en secondes) des classes des histogrammes de latence
+BORNES_LATENCE = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+
+# Journal « bibliotheque », obtenu au premier appel de journaliser_erreur : logging (plusieurs millisecondes
+# d'import) n'est chargé que si ce gestionnaire sert
+_journal = None
+
+
+def afficher_erreur(operation: str, message: str, erreur: Exception) -> None:
+    """Gestionnaire d'erreur par défaut : affiche le message et l'erreur sur la sortie standard."""
+    print(f"{message} : {erreur}")
+
+
+def journaliser_erreur(operation: str, message: str, erreur: Exception) -> None:
+    """
+    Gestionnaire d'erreur qui passe par le module logging (journal « bibliotheque », niveau WARNING).
+
+    L'opération et le type de l'erreur sont ajoutés à l'enregistrement (attributs operation et type_erreur)
+    pour les formateurs structurés.
+    """
+    global _journal
+    if _journal is None:
+        import logging
+        _journal = logging.getLogger('bibliotheque')
+
+    if _journal.isEnabledFor(30):   # logging.WARNING
+        _journal.warning("%s : %s", message, erreur,
+                         extra={'operation': operation, 'type_erreur': type(erreur).__name__})
+
+
+class Instrumentation:
+    """
+    Mesures des opérations d'une bibliothèque : nombre d'appels, histogrammes de latence, erreurs par type
+    et jauges (tailles des index, du cache, etc.).
+
+    Désactivée par défaut : une opération instrumentée ne coûte alors qu'un test de l'attribut actif. Les
+    erreurs sont dans tous les cas transmises à gestionnaire_erreur, qui les affiche par défaut (comme
+    auparavant) et peut être remplacé, par exemple par journaliser_erreur.
+
+    Attributes:
+        actif (bool): Si vrai, les appels, latences et erreurs sont comptés.
+        gestionnaire_erreur (callable): Fonction (operation, message, erreur) appelée pour chaque erreur.
+        appels (Counter): Le nombre d'appels de chaque opération.
+        erreurs (Counter): Le nombre d'erreurs par (opération, type d'erreur).
+        latences (dict): Dictionnaire opération -> nombre d'appels par classe de BORNES_LATENCE (plus une
+            dernière classe au-delà de la plus grande borne).
+        durees (Counter): La durée totale (en secondes) des appels de chaque opération.
+        jauges (dict): Dictionnaire nom -> fonction sans argument retournant la valeur de la jauge.
+        exportateurs (list): Les exportateurs appelés par exporter (fonctions prenant l'instrumentation).
+    """
+
+    def __init__(self, actif: bool = False, gestionnaire_erreur=afficher_erreur):
+        self.actif = actif
+        self.gestionnaire_erreur = gestionnaire_erreur
+        self.appels = Counter()
+        self.erreurs = Counter()
+        self.latences = {}
+        self.durees = Counter()
+        self.jauges = {}
+        self.exportateurs = []
+        self._verrou = threading.Lock()
+
+
+    def activer(self) -> None:
+        """Active le comptage des appels, des latences et des erreurs."""
+        self.actif = True
+
+
+    def desactiver(self) -> None:
+        """Désactive le comptage (les mesures déjà faites sont conservées)."""
+        self.actif = False
+
+
+    def ajouter_jauge(self, nom: str, fonction) -> None:
+        """Enregistre une jauge, lue à chaque export (par exemple lambda: len(bibliotheque.livres))."""
+        self.jauges[nom] = fonction
+
+
+    def enregistrer(self, operation: str, duree: float, erreur: Exception = None) -> None:
+        """
+        Enregistre un appel d'une opération.
+
+        Args:
+            operation (str): Le nom de l'opération.
+            duree (float): La durée de l'appel en secondes.
+            erreur (Exception): L'erreur levée par l'appel, le cas échéant.
+        """
+        classe = bisect_left(BORNES_LATENCE, duree)
+        with self._verrou:
+            self.appels[operation] += 1
+            self.durees[operation] += duree
+            latences = self.latences.get(operation)
+            if latences is None:
+                latences = self.latences[operation] = [0] * (len(BORNES_LATENCE) + 1)
+            latences[classe] += 1
+            if erreur is not None:
+                self.erreurs[(operation, type(erreur).__name__)] += 1
+
+
+    def valeurs_jauges(self) -> dict:
+        """Retourne la valeur actuelle de chaque jauge."""
+        return {nom: fonction() for nom, fonction in self.jauges.items()}
+
+
+    def exporter(self) -> None:
+        """Appelle chaque exportateur enregistré."""
+        for exportateur in self.exportateurs:
+            exportateur(self)
+
+
+    def reinitialiser(self) -> None:
+        """Remet à zéro les compteurs et les histogrammes (les jauges et exportateurs sont conservés)."""
+        with self._verrou:
+            self.appels.clear()
+            self.erreurs.clear()
+            self.latences.clear()
+            self.durees.clear()
+
+
+def instrumenter(message_erreur: str, paresseux: bool = False):
+    """
+    Décorateur des opérations publiques de Bibliotheque.
+
+    L'erreur éventuelle est transmise au gestionnaire d'erreur de l'instrumentation (avec message_erreur,
+    par exemple « Erreur lors de l'ajout du livre ») puis relancée ; quand l'instrumentation est active,
+    l'appel, sa durée et son erreur sont aussi comptés.
+
+    Args:
+        message_erreur (str): Le début du message d'erreur de l'opération.
+        paresseux (bool): Si vrai, l'opération retourne un itérateur produit à la demande (par exemple
+            rechercher_livre_classe) : quand l'instrumentation est active, la durée comptée comprend le
+            parcours de l'itérateur et l'appel est enregistré à la fin du parcours (ou à sa fermeture).
+    """
+    def decorateur(methode):
+        operation = methode.__name__
+
+        @functools.wraps(methode)
+        def enveloppe(self, *args, **kwargs):
+            instrumentation = self.instrumentation
+            if not instrumentation.actif:
+                try:
+                    return methode(self, *args, **kwargs)
+                except Exception as e:
+                    instrumentation.gestionnaire_erreur(operation, message_erreur, e)
+                    raise
+
+            debut = time.perf_counter()
+            try:
+                resultat = methode(self, *args, **kwargs)
+            except Exception as e:
+                instrumentation.enregistrer(operation, time.perf_counter() - debut, e)
+                instrumentation.gestionnaire_erreur(operation, message_erreur, e)
+                raise
+            if paresseux:
+                return _parcourir(instrumentation, operation, message_erreur, resultat, time.perf_counter() - debut)
+            instrumentation.enregistrer(operation, time.perf_counter() - debut)
+            return resultat
+
+        return enveloppe
+    return decorateur
+
+
+def _parcourir(instrumentation: Instrumentation, operation: str, message_erreur: str, iterateur, duree: float):
+    """
+    Produit les éléments de l'itérateur d'une opération paresseuse en ajoutant à duree le temps passé à les
+    calculer (hors du temps passé chez l'appelant), puis enregistre l'appel.
+    """
+    iterateur = iter(iterateur)
+    erreur = None
+    try:
+        while True:
+            debut = time.perf_counter()
+            try:
+                element = next(iterateur)
+            except StopIteration:
+                duree += time.perf_counter() - debut
+                return
+            except Exception as e:
+                duree += time.perf_counter() - debut
+                erreur = e
+                instrumentation.gestionnaire_erreur(operation, message_erreur, e)
+                raise
+            duree += time.perf_counter() - debut
+            yield element
+    finally:
+        instrumentation.enregistrer(operation, duree, erreur)
+
+
+def format_prometheus(instrumentation: Instrumentation, prefixe: str = 'bibliotheque') -> str:
+    """
+    Retourne les mesures au format texte de Prometheus.
+
+    Args:
+        instrumentation (Instrumentation): Les mesures à exporter.
+        prefixe (str): Le préfixe des noms des métriques.
+
+    Returns:
+        str: Le texte à exposer (ou à écrire dans un fichier lu par le collecteur de fichiers texte).
+    """
+    lignes = [
+        f"# HELP {prefixe}_appels_total Nombre d'appels de chaque opération.",
+        f"# TYPE {prefixe}_appels_total counter",
+    ]
+    with instrumentation._verrou:
+        appels = dict(instrumentation.appels)
+        erreurs = dict(instrumentation.erreurs)
+        latences = {operation: list(classes) for operation, classes in instrumentation.latences.items()}
+        durees = dict(instrumentation.durees)
+
+    for operation, nombre in sorted(appels.items()):
+        lignes.append(f'{prefixe}_appels_total{{operation="{operation}"}} {nombre}')
+
+    lignes += [
+        f"# HELP {prefixe}_erreurs_total Nombre d'erreurs de chaque opération, par type d'erreur.",
+        f"# TYPE {prefixe}_erreurs_total counter",
+    ]
+    for (operation, type_erreur), nombre in sorted(erreurs.items()):
+        lignes.append(f'{prefixe}_erreurs_total{{operation="{operation}",type="{type_erreur}"}} {nombre}')
+
+    lignes += [
+        f"# HELP {prefixe}_latence_secondes Latence des opérations.",
+        f"# TYPE {prefixe}_latence_secondes histogram",
+    ]
+    for operation, classes in sorted(latences.items()):
+        cumul = 0
+        for borne, nombre in zip(BORNES_LATENCE + ('+Inf',), classes):
+            cumul += nombre
+            lignes.append(f'{prefixe}_latence_secondes_bucket{{operation="{operation}",le="{borne}"}} {cumul}')
+        lignes.append(f'{prefixe}_latence_secondes_sum{{operation="{operation}"}} {durees[operation]}')
+        lignes.append(f'{prefixe}_latence_secondes_count{{operation="{operation}"}} {cumul}')
+
+    for nom, valeur in sorted(instrumentation.valeurs_jauges().items()):
+        lignes.append(f"# TYPE {prefixe}_{nom} gauge")
+        lignes.append(f"{prefixe}_{nom} {valeur}")
+
+    return '\n'.join(lignes) + '\n'
+
+
+class ExportateurPrometheus:
+    """
+    Exportateur qui écrit les mesures au format texte de Prometheus dans un fichier (remplacé atomiquement).
+
+    Attributes:
+        chemin (str): Le chemin du fichier.
+        prefixe (str): Le préfixe des noms des métriques.
+    """
+
+    def __init__(self, chemin: str, prefixe: str = 'bibliotheque'):
+        self.chemin = chemin
+        self.prefixe = prefixe
+
+
+    def __call__(self, instrumentation: Instrumentation) -> None:
+        chemin_temporaire = self.chemin + '.tmp'
+        with open(chemin_temporaire, 'w', encoding='utf-8') as fichier:
+            fichier.write(format_prometheus(instrumentation, self.prefixe))
+        os.replace(chemin_temporaire, self.chemin)
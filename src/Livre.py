@@ -8,26 +8,99 @@ class Livre:
     """
     Représente un livre avec son book_id, son titre, son auteur et s'il est disponible.
 
+    Un livre du catalogue peut avoir plusieurs exemplaires physiques : seuls les compteurs d'exemplaires
+    et d'exemplaires disponibles sont conservés, ce qui permet de prendre ou de rendre un exemplaire en O(1).
+
     Attributes:
         book_id (str): Le nom de l'auteur.
         titre (str): La nationalité de l'auteur.
         auteur (Auteur
-        disponible (bool): Sa disponibilite
+        exemplaires (int): Le nombre d'exemplaires du livre.
+        disponibles (int): Le nombre d'exemplaires disponibles.
+        disponible (bool): Sa disponibilite (au moins un exemplaire disponible)
     """
-    def __init__(self, book_id: str, titre: str, auteur: 'Auteur', disponible=True):
-        from src.Auteur import Auteur
 
+    # Pas de __dict__ par instance : les livres se comptent en millions
+    __slots__ = ('book_id', 'titre', 'auteur', 'exemplaires', 'disponibles')
+
+    # Classe des auteurs acceptés, enregistrée par src.Auteur à son import (Auteur importe Livre, l'inverse
+    # créerait un cycle) : la validation ne fait aucun import à chaque construction. Tant que src.Auteur n'est
+    # pas importé, aucun auteur ne peut exister et le tuple vide refuse tout.
+    _type_auteur = ()
+
+    def __init__(self, book_id: str, titre: str, auteur: 'Auteur', disponible=True, exemplaires: int = 1):
         if not isinstance(book_id, str):
             raise ValueError("Le book_id doit être une chaîne non vide")
         if not isinstance(titre, str):
             raise ValueError("Le titre doit être une chaîne non vide")
-        if not isinstance(auteur, Auteur):
+        if not isinstance(auteur, Livre._type_auteur):
             raise ValueError("L'auteur doit être une instance de Auteur")
+        if not isinstance(exemplaires, int) or exemplaires < 1:
+            raise ValueError("Le nombre d'exemplaires doit être un entier positif")
 
         self.book_id = book_id
         self.titre = titre
         self.auteur = auteur
-        self.disponible = disponible
+        self.exemplaires = exemplaires
+        self.disponibles = exemplaires if disponible else 0
+
+    @classmethod
+    def construire_sans_verification(cls, book_id: str, titre: str, auteur: 'Auteur', exemplaires: int = 1,
+                                     disponibles: int = None) -> 'Livre':
+        """
+        Construit un livre à partir de valeurs déjà validées, sans repasser par les vérifications de __init__.
+
+        Réservé aux chargements en masse dont les lignes sont validées en amont (extraire_ligne) et aux
+        livres reconstruits à partir de données écrites par la bibliothèque elle-même.
+
+        Args:
+            book_id (str): L'identifiant du livre.
+            titre (str): Le titre du livre.
+            auteur (Auteur): L'auteur du livre.
+            exemplaires (int): Le nombre d'exemplaires (entier positif).
+            disponibles (int): Le nombre d'exemplaires disponibles (tous par défaut).
+
+        Returns:
+            Livre: Le livre construit.
+        """
+        livre = cls.__new__(cls)
+        livre.book_id = book_id
+        livre.titre = titre
+        livre.auteur = auteur
+        livre.exemplaires = exemplaires
+        livre.disponibles = exemplaires if disponibles is None else disponibles
+        return livre
+
+    @property
+    def disponible(self):
+        return self.disponibles > 0
+
+    @disponible.setter
+    def disponible(self, valeur):
+        # Rend tous les exemplaires disponibles, ou aucun
+        self.disponibles = self.exemplaires if valeur else 0
+
+    def prendre_exemplaire(self):
+        """
+        Prend un exemplaire disponible du livre.
+
+        Raises:
+            ValueError: Si aucun exemplaire n'est disponible.
+        """
+        if self.disponibles <= 0:
+            raise ValueError(f"Le livre {self.titre} n'est pas disponible")
+        self.disponibles -= 1
+
+    def rendre_exemplaire(self):
+        """
+        Rend un exemplaire emprunté du livre.
+
+        Raises:
+            ValueError: Si aucun exemplaire n'est emprunté.
+        """
+        if self.disponibles >= self.exemplaires:
+            raise ValueError(f"Le livre {self.titre} n'a pas ete emprunter")
+        self.disponibles += 1
 
     def __str__(self):
         return f"Livre(id={self.book_id}, titre='{self.titre}', auteur='{self.auteur.nom}', disponible={self.disponible})"
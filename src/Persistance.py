@@ -0,0 +1,312 @@
+import os
+import pickle
+import threading
+
+from src.Auteur import Auteur
+from src.Bibliotheque import Bibliotheque
+from src.Emprunteur import Emprunteur
+from src.RegistrePrets import Pret
+
+ENTETE_INSTANTANE = b'BIBLIO-INSTANTANE-4\n'
+
+
+class Journal:
+    """
+    Journal des modifications d'une bibliothèque, en ajout seul.
+
+    Chaque modification (ajout de livre, ajout d'emprunteur, emprunt, retour) est écrite à la suite du fichier,
+    avec un numéro de séquence croissant qui n'est pas remis à zéro quand le journal est vidé : un instantané
+    retient le numéro de la dernière modification qu'il contient, et la relecture saute les modifications
+    déjà incluses (par exemple après un arrêt entre l'écriture de l'instantané et le vidage du journal).
+    Les écritures sont synchronisées sur disque (fsync) par lots de taille_lot modifications, ou à l'appel de
+    synchroniser.
+
+    Attributes:
+        chemin (str): Le chemin du fichier journal.
+        taille_lot (int): Le nombre de modifications entre deux synchronisations sur disque.
+        numero (int): Le numéro de séquence de la dernière modification enregistrée.
+    """
+
+    def __init__(self, chemin: str, taille_lot: int = 1000, numero: int = 0):
+        self.chemin = chemin
+        self.taille_lot = taille_lot
+        self.numero = numero
+        self._fichier = open(chemin, 'ab')
+        self._en_attente = 0
+        self._verrou = threading.RLock()
+
+
+    def enregistrer(self, operation: tuple) -> None:
+        """
+        Ajoute une modification à la fin du journal.
+
+        Args:
+            operation (tuple): La modification, par exemple ('emprunt', book_id, id_emprunteur).
+        """
+        with self._verrou:
+            self.numero += 1
+            self._fichier.write(pickle.dumps((self.numero, operation), protocol=pickle.HIGHEST_PROTOCOL))
+            self._en_attente += 1
+            if self._en_attente >= self.taille_lot:
+                self.synchroniser()
+
+
+    def synchroniser(self) -> None:
+        """Écrit les modifications en attente sur disque."""
+        with self._verrou:
+            self._fichier.flush()
+            os.fsync(self._fichier.fileno())
+            self._en_attente = 0
+
+
+    def vider(self) -> None:
+        """Vide le journal (après l'écriture d'un instantané qui contient toutes ses modifications)."""
+        with self._verrou:
+            self._fichier.flush()
+            self._fichier.truncate(0)
+            self.synchroniser()
+
+
+    def fermer(self) -> None:
+        """Synchronise puis ferme le journal."""
+        if not self._fichier.closed:
+            self.synchroniser()
+            self._fichier.close()
+
+
+    @staticmethod
+    def lire(chemin: str, apres: int = 0):
+        """
+        Relit les modifications d'un journal.
+
+        Une fin de fichier tronquée (écriture interrompue par un arrêt brutal) est ignorée.
+
+        Args:
+            chemin (str): Le chemin du fichier journal.
+            apres (int): Seules les modifications de numéro strictement supérieur sont relues (par exemple le
+                numéro retenu par un instantané).
+
+        Yields:
+            tuple: Les modifications, dans l'ordre.
+        """
+        if not os.path.exists(chemin):
+            return
+
+        with open(chemin, 'rb') as fichier:
+            while True:
+                try:
+                    numero, operation = pickle.load(fichier)
+                except (EOFError, pickle.UnpicklingError):
+                    return
+                if numero > apres:
+                    yield operation
+
+
+    @staticmethod
+    def reparer(chemin: str) -> int:
+        """
+        Supprime une éventuelle fin tronquée du journal, pour que les prochaines modifications restent lisibles.
+
+        Args:
+            chemin (str): Le chemin du fichier journal.
+
+        Returns:
+            int: Le numéro de la dernière modification valide du journal (0 s'il est vide ou absent).
+        """
+        if not os.path.exists(chemin):
+            return 0
+
+        numero = 0
+        with open(chemin, 'r+b') as fichier:
+            fin_valide = 0
+            while True:
+                try:
+                    numero, _ = pickle.load(fichier)
+                except (EOFError, pickle.UnpicklingError):
+                    break
+                fin_valide = fichier.tell()
+            fichier.truncate(fin_valide)
+        return numero
+
+
+def sauvegarder_instantane(bibliotheque: Bibliotheque, chemin: str) -> None:
+    """
+    Écrit un instantané binaire de l'état de la bibliothèque.
+
+    Les livres sont écrits en colonnes (identifiants, titres, indices d'auteurs), les emprunts en cours sous
+    forme de listes (book_id, date d'emprunt, échéance) par emprunteur, suivis de l'historique des prêts. Le fichier est écrit à côté puis renommé, de sorte
+    qu'un instantané existant n'est jamais laissé à moitié écrit.
+
+    L'index de recherche et l'arbre BK sont écrits tels quels, pour que le chargement n'ait pas à les
+    reconstruire, ainsi que le numéro de la dernière modification du journal contenue dans l'instantané.
+    Aucune modification ne doit avoir lieu pendant l'écriture (voir point_de_controle).
+
+    Args:
+        bibliotheque (Bibliotheque): La bibliothèque à sauvegarder.
+        chemin (str): Le chemin du fichier instantané.
+    """
+    rangs_auteurs = {auteur_key: rang for rang, auteur_key in enumerate(bibliotheque.auteurs)}
+    prets = bibliotheque.prets
+
+    ids, titres, auteurs_idx, exemplaires = [], [], [], []
+    for book_id, livre in bibliotheque.livres.items():
+        ids.append(book_id)
+        titres.append(livre.titre)
+        auteurs_idx.append(rangs_auteurs[(livre.auteur.nom, livre.auteur.nationalite)])
+        exemplaires.append(livre.exemplaires)
+
+    etat = {
+        'auteurs': list(bibliotheque.auteurs),
+        'livres': (ids, titres, auteurs_idx, exemplaires),
+        'emprunteurs': [
+            (emprunteur.emprunteur_id, emprunteur.nom, [
+                (pret.book_id, pret.date_emprunt, pret.date_echeance)
+                for pret in (prets.en_cours[(book_id, emprunteur.emprunteur_id)] for book_id in emprunteur.emprunts)
+            ])
+            for emprunteur in bibliotheque.emprunteurs.values()
+        ],
+        'historique': (
+            [(pret.book_id, pret.id_emprunteur, pret.date_emprunt, pret.date_echeance, pret.date_retour)
+             for pret in prets.historique],
+            dict(prets.prets_par_livre),
+            dict(prets.prets_par_emprunteur),
+        ),
+        'index': bibliotheque.index,
+        'arbre_bk': bibliotheque.arbre_bk,
+        'journal': 0 if bibliotheque.journal is None else bibliotheque.journal.numero,
+    }
+
+    chemin_temporaire = chemin + '.tmp'
+    with open(chemin_temporaire, 'wb') as fichier:
+        fichier.write(ENTETE_INSTANTANE)
+        pickle.dump(etat, fichier, protocol=pickle.HIGHEST_PROTOCOL)
+        fichier.flush()
+        os.fsync(fichier.fileno())
+    os.replace(chemin_temporaire, chemin)
+
+
+def charger_instantane(chemin: str, catalogue=None) -> tuple:
+    """
+    Reconstruit une bibliothèque à partir d'un instantané.
+
+    Args:
+        chemin (str): Le chemin du fichier instantané.
+        catalogue: Stockage des livres à utiliser (voir Bibliotheque).
+
+    Returns:
+        tuple: (bibliotheque, numero) : la bibliothèque reconstruite (vide si l'instantané n'existe pas) et le
+            numéro de la dernière modification du journal qu'elle contient.
+
+    Raises:
+        ValueError: Si le fichier n'est pas un instantané de bibliothèque.
+    """
+    bibliotheque = Bibliotheque(catalogue=catalogue)
+    if not os.path.exists(chemin):
+        return bibliotheque, 0
+
+    with open(chemin, 'rb') as fichier:
+        if fichier.read(len(ENTETE_INSTANTANE)) != ENTETE_INSTANTANE:
+            raise ValueError(f"{chemin} n'est pas un instantané de bibliothèque")
+        etat = pickle.load(fichier)
+
+    # Index relus : les livres déjà indexés ne sont pas réindexés par ajouter_livres_en_masse
+    bibliotheque.index = etat['index']
+    bibliotheque.arbre_bk = etat['arbre_bk']
+
+    auteurs = etat['auteurs']
+    ids, titres, auteurs_idx, exemplaires = etat['livres']
+    rapport = bibliotheque.ajouter_livres_en_masse(
+        (book_id, titre) + auteurs[rang] + (nombre,)
+        for book_id, titre, rang, nombre in zip(ids, titres, auteurs_idx, exemplaires)
+    )
+    if rapport.nombre_erreurs or len(bibliotheque.index) != len(bibliotheque.livres):
+        raise ValueError(f"Instantané {chemin} invalide : {rapport.erreurs[:10]}")
+
+    for emprunteur_id, nom, emprunts in etat['emprunteurs']:
+        bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id=emprunteur_id, nom=nom))
+        for book_id, date_emprunt, date_echeance in emprunts:
+            bibliotheque.emprunter_livre(book_id, emprunteur_id, date_emprunt, date_echeance)
+
+    historique, prets_par_livre, prets_par_emprunteur = etat['historique']
+    for book_id, id_emprunteur, date_emprunt, date_echeance, date_retour in historique:
+        pret = Pret(book_id, id_emprunteur, date_emprunt, date_echeance)
+        pret.date_retour = date_retour
+        bibliotheque.prets.historique.append(pret)
+    bibliotheque.prets.prets_par_livre.update(prets_par_livre)
+    bibliotheque.prets.prets_par_emprunteur.update(prets_par_emprunteur)
+
+    return bibliotheque, etat['journal']
+
+
+def rejouer_journal(bibliotheque: Bibliotheque, chemin: str, apres: int = 0) -> int:
+    """
+    Applique à la bibliothèque les modifications enregistrées dans un journal.
+
+    Args:
+        bibliotheque (Bibliotheque): La bibliothèque (sans journal attaché pendant la relecture).
+        chemin (str): Le chemin du fichier journal.
+        apres (int): Le numéro de la dernière modification déjà contenue dans la bibliothèque.
+
+    Returns:
+        int: Le nombre de modifications rejouées.
+    """
+    nombre = 0
+    for operation, *arguments in Journal.lire(chemin, apres):
+        if operation == 'livre':
+            book_id, titre, nom, nationalite, exemplaires = arguments
+            bibliotheque.ajouter_livre(book_id, titre, Auteur(nom, nationalite), exemplaires)
+        elif operation == 'exemplaires':
+            bibliotheque.ajouter_exemplaires(*arguments)
+        elif operation == 'emprunteur':
+            bibliotheque.ajouter_emprunteur(Emprunteur(*arguments))
+        elif operation == 'emprunt':
+            bibliotheque.emprunter_livre(*arguments)
+        elif operation == 'retour':
+            bibliotheque.retourner_livre(*arguments)
+        else:
+            raise ValueError(f"Opération de journal inconnue : {operation}")
+        nombre += 1
+    return nombre
+
+
+def restaurer(chemin_instantane: str, chemin_journal: str, catalogue=None, taille_lot: int = 1000) -> Bibliotheque:
+    """
+    Restaure une bibliothèque persistante : charge l'instantané, rejoue le journal puis attache le journal.
+
+    Args:
+        chemin_instantane (str): Le chemin du fichier instantané.
+        chemin_journal (str): Le chemin du fichier journal.
+        catalogue: Stockage des livres à utiliser (voir Bibliotheque).
+        taille_lot (int): Le nombre de modifications entre deux synchronisations du journal.
+
+    Returns:
+        Bibliotheque: La bibliothèque restaurée, dont les modifications suivantes sont journalisées.
+    """
+    bibliotheque, numero = charger_instantane(chemin_instantane, catalogue=catalogue)
+    rejouer_journal(bibliotheque, chemin_journal, apres=numero)
+    # La numérotation reprend après la dernière modification connue, de l'instantané ou du journal
+    numero = max(numero, Journal.reparer(chemin_journal))
+    bibliotheque.journal = Journal(chemin_journal, taille_lot=taille_lot, numero=numero)
+    return bibliotheque
+
+
+def point_de_controle(bibliotheque: Bibliotheque, chemin_instantane: str) -> None:
+    """
+    Écrit un instantané de la bibliothèque puis vide son journal.
+
+    Les modifications sont suspendues pendant l'opération (tous les verrous de la bibliothèque sont pris) :
+    une modification faite entre l'écriture de l'instantané et le vidage du journal serait perdue. Si
+    l'arrêt survient après l'écriture de l'instantané mais avant le vidage, les modifications restées dans
+    le journal portent un numéro déjà couvert par l'instantané et ne sont pas rejouées.
+
+    Args:
+        bibliotheque (Bibliotheque): La bibliothèque persistante.
+        chemin_instantane (str): Le chemin du fichier instantané.
+    """
+    journal = bibliotheque.journal
+    with bibliotheque.verrous.tous():
+        if journal is not None:
+            journal.synchroniser()
+        sauvegarder_instantane(bibliotheque, chemin_instantane)
+        if journal is not None:
+            journal.vider()
@@ -0,0 +1,199 @@
+import csv
+import io
+import json
+
+
+FORMATS = ('texte', 'csv', 'jsonl')
+
+SECTIONS = ('auteurs', 'livres', 'emprunteurs')
+
+# Colonnes du format csv, communes aux trois types d'enregistrement
+COLONNES_CSV = ('type', 'id', 'nom', 'auteur', 'nationalite', 'disponibles', 'exemplaires', 'livres')
+
+
+def est_emprunte(livre) -> bool:
+    """Filtre de livres : au moins un exemplaire du livre est emprunté."""
+    return livre.disponibles < livre.exemplaires
+
+
+def est_disponible(livre) -> bool:
+    """Filtre de livres : au moins un exemplaire du livre est disponible."""
+    return livre.disponibles > 0
+
+
+def a_des_emprunts(emprunteur) -> bool:
+    """Filtre d'emprunteurs : l'emprunteur a au moins un livre emprunté."""
+    return bool(emprunteur.emprunts)
+
+
+class Rapport:
+    """
+    Écrit l'inventaire d'une bibliothèque (auteurs et leurs œuvres, livres, emprunteurs et leurs emprunts)
+    dans un fichier texte quelconque (fichier, sys.stdout, io.StringIO, etc.).
+
+    Chaque collection est parcourue une seule fois et les lignes sont accumulées dans un tampon vidé dans
+    la sortie dès qu'il dépasse taille_tampon caractères : la mémoire utilisée ne dépend pas de la taille
+    du catalogue et la sortie ne reçoit qu'un appel à write par tampon.
+
+    Formats :
+        - texte : inventaire lisible, celui de print_info_console.
+        - csv : une ligne par enregistrement, colonnes COLONNES_CSV (livres : identifiants séparés par ';').
+        - jsonl : un objet JSON par ligne, avec un champ type ('auteur', 'livre' ou 'emprunteur').
+
+    Attributes:
+        sortie: L'objet fichier dans lequel écrire (doit avoir une méthode write).
+        format (str): Le format du rapport, parmi FORMATS.
+        sections (tuple): Les sections à écrire, parmi SECTIONS, dans cet ordre.
+        filtre_livre (callable): Prédicat sur les livres (par exemple est_emprunte) ; les livres refusés
+            n'apparaissent ni dans la section des livres, ni dans les œuvres, ni dans les emprunts.
+        filtre_emprunteur (callable): Prédicat sur les emprunteurs (par exemple a_des_emprunts).
+        taille_tampon (int): Le nombre de caractères accumulés avant chaque écriture dans la sortie.
+    """
+
+    def __init__(self, sortie, format: str = 'texte', sections=SECTIONS, filtre_livre=None,
+                 filtre_emprunteur=None, taille_tampon: int = 64 * 1024):
+        if format not in FORMATS:
+            raise ValueError(f"Le format doit être parmi {', '.join(FORMATS)}")
+        inconnues = [section for section in sections if section not in SECTIONS]
+        if inconnues:
+            raise ValueError(f"Section(s) inconnue(s) : {', '.join(inconnues)}")
+
+        self.sortie = sortie
+        self.format = format
+        self.sections = tuple(sections)
+        self.filtre_livre = filtre_livre
+        self.filtre_emprunteur = filtre_emprunteur
+        self.taille_tampon = taille_tampon
+        self._tampon = io.StringIO()
+        self._csv = csv.writer(self._tampon, lineterminator='\n')
+        # Un seul encodeur pour tout le rapport (json.dumps avec options en recrée un à chaque appel)
+        self._json = json.JSONEncoder(ensure_ascii=False).encode
+
+
+    def ecrire(self, bibliotheque) -> int:
+        """
+        Écrit le rapport de la bibliothèque dans la sortie.
+
+        Args:
+            bibliotheque (Bibliotheque): La bibliothèque dont écrire l'inventaire.
+
+        Returns:
+            int: Le nombre d'enregistrements (auteurs, livres et emprunteurs) écrits.
+        """
+        if self.format == 'csv':
+            self._csv.writerow(COLONNES_CSV)
+
+        nombre = 0
+        for section in self.sections:
+            if section == 'auteurs':
+                nombre += self._ecrire_auteurs(bibliotheque.auteurs.values())
+            elif section == 'livres':
+                nombre += self._ecrire_livres(bibliotheque.livres.values())
+            else:
+                nombre += self._ecrire_emprunteurs(bibliotheque.emprunteurs.values())
+
+        if self.format == 'texte':
+            self._tampon.write('-------------------fin-------------------\n')
+        self._vider()
+        return nombre
+
+
+    def _livres(self, livres):
+        """Retourne les livres qui passent le filtre de livres."""
+        return livres if self.filtre_livre is None else filter(self.filtre_livre, livres)
+
+
+    def _ecrire_auteurs(self, auteurs) -> int:
+        tampon = self._tampon
+        texte = self.format == 'texte'
+        if texte:
+            tampon.write("Auteurs dans la bibliothèque:\n")
+
+        nombre = 0
+        for auteur in auteurs:
+            oeuvres = self._livres(auteur.oeuvres)
+            if texte:
+                tampon.write(f"- {auteur.nom} ({auteur.nationalite})\n")
+                for oeuvre in oeuvres:
+                    tampon.write(f"  * {oeuvre.titre}\n")
+            elif self.format == 'csv':
+                self._csv.writerow(('auteur', '', auteur.nom, '', auteur.nationalite, '', '',
+                                    ';'.join(oeuvre.book_id for oeuvre in oeuvres)))
+            else:
+                tampon.write(self._json({'type': 'auteur', 'nom': auteur.nom, 'nationalite': auteur.nationalite,
+                                         'oeuvres': [oeuvre.book_id for oeuvre in oeuvres]}))
+                tampon.write('\n')
+            nombre += 1
+            self._vider_si_plein()
+
+        if texte:
+            tampon.write('\n')
+        return nombre
+
+
+    def _ecrire_livres(self, livres) -> int:
+        tampon = self._tampon
+        texte = self.format == 'texte'
+        if texte:
+            tampon.write("Livres dans la bibliothèque:\n")
+
+        nombre = 0
+        for livre in self._livres(livres):
+            if texte:
+                tampon.write(f"- {livre.titre} (ID: {livre.book_id}) (DISPONIBLE: {livre.disponible}"
+                             f" - {livre.disponibles}/{livre.exemplaires} exemplaires)\n")
+            elif self.format == 'csv':
+                self._csv.writerow(('livre', livre.book_id, livre.titre, livre.auteur.nom,
+                                    livre.auteur.nationalite, livre.disponibles, livre.exemplaires, ''))
+            else:
+                tampon.write(self._json({'type': 'livre', 'book_id': livre.book_id, 'titre': livre.titre,
+                                         'auteur': livre.auteur.nom, 'nationalite': livre.auteur.nationalite,
+                                         'disponibles': livre.disponibles, 'exemplaires': livre.exemplaires}))
+                tampon.write('\n')
+            nombre += 1
+            self._vider_si_plein()
+
+        if texte:
+            tampon.write('\n')
+        return nombre
+
+
+    def _ecrire_emprunteurs(self, emprunteurs) -> int:
+        tampon = self._tampon
+        texte = self.format == 'texte'
+        if texte:
+            tampon.write("Emprunteur:\n")
+        if self.filtre_emprunteur is not None:
+            emprunteurs = filter(self.filtre_emprunteur, emprunteurs)
+
+        nombre = 0
+        for emprunteur in emprunteurs:
+            livres = self._livres(emprunteur.livres_empruntes)
+            if texte:
+                tampon.write(f"- {emprunteur.nom} (ID: {emprunteur.emprunteur_id})\n")
+                for livre in livres:
+                    tampon.write(f"  * {livre.titre}\n")
+            elif self.format == 'csv':
+                self._csv.writerow(('emprunteur', emprunteur.emprunteur_id, emprunteur.nom, '', '', '', '',
+                                    ';'.join(livre.book_id for livre in livres)))
+            else:
+                tampon.write(self._json({'type': 'emprunteur', 'emprunteur_id': emprunteur.emprunteur_id,
+                                         'nom': emprunteur.nom, 'livres': [livre.book_id for livre in livres]}))
+                tampon.write('\n')
+            nombre += 1
+            self._vider_si_plein()
+        return nombre
+
+
+    def _vider_si_plein(self) -> None:
+        if self._tampon.tell() >= self.taille_tampon:
+            self._vider()
+
+
+    def _vider(self) -> None:
+        """Écrit le contenu du tampon dans la sortie et le remet à zéro."""
+        contenu = self._tampon.getvalue()
+        if contenu:
+            self.sortie.write(contenu)
+            self._tampon.seek(0)
+            self._tampon.truncate()
@@ -0,0 +1,191 @@
+import heapq
+import threading
+from collections import Counter, deque
+from datetime import datetime, timedelta
+
+
+class Pret:
+    """
+    Représente le prêt d'un livre à un emprunteur.
+
+    Attributes:
+        book_id (str): L'identifiant du livre prêté.
+        id_emprunteur (str): L'identifiant de l'emprunteur.
+        date_emprunt (datetime): La date de l'emprunt.
+        date_echeance (datetime): La date à laquelle le livre doit être retourné.
+        date_retour (datetime): La date du retour (None tant que le livre n'est pas retourné).
+    """
+
+    __slots__ = ('book_id', 'id_emprunteur', 'date_emprunt', 'date_echeance', 'date_retour')
+
+    def __init__(self, book_id: str, id_emprunteur: str, date_emprunt: datetime, date_echeance: datetime):
+        self.book_id = book_id
+        self.id_emprunteur = id_emprunteur
+        self.date_emprunt = date_emprunt
+        self.date_echeance = date_echeance
+        self.date_retour = None
+
+    def __str__(self):
+        return (f"Pret(book_id={self.book_id}, id_emprunteur={self.id_emprunteur}, "
+                f"echeance={self.date_echeance:%Y-%m-%d}, retour={self.date_retour})")
+
+
+class RegistrePrets:
+    """
+    Registre des prêts d'une bibliothèque : prêts en cours, échéances et historique.
+
+    Un livre pouvant avoir plusieurs exemplaires, chaque prêt en cours est indexé par (book_id, id de
+    l'emprunteur) : un emprunteur ne détient qu'un exemplaire d'un même livre. On sait ainsi en O(1) qui
+    détient un livre et si un retour est fait par un emprunteur du livre. Les échéances sont rangées dans
+    un tas, de sorte que les prêts en retard sont trouvés sans parcourir tous les prêts. L'historique
+    détaillé ne garde que les taille_historique derniers retours ; les plus anciens ne subsistent que dans
+    les compteurs.
+
+    Attributes:
+        en_cours (dict): Dictionnaire (book_id, id de l'emprunteur) -> Pret en cours.
+        detenteurs (dict): Dictionnaire book_id -> ensemble des id des emprunteurs qui détiennent un exemplaire.
+        historique (deque): Les derniers prêts terminés, du plus ancien au plus récent.
+        prets_par_livre (Counter): Le nombre de prêts terminés de chaque livre.
+        prets_par_emprunteur (Counter): Le nombre de prêts terminés de chaque emprunteur.
+    """
+
+    DUREE_PRET = timedelta(days=21)
+
+    def __init__(self, taille_historique: int = 100_000):
+        self.en_cours = {}
+        self.detenteurs = {}
+        self.historique = deque(maxlen=taille_historique)
+        self.prets_par_livre = Counter()
+        self.prets_par_emprunteur = Counter()
+        self._echeances = []
+        self._sequence = 0
+        self._perimees = 0
+        # Bibliotheque n'appelle le registre que sous le verrou du livre : le tas, les compteurs et le numéro
+        # de séquence, partagés entre livres, sont protégés par ce verrou.
+        self._verrou = threading.Lock()
+
+
+    def enregistrer_emprunt(self, book_id: str, id_emprunteur: str, date_emprunt: datetime = None,
+                            date_echeance: datetime = None) -> Pret:
+        """
+        Enregistre l'emprunt d'un livre.
+
+        Args:
+            book_id (str): L'identifiant du livre.
+            id_emprunteur (str): L'identifiant de l'emprunteur.
+            date_emprunt (datetime): La date de l'emprunt (maintenant par défaut).
+            date_echeance (datetime): La date de retour prévue (date_emprunt + DUREE_PRET par défaut).
+
+        Returns:
+            Pret: Le prêt créé.
+
+        Raises:
+            ValueError: Si l'emprunteur détient déjà un exemplaire du livre.
+        """
+        cle = (book_id, id_emprunteur)
+        if date_emprunt is None:
+            date_emprunt = datetime.now()
+        if date_echeance is None:
+            date_echeance = date_emprunt + self.DUREE_PRET
+
+        with self._verrou:
+            if cle in self.en_cours:
+                raise ValueError(f"Le livre {book_id} est déjà emprunté par {id_emprunteur}")
+
+            pret = Pret(book_id, id_emprunteur, date_emprunt, date_echeance)
+            self.en_cours[cle] = pret
+            self.detenteurs.setdefault(book_id, set()).add(id_emprunteur)
+            self._sequence += 1
+            heapq.heappush(self._echeances, (date_echeance, self._sequence, pret))
+        return pret
+
+
+    def enregistrer_retour(self, book_id: str, id_emprunteur: str, date_retour: datetime = None) -> Pret:
+        """
+        Enregistre le retour d'un livre par son emprunteur et l'ajoute à l'historique.
+
+        Returns:
+            Pret: Le prêt terminé.
+
+        Raises:
+            ValueError: Si le livre n'est pas emprunté par cet emprunteur.
+        """
+        if date_retour is None:
+            date_retour = datetime.now()
+
+        with self._verrou:
+            pret = self.en_cours.pop((book_id, id_emprunteur), None)
+            if pret is None:
+                raise ValueError(f"Le livre {book_id} n'est pas emprunté par {id_emprunteur}")
+
+            detenteurs = self.detenteurs[book_id]
+            detenteurs.discard(id_emprunteur)
+            if not detenteurs:
+                del self.detenteurs[book_id]
+
+            pret.date_retour = date_retour
+
+            self.historique.append(pret)
+            self.prets_par_livre[book_id] += 1
+            self.prets_par_emprunteur[id_emprunteur] += 1
+
+            # L'entrée du tas est laissée en place et ignorée ; le tas est reconstruit quand elles dominent
+            self._perimees += 1
+            if self._perimees > 1024 and self._perimees > len(self._echeances) // 2:
+                self._echeances = [entree for entree in self._echeances if entree[2].date_retour is None]
+                heapq.heapify(self._echeances)
+                self._perimees = 0
+
+        return pret
+
+
+    def detenteurs_livre(self, book_id: str):
+        """Retourne l'ensemble des id des emprunteurs qui détiennent un exemplaire du livre."""
+        return self.detenteurs.get(book_id, set())
+
+
+    def pret(self, book_id: str, id_emprunteur: str):
+        """Retourne le prêt en cours du livre à cet emprunteur, ou None."""
+        return self.en_cours.get((book_id, id_emprunteur))
+
+
+    def en_retard(self, maintenant: datetime = None):
+        """
+        Retourne les prêts en cours dont l'échéance est dépassée.
+
+        Seuls les nœuds du tas dont l'échéance est dépassée sont visités : le coût dépend du nombre de
+        prêts en retard et non du nombre total de prêts.
+
+        Args:
+            maintenant (datetime): La date de référence (maintenant par défaut).
+
+        Returns:
+            list: Les prêts en retard, du plus ancien au plus récent selon l'échéance.
+        """
+        if maintenant is None:
+            maintenant = datetime.now()
+
+        resultat = []
+        with self._verrou:
+            echeances = self._echeances
+            a_visiter = [0] if echeances else []
+            while a_visiter:
+                i = a_visiter.pop()
+                date_echeance, sequence, pret = echeances[i]
+                # Les enfants d'un nœud du tas ont une échéance plus tardive : on arrête la descente ici
+                if date_echeance >= maintenant:
+                    continue
+                if pret.date_retour is None:
+                    resultat.append((date_echeance, sequence, pret))
+                a_visiter.extend(enfant for enfant in (2 * i + 1, 2 * i + 2) if enfant < len(echeances))
+
+        resultat.sort()
+        return [pret for _, _, pret in resultat]
+
+
+    def __contains__(self, book_id) -> bool:
+        return book_id in self.detenteurs
+
+
+    def __len__(self):
+        return len(self.en_cours)
@@ -0,0 +1,47 @@
+import threading
+from contextlib import contextmanager
+
+
+class VerrousParLivre:
+    """
+    Verrous répartis par livre pour les emprunts et les retours concurrents.
+
+    Chaque book_id est associé, par hachage, à l'un des nombre_verrous verrous. Deux opérations sur le même
+    livre sont donc toujours sérialisées, alors que des opérations sur des livres différents ne se bloquent
+    que rarement (quand leurs book_id tombent sur le même verrou), sans un verrou par livre en mémoire.
+
+    Toute modification journalisée de la bibliothèque (ajout de livre ou d'emprunteur, exemplaires, emprunt,
+    retour) est faite sous le verrou de son identifiant : en les prenant tous, point_de_controle suspend les
+    modifications le temps d'écrire l'instantané et de vider le journal.
+
+    Attributes:
+        nombre_verrous (int): Le nombre de verrous.
+    """
+
+    def __init__(self, nombre_verrous: int = 256):
+        if not isinstance(nombre_verrous, int) or nombre_verrous < 1:
+            raise ValueError("Le nombre de verrous doit être un entier positif")
+
+        self.nombre_verrous = nombre_verrous
+        self._verrous = [threading.Lock() for _ in range(nombre_verrous)]
+
+
+    def verrou(self, book_id: str) -> threading.Lock:
+        """Retourne le verrou qui protège le livre book_id."""
+        return self._verrous[hash(book_id) % self.nombre_verrous]
+
+
+    @contextmanager
+    def tous(self):
+        """
+        Prend tous les verrous, dans l'ordre, le temps du bloc with.
+
+        Les autres opérations ne prennent qu'un verrou à la fois : l'ordre fixe exclut tout interblocage.
+        """
+        for verrou in self._verrous:
+            verrou.acquire()
+        try:
+            yield
+        finally:
+            for verrou in reversed(self._verrous):
+                verrou.release()
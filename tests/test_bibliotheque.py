@@ -1,8 +1,29 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
+from datetime import datetime, timedelta
+from src.ArbreBK import distance_levenshtein
+from src.AsyncBibliotheque import AsyncBibliotheque
 from src.Auteur import Auteur
 from src.Livre import Livre
 from src.Bibliotheque import Bibliotheque
+from src.BibliothequeRepartie import BibliothequeRepartie
+from src.CacheRecherche import CacheRecherche
+from src.CatalogueColonnes import CatalogueColonnes, OeuvresColonnes
+from src.CatalogueLectureSeule import CatalogueLectureSeule, ecrire_catalogue
 from src.Emprunteur import Emprunteur
+from src.ImportCatalogue import lire_csv, lire_jsonl
+from src.IndexRecherche import plier
+from src.Instrumentation import ExportateurPrometheus, journaliser_erreur
+from src.Persistance import Journal, point_de_controle, restaurer, sauvegarder_instantane
+from src.Rapport import a_des_emprunts, est_emprunte
+from src.RegistrePrets import RegistrePrets
 
 
 class TestBibliothequeMethods(unittest.TestCase):
@@ -78,6 +99,99 @@ class TestBibliothequeMethods(unittest.TestCase):
         with self.assertRaises(ValueError, msg=f"Un livre avec le meme ID '1' devrait declancher une erreur"):
             self.bibliotheque.ajouter_livre(book_id='1', titre="Amos daragon tome 1", auteur=auteur1)  # Livre déjà ajoute
 
+    def test_oeuvres_auteur_par_titre(self):
+        """
+        Teste l'index des œuvres par titre de l'auteur.
+
+        Vérifications :
+        - Qu'un titre ajouté est détecté par possede_oeuvre et retrouvé par obtenir_oeuvre.
+        - Que le premier livre portant un titre reste l'œuvre associée à ce titre.
+        - Qu'un titre inconnu n'est pas trouvé.
+        """
+
+        auteur = Auteur('Julien', 'Canadien')
+        self.bibliotheque.ajouter_livre(book_id='1', titre="Amos daragon tome 1", auteur=auteur)
+        self.bibliotheque.ajouter_livre(book_id='2', titre="Amos daragon tome 1", auteur=auteur)
+
+        self.assertTrue(auteur.possede_oeuvre("Amos daragon tome 1"))
+        self.assertIs(auteur.obtenir_oeuvre("Amos daragon tome 1"), self.bibliotheque.livres['1'])
+        self.assertFalse(auteur.possede_oeuvre("Amos daragon tome 2"))
+        self.assertIsNone(auteur.obtenir_oeuvre("Amos daragon tome 2"))
+
+
+    def test_ajouter_livres_en_masse(self):
+        """
+        Teste l'importation en masse depuis des tuples, un fichier CSV et un fichier JSONL.
+
+        Vérifications :
+        - Que les lignes valides sont ajoutées et que chaque auteur n'est créé qu'une seule fois.
+        - Que les lignes invalides (ID en double, champ manquant, JSON invalide) sont consignées dans le rapport
+          sans interrompre l'importation, avec le numéro de leur ligne dans le fichier (lignes vides comprises).
+        - Que les livres importés sont trouvés par rechercher_livre.
+        """
+
+        rapport = self.bibliotheque.ajouter_livres_en_masse([
+            ('1', "Amos daragon tome 1", 'Julien', 'Canadien'),
+            ('2', "Amos daragon tome 1", 'Julien', 'Canadien'),
+            ('1', "Doublon", 'Julien', 'Canadien'),
+            ('3', "Sans nationalite", 'Julien'),
+        ], taille_lot=2)
+
+        self.assertEqual((rapport.lignes_lues, rapport.livres_ajoutes, rapport.nombre_erreurs), (4, 2, 2))
+        self.assertEqual([numero for numero, _ in rapport.erreurs], [3, 4])
+        self.assertEqual(len(self.bibliotheque.auteurs[('Julien', 'Canadien')].oeuvres), 1)
+
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin_csv = os.path.join(dossier, 'catalogue.csv')
+            with open(chemin_csv, 'w', encoding='utf-8', newline='') as fichier:
+                fichier.write("book_id,titre,auteur,nationalite\n4,La construction pour les nulls,Alexandre,Canadien\n")
+
+            chemin_jsonl = os.path.join(dossier, 'catalogue.jsonl')
+            with open(chemin_jsonl, 'w', encoding='utf-8') as fichier:
+                fichier.write('{"book_id": "5", "titre": "Les Misérables", "auteur": "Victor Hugo", "nationalite": "Française"}\n')
+                fichier.write('\n')
+                fichier.write('{"book_id": "6", \n')
+
+            rapport_csv = self.bibliotheque.ajouter_livres_en_masse(lire_csv(chemin_csv))
+            rapport_jsonl = self.bibliotheque.ajouter_livres_en_masse(lire_jsonl(chemin_jsonl))
+
+        self.assertEqual((rapport_csv.livres_ajoutes, rapport_csv.nombre_erreurs), (1, 0))
+        self.assertEqual((rapport_jsonl.lignes_lues, rapport_jsonl.livres_ajoutes, rapport_jsonl.nombre_erreurs), (2, 1, 1))
+        self.assertEqual(rapport_jsonl.erreurs[0][0], 3, "Le numéro d'erreur devrait être celui de la ligne du fichier.")
+        self.assertIn("ligne 3", rapport_jsonl.erreurs[0][1])
+        self.assertIs(self.bibliotheque.livres['4'].auteur, self.bibliotheque.auteurs[('Alexandre', 'Canadien')])
+        self.assertIn('5', self.bibliotheque.rechercher_livre('misérables'))
+
+        # Nombre d'exemplaires : entier ou chaîne d'entier seulement, pas de troncature ni de booléen
+        rapport = self.bibliotheque.ajouter_livres_en_masse([
+            {'book_id': '7', 'titre': "Tome 7", 'auteur': 'Julien', 'nationalite': 'Canadien', 'exemplaires': 2.9},
+            {'book_id': '8', 'titre': "Tome 8", 'auteur': 'Julien', 'nationalite': 'Canadien', 'exemplaires': True},
+            {'book_id': '9', 'titre': "Tome 9", 'auteur': 'Julien', 'nationalite': 'Canadien', 'exemplaires': 0},
+            ('10', "Tome 10", 'Julien', 'Canadien', '2'),
+            {'book_id': '11', 'titre': "Tome 11", 'auteur': 'Julien', 'nationalite': 'Canadien', 'exemplaires': ''},
+        ])
+        self.assertEqual([numero for numero, _ in rapport.erreurs], [1, 2, 3])
+        self.assertEqual((self.bibliotheque.livres['10'].exemplaires, self.bibliotheque.livres['11'].exemplaires), (2, 1))
+
+
+    def test_objets_sans_dict(self):
+        """
+        Teste que Livre, Auteur et Emprunteur n'ont pas de __dict__ par instance et gardent leur validation.
+        """
+
+        auteur = Auteur('Julien', 'Canadien')
+        livre = Livre(book_id='1', titre="Amos daragon tome 1", auteur=auteur)
+        emprunteur = Emprunteur(emprunteur_id='1', nom='Luc')
+
+        for objet in (auteur, livre, emprunteur):
+            self.assertFalse(hasattr(objet, '__dict__'), f"{type(objet).__name__} ne devrait pas avoir de __dict__.")
+
+        self.assertEqual(str(livre), "Livre(id=1, titre='Amos daragon tome 1', auteur='Julien', disponible=True)")
+
+        with self.assertRaises(ValueError):
+            Livre(book_id='2', titre="Titre", auteur='Julien')
+
+
     def test_rechercher_livre(self):
         """
         Teste la méthode rechercher_livre pour valider les résultats de recherche de livres.
@@ -128,6 +242,505 @@ class TestBibliothequeMethods(unittest.TestCase):
             self.bibliotheque.rechercher_livre("Non Existant Book")
 
 
+    def test_rechercher_livre_index(self):
+        """
+        Teste que l'index inversé de rechercher_livre retourne exactement les mêmes livres qu'un parcours complet.
+
+        Étapes :
+        1. Ajoute des livres avec des titres et des auteurs variés (accents, majuscules, textes plus courts
+           qu'un trigramme).
+        2. Pour plusieurs recherches (courtes, longues, vides), compare le résultat de rechercher_livre,
+           avec et sans accents, avec un filtrage par sous-chaîne sur tous les livres.
+        """
+
+        auteur1 = Auteur('Julien', 'Canadien')
+        auteur2 = Auteur('Émilie Dupré', 'Française')
+        self.bibliotheque.ajouter_livre(book_id='1', titre="Amos Daragon tome 1", auteur=auteur1)
+        self.bibliotheque.ajouter_livre(book_id='2', titre="Amos Daragon tome 2", auteur=auteur2)
+        self.bibliotheque.ajouter_livre(book_id='3', titre="Les Misérables", auteur=auteur2)
+        self.bibliotheque.ajouter_livre(book_id='4', titre="La construction pour les nulls", auteur=auteur1)
+        self.bibliotheque.ajouter_livre(book_id='5', titre="Io", auteur=Auteur('Yu', 'Chinoise'))
+
+        recherches = ['', 'a', 'AM', 'tom', 'tome ', 'Daragon tome 2', 'émi', 'MISÉRABLES', 'ju', 'aaaa',
+                      'io', 'u', 'yu', 'Yui', 'emi', 'miserables', 'é']
+        for sans_accents, normaliser in ((False, str.lower), (True, plier)):
+            for recherche in recherches:
+                attendu = [
+                    book_id for book_id, livre in self.bibliotheque.livres.items()
+                    if normaliser(recherche) in normaliser(livre.titre)
+                    or normaliser(recherche) in normaliser(livre.auteur.nom)
+                ]
+                if attendu:
+                    resultat = self.bibliotheque.rechercher_livre(recherche, sans_accents)
+                    self.assertEqual(list(resultat), attendu, f"Résultat incorrect pour la recherche '{recherche}'.")
+                else:
+                    with self.assertRaises(ValueError):
+                        self.bibliotheque.rechercher_livre(recherche, sans_accents)
+
+
+    def test_rechercher_livre_classe(self):
+        """
+        Teste la recherche classée et paginée.
+
+        Vérifications :
+        - L'ordre de pertinence : titre exact, préfixe du titre, sous-chaîne du titre, puis nom de l'auteur.
+        - Que limite et decalage découpent la liste complète des résultats classés.
+        - Qu'une recherche sans résultat produit un générateur vide et contient les mêmes livres que rechercher_livre.
+        - Que les paramètres invalides sont refusés dès l'appel, avant toute itération.
+        - Qu'un titre vide est classé en premier pour la recherche vide, comme un titre exact.
+        """
+
+        auteur1 = Auteur('Paul Tomeau', 'Français')
+        auteur2 = Auteur('Julien', 'Canadien')
+        self.bibliotheque.ajouter_livre(book_id='1', titre="Le tome perdu", auteur=auteur1)
+        self.bibliotheque.ajouter_livre(book_id='2', titre="Tome 2", auteur=auteur2)
+        self.bibliotheque.ajouter_livre(book_id='3', titre="Amos", auteur=auteur1)
+        self.bibliotheque.ajouter_livre(book_id='4', titre="tome", auteur=auteur2)
+        self.bibliotheque.ajouter_livre(book_id='5', titre="Tomes choisis", auteur=auteur2)
+        self.bibliotheque.ajouter_livre(book_id='6', titre="Un tome", auteur=auteur2)
+
+        classes = [livre.book_id for livre in self.bibliotheque.rechercher_livre_classe('Tome')]
+        self.assertEqual(classes, ['4', '2', '5', '1', '6', '3'])
+        self.assertEqual(sorted(classes), sorted(self.bibliotheque.rechercher_livre('Tome')))
+
+        for decalage in range(7):
+            for limite in range(4):
+                page = self.bibliotheque.rechercher_livre_classe('tome', limite=limite, decalage=decalage)
+                self.assertEqual([livre.book_id for livre in page], classes[decalage:decalage + limite])
+
+        self.assertEqual([livre.book_id for livre in self.bibliotheque.rechercher_livre_classe('', limite=2)], ['1', '2'])
+        self.assertEqual(list(self.bibliotheque.rechercher_livre_classe('aaaa')), [])
+        for parametres in ({'decalage': -1}, {'limite': -1}, {'limite': 1.5}, {'decalage': True}):
+            with self.assertRaises(ValueError):
+                self.bibliotheque.rechercher_livre_classe('tome', **parametres)
+        with self.assertRaises(TypeError):
+            self.bibliotheque.rechercher_livre_classe(None)
+        with self.assertRaises(TypeError):
+            self.bibliotheque.rechercher_livre_classe('tome', sans_accents='oui')
+
+        self.bibliotheque.ajouter_livre(book_id='7', titre="", auteur=auteur2)
+        self.assertEqual([livre.book_id for livre in self.bibliotheque.rechercher_livre_classe('', limite=3)],
+                         ['7', '1', '2'])
+
+
+    def test_rechercher_livre_sans_accents(self):
+        """
+        Teste la recherche insensible aux accents et aux ligatures.
+
+        Vérifications :
+        - Que « oeuvre », « etudiant » et « CAFE » trouvent « Œuvres », « Étudiant » et « café ».
+        - Que la recherche par défaut reste sensible aux accents.
+        - Que la recherche classée accepte aussi le mode sans accents.
+        """
+
+        auteur = Auteur('Émilie Dupré', 'Française')
+        self.bibliotheque.ajouter_livre(book_id='1', titre="Œuvres complètes", auteur=auteur)
+        self.bibliotheque.ajouter_livre(book_id='2', titre="L'Étudiant étranger", auteur=auteur)
+        self.bibliotheque.ajouter_livre(book_id='3', titre="Le café de Ærø", auteur=Auteur('Julien', 'Canadien'))
+
+        self.assertEqual(list(self.bibliotheque.rechercher_livre('oeuvre', sans_accents=True)), ['1'])
+        self.assertEqual(list(self.bibliotheque.rechercher_livre('etudiant', sans_accents=True)), ['2'])
+        self.assertEqual(list(self.bibliotheque.rechercher_livre('CAFE DE AERO', sans_accents=True)), ['3'])
+        self.assertEqual(list(self.bibliotheque.rechercher_livre('emilie dupre', sans_accents=True)), ['1', '2'])
+        self.assertEqual(list(self.bibliotheque.rechercher_livre('Étudiant', sans_accents=True)), ['2'])
+
+        with self.assertRaises(ValueError, msg="La recherche par défaut devrait rester sensible aux accents."):
+            self.bibliotheque.rechercher_livre('etudiant')
+
+        classes = self.bibliotheque.rechercher_livre_classe('oeuvres completes', sans_accents=True)
+        self.assertEqual([livre.book_id for livre in classes], ['1'])
+
+
+    def test_rechercher_livre_approx(self):
+        """
+        Teste la recherche approximative (fautes de frappe) par titre et par auteur.
+
+        Vérifications :
+        - Qu'un nom d'auteur mal tapé (« Juline ») trouve les livres de l'auteur « Julien ».
+        - Que les résultats sont classés du plus proche au plus éloigné et que tous les mots doivent correspondre.
+        - Que les numéros ne correspondent qu'exactement et qu'une recherche sans résultat lève une erreur.
+        - Que l'arbre BK trouve les mêmes mots qu'une comparaison avec tous les mots.
+        """
+
+        julien = Auteur('Julien', 'Canadien')
+        self.bibliotheque.ajouter_livre(book_id='1', titre="Amos Daragon tome 1", auteur=julien)
+        self.bibliotheque.ajouter_livre(book_id='2', titre="Amos Daragon tome 2", auteur=julien)
+        self.bibliotheque.ajouter_livre(book_id='3', titre="Les Misérables", auteur=Auteur('Victor Hugo', 'Français'))
+        self.bibliotheque.ajouter_livre(book_id='4', titre="Amis d'enfance", auteur=Auteur('Juliette', 'Française'))
+
+        self.assertEqual(list(self.bibliotheque.rechercher_livre_approx('Juline')), ['1', '2'])
+        self.assertEqual(list(self.bibliotheque.rechercher_livre_approx('miserabels')), ['3'])
+        self.assertEqual(list(self.bibliotheque.rechercher_livre_approx('Amos Daragn tome 2')), ['2'])
+        self.assertEqual(list(self.bibliotheque.rechercher_livre_approx('amis')), ['4', '1', '2'])
+        self.assertEqual(list(self.bibliotheque.rechercher_livre_approx('amis', distance_max=0)), ['4'])
+
+        with self.assertRaises(ValueError, msg="Une recherche sans livre proche devrait déclencher une erreur."):
+            self.bibliotheque.rechercher_livre_approx('Daragon tome 3')
+
+        arbre = self.bibliotheque.arbre_bk
+        for mot in ['julien', 'daragone', 'hugo', 'mis', 'xyz']:
+            attendu = sorted((distance_levenshtein(mot, terme), terme) for terme in arbre.valeurs
+                             if not terme.isdigit() and distance_levenshtein(mot, terme) <= 2)
+            self.assertEqual(arbre.rechercher(mot, 2), attendu, f"Résultat incorrect pour le mot '{mot}'.")
+
+
+    def test_cache_recherche(self):
+        """
+        Teste le cache des résultats de rechercher_livre.
+
+        Vérifications :
+        - Qu'une recherche répétée (même recherche normalisée) est servie par le cache.
+        - Qu'un ajout de livre n'invalide que les recherches que le livre satisfait.
+        - Qu'un emprunt ne vide pas le cache et que la disponibilité retournée reste à jour.
+        - L'éviction de l'entrée la moins récemment utilisée et l'expiration des entrées.
+        """
+
+        auteur = Auteur('Julien', 'Canadien')
+        self.bibliotheque.ajouter_livre(book_id='1', titre="Amos Daragon tome 1", auteur=auteur)
+        self.bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id='1', nom='Luc'))
+        cache = self.bibliotheque.cache
+
+        self.bibliotheque.rechercher_livre('amos')
+        self.bibliotheque.rechercher_livre('AMOS')
+        self.bibliotheque.rechercher_livre('julien')
+        self.assertEqual((cache.succes, cache.echecs), (1, 2))
+
+        self.bibliotheque.emprunter_livre('1', '1')
+        self.assertFalse(self.bibliotheque.rechercher_livre('amos')['1'].disponible)
+        self.assertEqual((cache.succes, len(cache)), (2, 2))
+
+        self.bibliotheque.ajouter_livre(book_id='2', titre="Amos Daragon tome 2", auteur=Auteur('Bryan', 'Canadien'))
+        self.assertEqual(cache.invalidations, 1, "Seule la recherche 'amos' devrait être invalidée.")
+        self.assertEqual(list(self.bibliotheque.rechercher_livre('amos')), ['1', '2'])
+        self.assertEqual(list(self.bibliotheque.rechercher_livre('julien')), ['1'])
+        self.assertEqual(cache.succes, 3)
+
+        maintenant = [0.0]
+        petit_cache = CacheRecherche(taille_max=2, duree_vie=10, horloge=lambda: maintenant[0])
+        petit_cache.enregistrer((False, 'a'), ['1'])
+        petit_cache.enregistrer((False, 'b'), ['2'])
+        petit_cache.obtenir((False, 'a'))
+        petit_cache.enregistrer((False, 'c'), ['3'])
+        self.assertIsNone(petit_cache.obtenir((False, 'b')), "L'entrée la moins récemment utilisée devrait être évincée.")
+        self.assertEqual(petit_cache.obtenir((False, 'a')), ('1',))
+        maintenant[0] = 10
+        self.assertIsNone(petit_cache.obtenir((False, 'c')), "L'entrée devrait être expirée.")
+        self.assertEqual(petit_cache.statistiques(), {'entrees': 1, 'succes': 2, 'echecs': 2, 'evictions': 1,
+                                                      'expirations': 1, 'invalidations': 0})
+
+
+    def test_catalogue_colonnes(self):
+        """
+        Teste une bibliothèque utilisant un CatalogueColonnes comme stockage des livres.
+
+        Étapes :
+        1. Ajoute les mêmes livres dans une bibliothèque classique et dans une bibliothèque en colonnes.
+        2. Emprunte puis retourne des livres dans la bibliothèque en colonnes.
+        3. Compare la recherche et les agrégats des deux bibliothèques.
+        4. Vérifie que les œuvres des auteurs ne conservent que des rangs et construisent leurs vues à la lecture.
+        """
+
+        colonnes = Bibliotheque(catalogue=CatalogueColonnes())
+        for bibliotheque in (self.bibliotheque, colonnes):
+            auteur1 = Auteur('Julien', 'Canadien')
+            auteur2 = Auteur('Victor Hugo', 'Français')
+            bibliotheque.ajouter_livre(book_id='1', titre="Amos daragon tome 1", auteur=auteur1)
+            bibliotheque.ajouter_livre(book_id='2', titre="Amos daragon tome 1", auteur=auteur1)
+            bibliotheque.ajouter_livre(book_id='3', titre="Les Misérables", auteur=auteur2)
+            bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id='1', nom='Luc'))
+            bibliotheque.emprunter_livre('1', '1')
+            bibliotheque.emprunter_livre('3', '1')
+            bibliotheque.retourner_livre('3', '1')
+
+        self.assertFalse(colonnes.livres['1'].disponible, "Le livre emprunté devrait être indisponible.")
+        self.assertTrue(colonnes.livres['3'].disponible, "Le livre retourné devrait être disponible.")
+        self.assertEqual([livre.book_id for livre in colonnes.emprunteurs['1'].livres_empruntes], ['1'])
+        self.assertFalse(colonnes.auteurs[('Julien', 'Canadien')].oeuvres[0].disponible,
+                         "L'œuvre de l'auteur devrait refléter la disponibilité du catalogue.")
+        oeuvres = colonnes.auteurs[('Victor Hugo', 'Français')].oeuvres
+        self.assertIsInstance(oeuvres, OeuvresColonnes, "Les œuvres ne devraient garder que des rangs.")
+        self.assertEqual([livre.book_id for livre in oeuvres], ['3'])
+        self.assertEqual(colonnes.auteurs[('Victor Hugo', 'Français')].obtenir_oeuvre("Les Misérables"),
+                         colonnes.livres['3'])
+
+        self.assertEqual(list(colonnes.rechercher_livre('amos')), list(self.bibliotheque.rechercher_livre('amos')))
+        self.assertEqual(colonnes.disponibles_par_auteur(), self.bibliotheque.disponibles_par_auteur())
+        self.assertEqual(colonnes.disponibles_par_auteur(),
+                         {('Julien', 'Canadien'): 1, ('Victor Hugo', 'Français'): 1})
+        self.assertEqual(colonnes.livres.nombre_disponibles(), 2)
+        self.assertEqual(colonnes.livres.livres_par_nationalite(), {'Canadien': 2, 'Français': 1})
+
+
+    def test_persistance(self):
+        """
+        Teste la restauration d'une bibliothèque à partir d'un instantané et de son journal.
+
+        Étapes :
+        1. Ouvre une bibliothèque persistante vide, ajoute des livres et un emprunteur puis écrit un point de contrôle.
+        2. Effectue d'autres modifications (ajout, emprunts, retour) qui ne sont que dans le journal.
+        3. Simule un arrêt brutal en ajoutant une écriture tronquée à la fin du journal.
+        4. Restaure la bibliothèque et vérifie que l'état est identique, puis que le journal reste utilisable.
+        5. Simule un arrêt entre l'écriture d'un instantané et le vidage du journal : les modifications déjà
+           contenues dans l'instantané ne sont pas rejouées une seconde fois.
+        """
+
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin_instantane = os.path.join(dossier, 'bibliotheque.instantane')
+            chemin_journal = os.path.join(dossier, 'bibliotheque.journal')
+
+            bibliotheque = restaurer(chemin_instantane, chemin_journal)
+            bibliotheque.ajouter_livre(book_id='1', titre="Amos daragon tome 1", auteur=Auteur('Julien', 'Canadien'))
+            bibliotheque.ajouter_livre(book_id='2', titre="Les Misérables", auteur=Auteur('Victor Hugo', 'Français'))
+            bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id='1', nom='Luc'))
+            bibliotheque.emprunter_livre('1', '1')
+            point_de_controle(bibliotheque, chemin_instantane)
+
+            bibliotheque.ajouter_livre(book_id='3', titre="Amos daragon tome 2", auteur=Auteur('Julien', 'Canadien'))
+            bibliotheque.emprunter_livre('3', '1')
+            bibliotheque.emprunter_livre('2', '1')
+            bibliotheque.retourner_livre('1', '1')
+            bibliotheque.ajouter_exemplaires('2', 2)
+            bibliotheque.journal.fermer()
+
+            with open(chemin_journal, 'ab') as fichier:
+                fichier.write(b'\x80\x05\x95')   # Écriture interrompue
+
+            restauree = restaurer(chemin_instantane, chemin_journal)
+            self.assertEqual(list(restauree.livres), ['1', '2', '3'])
+            self.assertEqual([livre.disponible for livre in restauree.livres.values()], [True, True, False])
+            self.assertEqual((restauree.livres['2'].exemplaires, restauree.livres['2'].disponibles), (3, 2))
+            self.assertEqual([livre.book_id for livre in restauree.emprunteurs['1'].livres_empruntes], ['3', '2'])
+            self.assertEqual(len(restauree.auteurs[('Julien', 'Canadien')].oeuvres), 2)
+            self.assertIn('3', restauree.rechercher_livre('tome 2'))
+
+            restauree.retourner_livre('2', '1')
+            restauree.journal.fermer()
+            self.assertEqual(list(Journal.lire(chemin_journal))[-1][:3], ('retour', '2', '1'))
+            self.assertEqual(restauree.prets.prets_par_livre['1'], 1)
+
+            restauree = restaurer(chemin_instantane, chemin_journal)
+            restauree.ajouter_livre(book_id='4', titre="Notre-Dame de Paris", auteur=Auteur('Victor Hugo', 'Français'))
+            restauree.journal.synchroniser()
+            sauvegarder_instantane(restauree, chemin_instantane)   # Arrêt avant journal.vider()
+            restauree.journal.fermer()
+
+            restauree = restaurer(chemin_instantane, chemin_journal)
+            self.assertEqual(list(restauree.livres), ['1', '2', '3', '4'])
+            self.assertEqual([livre.book_id for livre in restauree.emprunteurs['1'].livres_empruntes], ['3'])
+            self.assertEqual(list(restauree.rechercher_livre('notre-dame')), ['4'])
+            restauree.emprunter_livre('4', '1')
+            point_de_controle(restauree, chemin_instantane)
+            restauree.journal.fermer()
+            self.assertEqual(list(Journal.lire(chemin_journal)), [])
+            restauree = restaurer(chemin_instantane, chemin_journal)
+            self.assertEqual(restauree.livres['4'].disponibles, 0)
+            restauree.journal.fermer()
+
+
+    def test_persistance_emprunteur_concurrent(self):
+        """
+        Teste qu'un emprunt concurrent à l'ajout de son emprunteur ne le précède jamais dans le journal.
+
+        Étapes :
+        1. Bloque l'écriture de l'entrée 'emprunteur' du journal pendant l'ajout d'un emprunteur (dans un thread).
+        2. Pendant ce temps, tente un emprunt par cet emprunteur : il est refusé, l'emprunteur n'étant pas publié.
+        3. Termine l'ajout, emprunte, puis vérifie que le journal se rejoue et restaure l'emprunt.
+        """
+
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin_instantane = os.path.join(dossier, 'bibliotheque.instantane')
+            chemin_journal = os.path.join(dossier, 'bibliotheque.journal')
+            ecriture = threading.Event()
+            reprise = threading.Event()
+
+            class JournalLent(Journal):
+                def enregistrer(self, operation):
+                    if operation[0] == 'emprunteur':
+                        ecriture.set()
+                        reprise.wait(5)
+                    super().enregistrer(operation)
+
+            bibliotheque = restaurer(chemin_instantane, chemin_journal)
+            bibliotheque.ajouter_livre(book_id='1', titre="Amos daragon tome 1", auteur=Auteur('Julien', 'Canadien'))
+            bibliotheque.journal.fermer()
+            bibliotheque.journal = JournalLent(chemin_journal, numero=bibliotheque.journal.numero)
+            # Un emprunteur dont le verrou n'est pas celui du livre, pour que l'emprunt ne soit pas simplement bloqué
+            emprunteur_id = next(i for i in map(str, range(2, 100))
+                                 if bibliotheque.verrous.verrou(i) is not bibliotheque.verrous.verrou('1'))
+
+            ajout = threading.Thread(target=bibliotheque.ajouter_emprunteur,
+                                     args=(Emprunteur(emprunteur_id=emprunteur_id, nom='Luc'),))
+            ajout.start()
+            self.assertTrue(ecriture.wait(5))
+            with contextlib.redirect_stdout(io.StringIO()):
+                with self.assertRaises(ValueError, msg="L'emprunteur ne devrait pas être visible avant d'être journalisé."):
+                    bibliotheque.emprunter_livre('1', emprunteur_id)
+            reprise.set()
+            ajout.join()
+
+            bibliotheque.emprunter_livre('1', emprunteur_id)
+            bibliotheque.journal.fermer()
+            self.assertEqual([operation[0] for operation in Journal.lire(chemin_journal)], ['livre', 'emprunteur', 'emprunt'])
+
+            restauree = restaurer(chemin_instantane, chemin_journal)
+            self.assertEqual([livre.book_id for livre in restauree.emprunteurs[emprunteur_id].livres_empruntes], ['1'])
+            restauree.journal.fermer()
+
+
+    def test_catalogue_lecture_seule(self):
+        """
+        Teste le catalogue en lecture seule projeté en mémoire.
+
+        Étapes :
+        1. Ajoute des livres (dont un emprunté) à la bibliothèque et écrit le catalogue dans un fichier.
+        2. Ouvre le catalogue et vérifie la recherche par book_id et par texte, comparée à la bibliothèque.
+        """
+
+        auteur1 = Auteur('Julien', 'Canadien')
+        auteur2 = Auteur('Émilie Dupré', 'Française')
+        self.bibliotheque.ajouter_livre(book_id='10', titre="Amos daragon tome 1", auteur=auteur1)
+        self.bibliotheque.ajouter_livre(book_id='2', titre="Travaillier avec Julien", auteur=auteur2)
+        self.bibliotheque.ajouter_livre(book_id='3', titre="Les Misérables", auteur=auteur2)
+        self.bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id='1', nom='Luc'))
+        self.bibliotheque.emprunter_livre('3', '1')
+
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'catalogue.bin')
+            ecrire_catalogue(self.bibliotheque, chemin)
+
+            with CatalogueLectureSeule(chemin) as catalogue:
+                self.assertEqual(len(catalogue), 3)
+                self.assertEqual(list(catalogue), ['10', '2', '3'])
+                self.assertIn('2', catalogue)
+                self.assertNotIn('1', catalogue)
+
+                livre = catalogue['3']
+                self.assertEqual((livre.titre, livre.auteur.nom, livre.disponible), ("Les Misérables", 'Émilie Dupré', False))
+                with self.assertRaises(KeyError):
+                    catalogue['4']
+
+                for recherche in ['ju', 'MISÉ', 'é', '', 'tome 1']:
+                    self.assertEqual(list(catalogue.rechercher_livre(recherche)),
+                                     list(self.bibliotheque.rechercher_livre(recherche)),
+                                     f"Résultat incorrect pour la recherche '{recherche}'.")
+                with self.assertRaises(ValueError):
+                    catalogue.rechercher_livre("Non Existant Book")
+
+
+    def test_bibliotheque_repartie(self):
+        """
+        Teste la bibliothèque répartie entre plusieurs processus.
+
+        Vérifications :
+        - Que la recherche fusionnée retourne les mêmes livres, dans le même ordre, qu'une Bibliotheque.
+        - Que les doublons sont détectés par les partitions et que le registre des auteurs reste cohérent.
+        - Que les emprunts et les retours sont envoyés à la partition du livre.
+        """
+
+        lignes = [(str(i), f"Amos Daragon tome {i}", f"Auteur {i % 3}", 'Canadien') for i in range(30)]
+        self.bibliotheque.ajouter_livres_en_masse(lignes)
+
+        with BibliothequeRepartie(nombre_partitions=3) as repartie:
+            rapport = repartie.ajouter_livres_en_masse(lignes + [('4', "Doublon", 'Inconnu', 'Canadien')])
+            self.assertEqual((rapport.livres_ajoutes, rapport.nombre_erreurs), (30, 1))
+            self.assertEqual(rapport.erreurs[0][0], 31)
+            self.assertEqual(set(repartie.auteurs), set(self.bibliotheque.auteurs))
+            self.assertEqual(len(repartie), 30)
+
+            for recherche in ['tome 1', 'auteur 2', 'AMOS']:
+                attendu = self.bibliotheque.rechercher_livre(recherche)
+                resultat = repartie.rechercher_livre(recherche)
+                self.assertEqual(list(resultat), list(attendu), f"Résultat incorrect pour la recherche '{recherche}'.")
+                for livre in resultat.values():
+                    self.assertIs(livre.auteur, repartie.auteurs[(livre.auteur.nom, livre.auteur.nationalite)])
+
+            repartie.ajouter_emprunteur(Emprunteur(emprunteur_id='1', nom='Luc'))
+            repartie.emprunter_livre('7', '1')
+            self.assertFalse(repartie.obtenir_livre('7').disponible)
+            with contextlib.redirect_stdout(io.StringIO()), self.assertRaises(ValueError):
+                repartie.emprunter_livre('7', '1')
+            repartie.retourner_livre('7', '1')
+            self.assertTrue(repartie.rechercher_livre('tome 7')['7'].disponible)
+
+            # Ajouts concurrents : un rang distinct par livre et un seul Auteur par (nom, nationalité)
+            def ajouter(numero):
+                for i in range(10):
+                    repartie.ajouter_livre(f"{numero}-{i}", f"Nouveau {numero}-{i}", Auteur(f"Nouvel auteur {i}", 'Belge'))
+
+            threads = [threading.Thread(target=ajouter, args=(numero,)) for numero in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(repartie._rang, 31 + 40)
+            nouveaux = repartie.rechercher_livre('nouveau')
+            self.assertEqual(len(nouveaux), 40)
+            self.assertEqual(len({id(livre.auteur) for livre in nouveaux.values()}), 10)
+
+
+    def test_instrumentation(self):
+        """
+        Teste l'instrumentation des opérations de la bibliothèque.
+
+        Vérifications :
+        - Que, désactivée, elle ne compte rien et que les erreurs sont affichées comme avant.
+        - Que, activée, elle compte les appels, les latences et les erreurs par type.
+        - Que l'importation en masse, la recherche classée (parcours compris) et la recherche des titres sont
+          comptées.
+        - L'export au format Prometheus (jauges comprises) et le remplacement du gestionnaire d'erreur.
+        """
+
+        instrumentation = self.bibliotheque.instrumentation
+        sortie = io.StringIO()
+        with contextlib.redirect_stdout(sortie), self.assertRaises(ValueError):
+            self.bibliotheque.rechercher_livre('amos')
+        self.assertEqual(sortie.getvalue(), "Erreur lors de la recherche du livre : Aucun livre n'est disponible\n")
+        self.assertEqual(instrumentation.appels, {})
+
+        instrumentation.activer()
+        self.bibliotheque.ajouter_livre(book_id='1', titre="Amos Daragon tome 1", auteur=Auteur('Julien', 'Canadien'))
+        self.bibliotheque.rechercher_livre('amos')
+        erreurs = []
+        instrumentation.gestionnaire_erreur = lambda operation, message, erreur: erreurs.append((operation, message))
+        with self.assertRaises(TypeError):
+            self.bibliotheque.ajouter_emprunteur('Luc')
+        self.assertEqual(erreurs, [('ajouter_emprunteur', "Erreur lors de l'ajout de l'emprunteur")])
+
+        self.assertEqual(instrumentation.appels, {'ajouter_livre': 1, 'rechercher_livre': 1, 'ajouter_emprunteur': 1})
+        self.assertEqual(instrumentation.erreurs, {('ajouter_emprunteur', 'TypeError'): 1})
+        self.assertEqual(sum(instrumentation.latences['rechercher_livre']), 1)
+
+        # Importation en masse, recherche classée (comptée à la fin du parcours) et recherche des titres
+        self.bibliotheque.ajouter_livres_en_masse([('2', "Amos Daragon tome 2", 'Julien', 'Canadien')])
+        classes = self.bibliotheque.rechercher_livre_classe('amos')
+        self.assertNotIn('rechercher_livre_classe', instrumentation.appels)
+        self.assertEqual([livre.book_id for livre in classes], ['1', '2'])
+        self.bibliotheque.rechercher_titres('amos')
+        with self.assertRaises(ValueError):
+            self.bibliotheque.rechercher_titres('inconnu')
+        self.assertEqual(erreurs[1:], [('rechercher_titres', "Erreur lors de la recherche des titres")])
+        self.assertEqual([instrumentation.appels[operation] for operation in
+                          ('ajouter_livres_en_masse', 'rechercher_livre_classe', 'rechercher_titres', 'rechercher_livre')],
+                         [1, 1, 2, 1])
+
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, 'bibliotheque.prom')
+            instrumentation.exportateurs.append(ExportateurPrometheus(chemin))
+            instrumentation.exporter()
+            with open(chemin, encoding='utf-8') as fichier:
+                texte = fichier.read()
+        self.assertIn('bibliotheque_appels_total{operation="rechercher_livre"} 1', texte)
+        self.assertIn('bibliotheque_erreurs_total{operation="ajouter_emprunteur",type="TypeError"} 1', texte)
+        self.assertIn('bibliotheque_latence_secondes_bucket{operation="ajouter_livre",le="+Inf"} 1', texte)
+        self.assertIn('bibliotheque_appels_total{operation="rechercher_livre_classe"} 1', texte)
+        self.assertIn('bibliotheque_livres 2', texte)
+
+        instrumentation.gestionnaire_erreur = journaliser_erreur
+        with self.assertLogs('bibliotheque', level='WARNING') as journal, self.assertRaises(ValueError):
+            self.bibliotheque.emprunter_livre('1', '2')
+        self.assertEqual(journal.records[0].operation, 'emprunter_livre')
+
+
     def test_emprunter_livre(self):
         """
         Teste la méthode emprunter_livre pour valider le processus d'emprunt de livres.
@@ -181,6 +794,209 @@ class TestBibliothequeMethods(unittest.TestCase):
 
 
 
+    def test_emprunter_livre_concurrent(self):
+        """
+        Teste que deux threads ne peuvent pas emprunter le même livre en même temps.
+
+        Étapes :
+        1. Ajoute un livre et 16 emprunteurs.
+        2. Lance 16 threads qui tentent d'emprunter le même livre au même moment, plusieurs fois de suite.
+        3. Vérifie qu'à chaque tour, exactement un emprunt réussit et qu'un seul emprunteur détient le livre.
+        """
+
+        self.bibliotheque.ajouter_livre(book_id='1', titre="Amos daragon tome 1", auteur=Auteur('Julien', 'Canadien'))
+        for i in range(16):
+            self.bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id=str(i), nom=f'Emprunteur {i}'))
+
+        for _ in range(20):
+            barriere = threading.Barrier(16)
+            reussites = []
+
+            def emprunter(id_emprunteur):
+                barriere.wait()
+                try:
+                    self.bibliotheque.emprunter_livre('1', id_emprunteur)
+                    reussites.append(id_emprunteur)
+                except ValueError:
+                    pass
+
+            threads = [threading.Thread(target=emprunter, args=(str(i),)) for i in range(16)]
+            with contextlib.redirect_stdout(io.StringIO()):
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+            self.assertEqual(len(reussites), 1, "Un seul emprunt du livre devrait réussir.")
+            detenteurs = [e for e in self.bibliotheque.emprunteurs.values() if e.livres_empruntes]
+            self.assertEqual(len(detenteurs), 1, "Un seul emprunteur devrait détenir le livre.")
+            self.bibliotheque.retourner_livre('1', reussites[0])
+
+
+    def test_async_bibliotheque(self):
+        """
+        Teste la façade asynchrone AsyncBibliotheque.
+
+        Étapes :
+        1. Ajoute un livre et un emprunteur, puis lance en même temps plusieurs emprunts du même livre.
+        2. Vérifie que les requêtes sont appliquées dans l'ordre (seul le premier emprunt réussit)
+           et que les erreurs sont transmises aux appelants.
+        3. Vérifie la recherche et le retour du livre.
+        4. Ferme la façade pendant l'application d'un lot : ses appelants reçoivent leur résultat et les
+           requêtes restées dans la file sont annulées.
+        5. Vérifie qu'une seconde fermeture est sans effet et qu'un appel après la fermeture lève RuntimeError.
+        """
+
+        async def scenario():
+            async with AsyncBibliotheque(self.bibliotheque, taille_lot=4) as bibliotheque:
+                await bibliotheque.ajouter_livre('1', "Amos daragon tome 1", Auteur('Julien', 'Canadien'))
+                await asyncio.gather(*(
+                    bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id=str(i), nom=f'Emprunteur {i}'))
+                    for i in range(10)
+                ))
+                emprunts = await asyncio.gather(
+                    *(bibliotheque.emprunter_livre('1', str(i)) for i in range(10)), return_exceptions=True
+                )
+                recherche = await bibliotheque.rechercher_livre('amos')
+                await bibliotheque.retourner_livre('1', '0')
+                return emprunts, recherche
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            emprunts, recherche = asyncio.run(scenario())
+
+        self.assertIsNone(emprunts[0], "Le premier emprunt devrait réussir.")
+        self.assertTrue(all(isinstance(resultat, ValueError) for resultat in emprunts[1:]),
+                        "Les emprunts suivants devraient échouer avec une ValueError.")
+        self.assertEqual(list(recherche), ['1'])
+        self.assertTrue(self.bibliotheque.livres['1'].disponible, "Le livre devrait être disponible après le retour.")
+
+        async def fermeture_pendant_un_lot():
+            bibliotheque = AsyncBibliotheque(self.bibliotheque, taille_lot=2)
+            requetes = [asyncio.ensure_future(bibliotheque.ajouter_exemplaires('1')) for _ in range(4)]
+            # Laisse la tâche de traitement prendre le premier lot et le confier au thread
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            await bibliotheque.fermer()
+            resultats = await asyncio.wait_for(asyncio.gather(*requetes, return_exceptions=True), timeout=5)
+
+            await bibliotheque.fermer()
+            with self.assertRaisesRegex(RuntimeError, "AsyncBibliotheque fermée"):
+                await asyncio.wait_for(bibliotheque.ajouter_exemplaires('1'), timeout=5)
+
+            # Façade fermée sans avoir servi
+            inutilisee = AsyncBibliotheque(self.bibliotheque)
+            await inutilisee.fermer()
+            await inutilisee.fermer()
+            with self.assertRaisesRegex(RuntimeError, "AsyncBibliotheque fermée"):
+                await asyncio.wait_for(inutilisee.rechercher_livre('amos'), timeout=5)
+            return resultats
+
+        resultats = asyncio.run(fermeture_pendant_un_lot())
+        self.assertEqual(resultats[:2], [None, None], "Le lot en cours devrait être terminé.")
+        self.assertTrue(all(isinstance(resultat, asyncio.CancelledError) for resultat in resultats[2:]),
+                        "Les requêtes restées dans la file devraient être annulées.")
+        self.assertEqual(self.bibliotheque.livres['1'].exemplaires, 3)
+
+
+    def test_prets_en_retard(self):
+        """
+        Teste les échéances des prêts, la recherche des prêts en retard et l'historique des retours.
+
+        Étapes :
+        1. Emprunte 50 livres à des dates différentes, avec la durée de prêt par défaut.
+        2. Vérifie que prets_en_retard retourne exactement les prêts dont l'échéance est dépassée, dans l'ordre.
+        3. Retourne des livres et vérifie qu'ils ne sont plus en retard et que l'historique est borné.
+        """
+
+        self.bibliotheque.prets = RegistrePrets(taille_historique=5)
+        auteur = Auteur('Alex', 'Canadien')
+        self.bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id='1', nom='Luc'))
+        debut = datetime(2024, 1, 1)
+        for i in range(50):
+            self.bibliotheque.ajouter_livre(book_id=str(i), titre=f"Tome {i}", auteur=auteur)
+            self.bibliotheque.emprunter_livre(str(i), '1', date_emprunt=debut + timedelta(days=i))
+
+        maintenant = debut + RegistrePrets.DUREE_PRET + timedelta(days=9, hours=12)
+        en_retard = self.bibliotheque.prets_en_retard(maintenant)
+        self.assertEqual([pret.book_id for pret in en_retard], [str(i) for i in range(10)])
+
+        for i in range(0, 10, 2):
+            self.bibliotheque.retourner_livre(str(i), '1', date_retour=maintenant)
+        for i in range(10, 20):
+            self.bibliotheque.retourner_livre(str(i), '1', date_retour=maintenant)
+
+        en_retard = self.bibliotheque.prets_en_retard(maintenant)
+        self.assertEqual([pret.book_id for pret in en_retard], ['1', '3', '5', '7', '9'])
+        self.assertEqual(en_retard[0].date_echeance, debut + timedelta(days=1) + RegistrePrets.DUREE_PRET)
+
+        self.assertEqual([pret.book_id for pret in self.bibliotheque.prets.historique], ['15', '16', '17', '18', '19'])
+        self.assertEqual(sum(self.bibliotheque.prets.prets_par_livre.values()), 15)
+        self.assertEqual(self.bibliotheque.prets.prets_par_emprunteur['1'], 15)
+
+
+    def test_prets_concurrents(self):
+        """
+        Teste le registre des prêts sous emprunts, retours et recherches de retards concurrents.
+
+        Étapes :
+        1. Lance 8 threads qui empruntent chacun leurs propres livres et en retournent trois sur quatre (de quoi
+           déclencher la reconstruction du tas), plus un thread qui cherche les prêts en retard en boucle.
+           Les échéances sont égales mais distinctes, et leur comparaison cède la main aux autres threads :
+           chaque opération sur le tas est entrelacée avec celles des autres threads.
+        2. Vérifie qu'aucun thread n'a échoué, que les numéros de séquence sont uniques et que le tas, les prêts
+           en cours et les compteurs concordent.
+        """
+
+        class EcheanceLente(datetime):
+            __hash__ = datetime.__hash__
+
+            def __eq__(self, autre):
+                time.sleep(0)
+                return super().__eq__(autre)
+
+        registre = RegistrePrets(taille_historique=10)
+        erreurs = []
+        fin = threading.Event()
+        barriere = threading.Barrier(9)
+
+        def preter(numero):
+            barriere.wait()
+            try:
+                for i in range(200):
+                    book_id = f"{numero}-{i}"
+                    registre.enregistrer_emprunt(book_id, str(numero), datetime(2024, 1, 1), EcheanceLente(2024, 1, 22))
+                    if i % 4:
+                        registre.enregistrer_retour(book_id, str(numero))
+            except Exception as erreur:
+                erreurs.append(erreur)
+
+        def chercher_retards():
+            barriere.wait()
+            try:
+                while not fin.is_set():
+                    registre.en_retard(datetime(2024, 2, 1))
+            except Exception as erreur:
+                erreurs.append(erreur)
+
+        threads = [threading.Thread(target=preter, args=(i,)) for i in range(8)]
+        controleur = threading.Thread(target=chercher_retards)
+        for thread in threads + [controleur]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        fin.set()
+        controleur.join()
+
+        self.assertEqual(erreurs, [])
+        self.assertEqual(len(registre), 400)
+        sequences = [sequence for _, sequence, _ in registre._echeances]
+        self.assertEqual(len(sequences), len(set(sequences)))
+        en_cours = [pret for _, _, pret in registre._echeances if pret.date_retour is None]
+        self.assertEqual(sorted(map(id, en_cours)), sorted(map(id, registre.en_cours.values())))
+        self.assertEqual(len(registre.en_retard(datetime(2024, 2, 1))), 400)
+        self.assertEqual(sum(registre.prets_par_emprunteur.values()), 1200)
+
+
     def test_retourner_livre(self):
         """
         Teste la fonctionnalité de retour d'un livre dans la bibliothèque.
@@ -226,6 +1042,195 @@ class TestBibliothequeMethods(unittest.TestCase):
                                msg="Retourner un livre qui n'a pas été emprunté devrait déclencher une erreur."):
             self.bibliotheque.retourner_livre('4', '1')  # Livre déjà retourné
 
+    def test_detenteurs_livre(self):
+        """
+        Teste le registre des prêts : détenteur d'un livre et retour par un autre emprunteur.
+
+        Vérifications :
+        - Que detenteurs_livre retourne les emprunteurs du livre, ou une liste vide si le livre est disponible.
+        - Qu'un emprunteur ne peut pas retourner un livre emprunté par un autre, sans modifier le prêt.
+        - Que les livres empruntés restent dans l'ordre des emprunts après un retour.
+        """
+
+        auteur = Auteur('Alex', 'Canadien')
+        for book_id in ('1', '2', '3'):
+            self.bibliotheque.ajouter_livre(book_id=book_id, titre=f"Tome {book_id}", auteur=auteur)
+        self.bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id='1', nom='Luc'))
+        self.bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id='2', nom='Marie'))
+
+        for book_id in ('1', '2', '3'):
+            self.bibliotheque.emprunter_livre(book_id, '1')
+        self.assertEqual(self.bibliotheque.detenteurs_livre('2'), [self.bibliotheque.emprunteurs['1']])
+
+        with self.assertRaises(ValueError, msg="Un autre emprunteur ne devrait pas pouvoir retourner le livre."):
+            self.bibliotheque.retourner_livre('2', '2')
+        self.assertFalse(self.bibliotheque.livres['2'].disponible)
+        self.assertEqual(self.bibliotheque.detenteurs_livre('2'), [self.bibliotheque.emprunteurs['1']])
+
+        self.bibliotheque.retourner_livre('2', '1')
+        self.assertEqual(self.bibliotheque.detenteurs_livre('2'), [])
+        self.assertEqual([livre.book_id for livre in self.bibliotheque.emprunteurs['1'].livres_empruntes], ['1', '3'])
+
+    def test_exemplaires(self):
+        """
+        Teste la gestion de plusieurs exemplaires d'un même livre.
+
+        Vérifications :
+        - Que chaque exemplaire peut être emprunté par un emprunteur différent, puis que le livre devient indisponible.
+        - Qu'un emprunteur ne peut pas emprunter deux exemplaires du même livre.
+        - Qu'un retour rend un exemplaire disponible et que ajouter_exemplaires augmente le stock.
+        - Que rechercher_titres regroupe les livres de même titre et de même auteur.
+        """
+
+        auteur = Auteur('Alex', 'Canadien')
+        self.bibliotheque.ajouter_livre(book_id='1', titre="Amos daragon", auteur=auteur, exemplaires=3)
+        for emprunteur_id in ('1', '2', '3', '4'):
+            self.bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id=emprunteur_id, nom=f"Lecteur {emprunteur_id}"))
+
+        with self.assertRaises(ValueError, msg="Le nombre d'exemplaires devrait être un entier positif."):
+            self.bibliotheque.ajouter_livre(book_id='2', titre="Tome 2", auteur=auteur, exemplaires=0)
+
+        self.bibliotheque.emprunter_livre('1', '1')
+        with self.assertRaises(ValueError, msg="Un emprunteur ne devrait pas emprunter deux exemplaires du même livre."):
+            self.bibliotheque.emprunter_livre('1', '1')
+        self.bibliotheque.emprunter_livre('1', '2')
+        self.bibliotheque.emprunter_livre('1', '3')
+        livre = self.bibliotheque.livres['1']
+        self.assertEqual((livre.exemplaires, livre.disponibles, livre.disponible), (3, 0, False))
+        self.assertEqual(len(self.bibliotheque.detenteurs_livre('1')), 3)
+        with self.assertRaises(ValueError, msg="Aucun exemplaire ne devrait être disponible."):
+            self.bibliotheque.emprunter_livre('1', '4')
+
+        self.bibliotheque.retourner_livre('1', '2')
+        with self.assertRaises(ValueError, msg="Un emprunteur sans exemplaire ne devrait pas pouvoir le retourner."):
+            self.bibliotheque.retourner_livre('1', '4')
+        self.bibliotheque.ajouter_exemplaires('1', 2)
+        self.assertEqual((livre.exemplaires, livre.disponibles), (5, 3))
+        self.bibliotheque.emprunter_livre('1', '4')
+
+        # Ancienne saisie : un book_id par exemplaire
+        self.bibliotheque.ajouter_livres_en_masse([('3', "Amos daragon", 'Alex', 'Canadien'),
+                                                   ('4', "Amos daragon", 'Alex', 'Canadien', '2')])
+        self.assertEqual(self.bibliotheque.livres['4'].exemplaires, 2)
+        self.assertEqual(self.bibliotheque.rechercher_titres('amos'), {("Amos daragon", 'Alex', 'Canadien'): (8, 5)})
+
+
+    def test_ecrire_rapport(self):
+        """
+        Teste ecrire_rapport dans les trois formats, avec filtres, et print_info_console qui l'utilise.
+        """
+        auteur = Auteur('Julien', 'Canadien')
+        self.bibliotheque.ajouter_livre(book_id='1', titre="Un, deux", auteur=auteur, exemplaires=2)
+        self.bibliotheque.ajouter_livre(book_id='2', titre="Trois", auteur=auteur)
+        self.bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id='1', nom='Luc'))
+        self.bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id='2', nom='Léa'))
+        self.bibliotheque.emprunter_livre('1', '1')
+
+        sortie = io.StringIO()
+        with contextlib.redirect_stdout(sortie):
+            self.bibliotheque.print_info_console()
+        texte = sortie.getvalue()
+        self.assertIn("- Julien (Canadien)\n  * Un, deux\n  * Trois\n", texte)
+        self.assertIn("- Un, deux (ID: 1) (DISPONIBLE: True - 1/2 exemplaires)\n", texte)
+        self.assertIn("- Luc (ID: 1)\n  * Un, deux\n", texte)
+        self.assertTrue(texte.endswith("-------------------fin-------------------\n"))
+
+        # Tampon minuscule : plusieurs écritures, même contenu
+        sortie = io.StringIO()
+        self.assertEqual(self.bibliotheque.ecrire_rapport(sortie, taille_tampon=1), 5)
+        self.assertEqual(sortie.getvalue(), texte)
+
+        sortie = io.StringIO()
+        self.bibliotheque.ecrire_rapport(sortie, 'csv', sections=('livres',), filtre_livre=est_emprunte)
+        self.assertEqual(sortie.getvalue().splitlines(), [
+            "type,id,nom,auteur,nationalite,disponibles,exemplaires,livres",
+            'livre,1,"Un, deux",Julien,Canadien,1,2,',
+        ])
+
+        sortie = io.StringIO()
+        self.bibliotheque.ecrire_rapport(sortie, 'jsonl', sections=('emprunteurs',), filtre_emprunteur=a_des_emprunts)
+        self.assertEqual([json.loads(ligne) for ligne in sortie.getvalue().splitlines()],
+                         [{'type': 'emprunteur', 'emprunteur_id': '1', 'nom': 'Luc', 'livres': ['1']}])
+
+        with self.assertRaises(ValueError, msg="Un format inconnu devrait lever une ValueError."):
+            self.bibliotheque.ecrire_rapport(io.StringIO(), 'xml')
+
+
+    def test_index_secondaires(self):
+        """
+        Teste livres_disponibles, auteurs_par_nationalite et emprunteurs_avec_plus_de, qui utilisent les index
+        secondaires, contre un parcours complet, y compris avec un CatalogueColonnes et après une restauration.
+        """
+        julien = Auteur('Julien', 'Canadien')
+        self.bibliotheque.ajouter_livre(book_id='1', titre="Tome 1", auteur=julien, exemplaires=2)
+        self.bibliotheque.ajouter_livre(book_id='2', titre="Tome 2", auteur=julien)
+        self.bibliotheque.ajouter_livres_en_masse([('3', "Amos daragon", 'Alex', 'Canadien'),
+                                                   ('4', "Notre-Dame", 'Hugo', 'Français')])
+        for emprunteur_id in '123':
+            self.bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id=emprunteur_id, nom='Luc'))
+
+        self.bibliotheque.emprunter_livre('1', '1')
+        self.bibliotheque.emprunter_livre('2', '1')
+        self.bibliotheque.emprunter_livre('3', '1')
+        self.bibliotheque.emprunter_livre('1', '2')
+        self.bibliotheque.emprunter_livre('4', '2')
+        self.assertEqual(self.bibliotheque.livres_disponibles(), [])
+        self.assertEqual([e.emprunteur_id for e in self.bibliotheque.emprunteurs_avec_plus_de(1)], ['1', '2'])
+        self.assertEqual([e.emprunteur_id for e in self.bibliotheque.emprunteurs_avec_plus_de(2)], ['1'])
+        self.assertEqual(self.bibliotheque.emprunteurs_avec_plus_de(3), [])
+
+        self.bibliotheque.retourner_livre('1', '2')
+        self.bibliotheque.retourner_livre('3', '1')
+        self.bibliotheque.ajouter_exemplaires('2')
+        self.assertEqual([livre.book_id for livre in self.bibliotheque.livres_disponibles()], ['1', '3', '2'])
+        self.assertEqual(sorted(e.emprunteur_id for e in self.bibliotheque.emprunteurs_avec_plus_de(0)), ['1', '2'])
+        self.assertEqual([e.emprunteur_id for e in self.bibliotheque.emprunteurs_avec_plus_de(1)], ['1'])
+        self.assertEqual([auteur.nom for auteur in self.bibliotheque.auteurs_par_nationalite('Canadien')],
+                         ['Julien', 'Alex'])
+        self.assertEqual(self.bibliotheque.auteurs_par_nationalite('Belge'), [])
+        with self.assertRaises(ValueError, msg="Un nombre négatif devrait lever une ValueError."):
+            self.bibliotheque.emprunteurs_avec_plus_de(-1)
+
+        # Les index donnent les mêmes réponses qu'un parcours complet
+        for bibliotheque in (self.bibliotheque, Bibliotheque(catalogue=CatalogueColonnes())):
+            if bibliotheque is not self.bibliotheque:
+                bibliotheque.ajouter_livres_en_masse([('1', "Tome 1", 'Julien', 'Canadien'),
+                                                      ('2', "Tome 2", 'Julien', 'Canadien')])
+                bibliotheque.ajouter_emprunteur(Emprunteur(emprunteur_id='1', nom='Luc'))
+                bibliotheque.emprunter_livre('1', '1')
+            self.assertEqual({livre.book_id for livre in bibliotheque.livres_disponibles()},
+                             {book_id for book_id, livre in bibliotheque.livres.items() if livre.disponible})
+            self.assertEqual({e.emprunteur_id for e in bibliotheque.emprunteurs_avec_plus_de(0)},
+                             {e.emprunteur_id for e in bibliotheque.emprunteurs.values() if len(e.emprunts) > 0})
+
+        with tempfile.TemporaryDirectory() as repertoire:
+            instantane = os.path.join(repertoire, 'bibliotheque.instantane')
+            journal = os.path.join(repertoire, 'bibliotheque.journal')
+            point_de_controle(self.bibliotheque, instantane)
+            restauree = restaurer(instantane, journal)
+            restauree.journal.fermer()
+        self.assertEqual({livre.book_id for livre in restauree.livres_disponibles()}, {'1', '2', '3'})
+        self.assertEqual([e.emprunteur_id for e in restauree.emprunteurs_avec_plus_de(1)], ['1'])
+
+
+    def test_construire_livre_sans_verification(self):
+        """
+        Teste Livre.construire_sans_verification, et la validation de Livre qui reconnaît les auteurs sans import.
+        """
+        auteur = Auteur('Julien', 'Canadien')
+        livre = Livre.construire_sans_verification('1', "Tome 1", auteur, 3, 1)
+        self.assertEqual((livre.book_id, livre.titre, livre.auteur, livre.exemplaires, livre.disponibles),
+                         ('1', "Tome 1", auteur, 3, 1))
+        self.assertEqual(Livre.construire_sans_verification('2', "Tome 2", auteur).disponibles, 1)
+        with self.assertRaises(ValueError, msg="Un auteur qui n'est pas un Auteur devrait être refusé."):
+            Livre(book_id='3', titre="Tome 3", auteur='Julien')
+
+        # L'import en masse construit ses livres sans seconde vérification
+        self.bibliotheque.ajouter_livres_en_masse([('1', "Tome 1", 'Julien', 'Canadien', 2)])
+        livre = self.bibliotheque.livres['1']
+        self.assertIs(type(livre), Livre)
+        self.assertEqual((livre.exemplaires, livre.disponibles, livre.auteur.nom), (2, 2, 'Julien'))
+
 
 
 if __name__ == "__main__":